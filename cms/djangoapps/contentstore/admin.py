@@ -5,7 +5,8 @@ Admin site bindings for contentstore
 from django.contrib import admin
 
 from config_models.admin import ConfigurationModelAdmin
-from contentstore.models import VideoUploadConfig, PushNotificationConfig
+from contentstore.models import VideoUploadConfig, PushNotificationConfig, CourseListingConfig
 
 admin.site.register(VideoUploadConfig, ConfigurationModelAdmin)
 admin.site.register(PushNotificationConfig, ConfigurationModelAdmin)
+admin.site.register(CourseListingConfig, ConfigurationModelAdmin)
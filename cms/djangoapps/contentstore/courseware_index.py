@@ -2,8 +2,10 @@
 from __future__ import absolute_import
 from abc import ABCMeta, abstractmethod
 from datetime import timedelta
+import inspect
 import logging
 import re
+import time
 from six import add_metaclass
 
 from django.conf import settings
@@ -24,6 +26,10 @@ from xmodule.library_tools import normalize_key_for_search
 # how far back from the trigger point to look back in order to index
 REINDEX_AGE = timedelta(0, 60)  # 60 seconds
 
+# The number of documents sent to the search engine in one request, if it
+# supports bulk indexing
+INDEX_BATCH_SIZE = 100
+
 log = logging.getLogger('edx.modulestore')
 
 
@@ -54,6 +60,68 @@ class SearchIndexingError(Exception):
         self.error_list = error_list
 
 
+def search_engine_indexes_in_bulk(searcher):
+    """
+    Returns whether the search engine's index method takes a list of
+    documents (edx-search releases with bulk indexing) rather than a single one
+    """
+    try:
+        return 'sources' in inspect.getargspec(searcher.index).args
+    except TypeError:
+        return False
+
+
+class IndexBatch(object):
+    """
+    Collects documents to add to the search index, sending them in batches
+    when the search engine supports bulk indexing
+    """
+
+    def __init__(self, searcher, doc_type, error_list):
+        self.searcher = searcher
+        self.doc_type = doc_type
+        self.error_list = error_list
+        self.batch_size = INDEX_BATCH_SIZE if search_engine_indexes_in_bulk(searcher) else 1
+        self.pending = []
+        self.indexed_count = 0
+        self.request_count = 0
+
+    def add(self, location, document):
+        """ Queue the document for the item at location, sending the batch once it is full """
+        self.pending.append((location, document))
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """ Send the queued documents to the search engine """
+        pending, self.pending = self.pending, []
+        if not pending:
+            return
+
+        if self.batch_size > 1:
+            try:
+                self.request_count += 1
+                self.searcher.index(self.doc_type, [document for __, document in pending])
+                self.indexed_count += len(pending)
+                return
+            except Exception as err:  # pylint: disable=broad-except
+                # retry the documents one at a time, so that only those which fail are left out
+                log.warning('Could not index batch of %d items, retrying them individually - %r', len(pending), err)
+
+        for location, document in pending:
+            try:
+                self.request_count += 1
+                if self.batch_size > 1:
+                    self.searcher.index(self.doc_type, [document])
+                else:
+                    self.searcher.index(self.doc_type, document)
+                self.indexed_count += 1
+            except Exception as err:  # pylint: disable=broad-except
+                # broad exception so that index operation does not fail on one item of many
+                log.warning('Could not index item: %s - %r', location, err)
+                self.error_list.append(_('Could not index item: {}').format(location))
+
+
 @add_metaclass(ABCMeta)
 class SearchIndexerBase(object):
     """
@@ -139,9 +207,11 @@ class SearchIndexerBase(object):
 
         structure_key = cls.normalize_structure_key(structure_key)
         location_info = cls._get_location_info(structure_key)
+        start_time = time.time()
+        batch = IndexBatch(searcher, cls.DOCUMENT_TYPE, error_list)
 
         # Wrap counter in dictionary - otherwise we seem to lose scope inside the embedded function `index_item`
-        indexed_count = {
+        skipped_count = {
             "count": 0
         }
 
@@ -164,9 +234,11 @@ class SearchIndexerBase(object):
                 this method has determined that it is safe to do so
             """
             is_indexable = hasattr(item, "index_dictionary")
-            item_index_dictionary = item.index_dictionary() if is_indexable else None
+            # an item that is already indexed only needs to be kept in indexed_items,
+            # so don't build its (possibly expensive) index dictionary
+            item_index_dictionary = item.index_dictionary() if is_indexable and not skip_index else None
             # if it's not indexable and it does not have children, then ignore
-            if not item_index_dictionary and not item.has_children:
+            if not (item_index_dictionary or (skip_index and is_indexable)) and not item.has_children:
                 return
 
             item_id = unicode(cls._id_modifier(item.scope_ids.usage_id))
@@ -175,6 +247,8 @@ class SearchIndexerBase(object):
                 # determine if it's okay to skip adding the children herein based upon how recently any may have changed
                 skip_child_index = skip_index or \
                     (triggered_at is not None and (triggered_at - item.subtree_edited_on) > reindex_age)
+                if skip_child_index and not skip_index:
+                    skipped_count["count"] += 1
                 for child_item in item.get_children():
                     index_item(child_item, skip_index=skip_child_index)
 
@@ -182,20 +256,12 @@ class SearchIndexerBase(object):
                 return
 
             item_index = {}
-            # if it has something to add to the index, then add it
-            try:
-                item_index.update(location_info)
-                item_index.update(item_index_dictionary)
-                item_index['id'] = item_id
-                if item.start:
-                    item_index['start_date'] = item.start
-
-                searcher.index(cls.DOCUMENT_TYPE, item_index)
-                indexed_count["count"] += 1
-            except Exception as err:  # pylint: disable=broad-except
-                # broad exception so that index operation does not fail on one item of many
-                log.warning('Could not index item: %s - %r', item.location, err)
-                error_list.append(_('Could not index item: {}').format(item.location))
+            item_index.update(location_info)
+            item_index.update(item_index_dictionary)
+            item_index['id'] = item_id
+            if item.start:
+                item_index['start_date'] = item.start
+            batch.add(item.location, item_index)
 
         try:
             with modulestore.branch_setting(ModuleStoreEnum.RevisionOption.published_only):
@@ -207,6 +273,7 @@ class SearchIndexerBase(object):
                 # Now index the content
                 for item in structure.get_children():
                     index_item(item)
+                batch.flush()
                 cls.remove_deleted_items(searcher, structure_key, indexed_items)
         except Exception as err:  # pylint: disable=broad-except
             # broad exception so that index operation does not prevent the rest of the application from working
@@ -217,10 +284,23 @@ class SearchIndexerBase(object):
             )
             error_list.append(_('General indexing error occurred'))
 
+        elapsed = time.time() - start_time
+        log.info(
+            "Indexed %d of %d items of %s in %.2fs (%.1f items/s) with %d index requests; "
+            "%d unchanged subtrees skipped",
+            batch.indexed_count,
+            len(indexed_items),
+            structure_key,
+            elapsed,
+            batch.indexed_count / elapsed if elapsed else 0.0,
+            batch.request_count,
+            skipped_count["count"],
+        )
+
         if error_list:
             raise SearchIndexingError('Error(s) present during indexing', error_list)
 
-        return indexed_count["count"]
+        return batch.indexed_count
 
     @classmethod
     def _do_reindex(cls, modulestore, structure_key):
@@ -0,0 +1,40 @@
+""" Management command to rebuild the Studio course index """
+from django.core.management import BaseCommand
+from textwrap import dedent
+
+from contentstore.models import CourseListingConfig, CourseListingEntry
+from xmodule.course_module import CourseDescriptor
+from xmodule.modulestore.django import modulestore
+
+
+class Command(BaseCommand):
+    """
+    Command to rebuild the course index used by the Studio home page from the modulestore.
+    Entries for courses which no longer exist are removed. Once the index is built, Studio
+    home serves the course listing from it.
+
+    Example:
+
+        ./manage.py update_course_listing
+    """
+    help = dedent(__doc__)
+
+    can_import_settings = True
+
+    def handle(self, *args, **options):
+        """
+        Add or update an entry for every course in the modulestore, then remove the rest.
+        """
+        store = modulestore()
+        course_keys = set()
+        for course in store.get_courses():
+            if not isinstance(course, CourseDescriptor):
+                continue
+            CourseListingEntry.update_from_course(course, store.get_modulestore_type(course.id))
+            course_keys.add(course.id)
+
+        stale_keys = [key for key in CourseListingEntry.objects.values_list('id', flat=True) if key not in course_keys]
+        CourseListingEntry.objects.filter(id__in=stale_keys).delete()
+        if not CourseListingConfig.is_enabled():
+            CourseListingConfig(enabled=True).save()
+        self.stdout.write(u"Indexed {} courses, removed {} stale entries\n".format(len(course_keys), len(stale_keys)))
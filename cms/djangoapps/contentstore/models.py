@@ -3,9 +3,11 @@ Models for contentstore
 """
 # pylint: disable=no-member
 
+from django.db import models
 from django.db.models.fields import TextField
 
 from config_models.models import ConfigurationModel
+from xmodule_django.models import CourseKeyField, UsageKeyField
 
 
 class VideoUploadConfig(ConfigurationModel):
@@ -23,3 +25,49 @@ class VideoUploadConfig(ConfigurationModel):
 
 class PushNotificationConfig(ConfigurationModel):
     """Configuration for mobile push notifications."""
+
+
+class CourseListingConfig(ConfigurationModel):
+    """
+    Marks the Studio course index as built. Until the update_course_listing
+    command has enabled it, Studio home lists courses from the modulestore.
+    """
+
+
+class CourseListingEntry(models.Model):
+    """
+    Row of the Studio course index: the few fields the Studio home page shows
+    for a course, so courses can be listed without loading their descriptors.
+
+    Entries are kept current by the course_published and course_deleted
+    signals, and are built (or rebuilt) with the update_course_listing
+    command, which then enables CourseListingConfig. They
+    use the same attribute names as CourseDescriptor, so they can be formatted
+    for the course listing in place of the descriptor.
+    """
+    id = CourseKeyField(db_index=True, primary_key=True, max_length=255)  # pylint: disable=invalid-name
+    location = UsageKeyField(max_length=255)
+    display_name = models.TextField(null=True)
+    display_org_with_default = models.TextField()
+    display_number_with_default = models.TextField()
+    org = models.CharField(max_length=255, db_index=True)
+    run = models.CharField(max_length=255)
+    modulestore_type = models.CharField(max_length=32)
+
+    @classmethod
+    def update_from_course(cls, course, modulestore_type):
+        """
+        Create or update the entry for the given CourseDescriptor.
+        """
+        entry = cls(
+            id=course.id,
+            location=course.location,
+            display_name=course.display_name,
+            display_org_with_default=course.display_org_with_default,
+            display_number_with_default=course.display_number_with_default,
+            org=course.location.org,
+            run=course.location.run,
+            modulestore_type=modulestore_type,
+        )
+        entry.save()
+        return entry
@@ -1,4 +1,4 @@
-""" receivers of course_published and library_updated events in order to trigger indexing task """
+""" receivers of course_published, course_deleted and library_updated events in order to trigger indexing tasks """
 from datetime import datetime
 from pytz import UTC
 
@@ -19,6 +19,25 @@ def listen_for_course_publish(sender, course_key, **kwargs):  # pylint: disable=
         update_search_index.delay(unicode(course_key), datetime.now(UTC).isoformat())
 
 
+@receiver(SignalHandler.course_published)
+def listen_for_course_publish_listing(sender, course_key, **kwargs):  # pylint: disable=unused-argument
+    """
+    Receives signal and kicks off celery task to update the course's entry in the Studio course index
+    """
+    # import here, because signal is registered at startup, but items in tasks are not yet able to be loaded
+    from .tasks import update_course_listing
+    update_course_listing.delay(unicode(course_key))
+
+
+@receiver(SignalHandler.course_deleted)
+def listen_for_course_delete(sender, course_key, **kwargs):  # pylint: disable=unused-argument
+    """
+    Receives signal and removes the course from the Studio course index
+    """
+    from .models import CourseListingEntry
+    CourseListingEntry.objects.filter(id=course_key).delete()
+
+
 @receiver(SignalHandler.library_updated)
 def listen_for_library_update(sender, library_key, **kwargs):  # pylint: disable=unused-argument
     """
@@ -11,10 +11,11 @@ from pytz import UTC
 from django.contrib.auth.models import User
 
 from contentstore.courseware_index import CoursewareSearchIndexer, LibrarySearchIndexer, SearchIndexingError
+from contentstore.models import CourseListingEntry
 from contentstore.utils import initialize_permissions
 from course_action_state.models import CourseRerunState
 from opaque_keys.edx.keys import CourseKey
-from xmodule.course_module import CourseFields
+from xmodule.course_module import CourseDescriptor, CourseFields
 from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.exceptions import DuplicateCourseError, ItemNotFoundError
 
@@ -45,6 +46,9 @@ def rerun_course(source_course_key_string, destination_course_key_string, user_i
         # set initial permissions for the user to access the course.
         initialize_permissions(destination_course_key, User.objects.get(id=user_id))
 
+        # cloning does not publish, so add the new run to the course index here
+        update_course_listing(unicode(destination_course_key))
+
         # update state: Succeeded
         CourseRerunState.objects.succeeded(course_key=destination_course_key)
 
@@ -117,6 +121,21 @@ def update_library_index(library_id, triggered_time_isoformat):
         LOGGER.debug('Search indexing successful for library %s', library_id)
 
 
+@task()
+def update_course_listing(course_id):
+    """ Updates the course's entry in the Studio course index. """
+    course_key = CourseKey.from_string(course_id)
+    store = modulestore()
+    course = store.get_course(course_key)
+    if not isinstance(course, CourseDescriptor):
+        # the course was deleted before the task ran, or failed to load
+        CourseListingEntry.objects.filter(id=course_key).delete()
+        LOGGER.debug('Removed course listing entry for %s', course_id)
+        return
+    CourseListingEntry.update_from_course(course, store.get_modulestore_type(course_key))
+    LOGGER.debug('Updated course listing entry for %s', course_id)
+
+
 @task()
 def push_course_update_task(course_key_string, course_subscription_id, course_display_name):
     """
@@ -8,9 +8,14 @@ from chrono import Timer
 from mock import patch, Mock
 import ddt
 
+from django.core.management import call_command
 from django.test import RequestFactory
 
-from contentstore.views.course import _accessible_courses_list, _accessible_courses_list_from_groups, AccessListFallback
+from contentstore.models import CourseListingConfig, CourseListingEntry
+from contentstore.views.course import (
+    _accessible_courses_list, _accessible_courses_list_from_groups, _accessible_course_listing_entries,
+    AccessListFallback
+)
 from contentstore.utils import delete_course_and_groups
 from contentstore.tests.utils import AjaxEnabledTestClient
 from student.tests.factories import UserFactory
@@ -45,6 +50,7 @@ class TestCourseListing(ModuleStoreTestCase):
         self.request.user = self.user
         self.client = AjaxEnabledTestClient()
         self.client.login(username=self.user.username, password='test')
+        CourseListingConfig(enabled=True).save()
 
     def _create_course_with_access_groups(self, course_location, user=None):
         """
@@ -297,3 +303,95 @@ class TestCourseListing(ModuleStoreTestCase):
             self.assertSetEqual(
                 set_of_course_keys(courses_in_progress), set_of_course_keys(unsucceeded_course_actions, 'course_key')
             )
+
+    def test_course_listing_entries(self):
+        """
+        Test that the course index lists the user's courses without touching the modulestore
+        """
+        course_keys = [
+            self._create_course_with_access_groups(CourseLocator('Org', 'Course' + str(num), 'Run'), self.user).id
+            for num in range(3)
+        ]
+        self._create_course_with_access_groups(CourseLocator('Org', 'OtherCourse', 'Run'))
+
+        with check_mongo_calls(0):
+            entries, __ = _accessible_course_listing_entries(self.request)
+        self.assertSetEqual(set(course_keys), set(entry.id for entry in entries))
+
+        # global staff see every course
+        GlobalStaff().add_users(self.user)
+        entries, __ = _accessible_course_listing_entries(self.request)
+        self.assertEqual(len(entries), 4)
+
+    @ddt.data(OrgStaffRole('AwesomeOrg'), OrgInstructorRole('AwesomeOrg'))
+    def test_course_listing_entries_org_permissions(self, role):
+        """
+        Test that someone with org-wide permissions sees all of the org's courses in the course index
+        """
+        for number in ('Course1', 'Course2'):
+            self._create_course_with_access_groups(CourseLocator('AwesomeOrg', number, 'Run'))
+        self._create_course_with_access_groups(CourseLocator('OtherOrg', 'Course1', 'Run'))
+        role.add_users(self.user)
+
+        entries, __ = _accessible_course_listing_entries(self.request)
+        self.assertEqual(len(entries), 2)
+        entries, __ = _accessible_course_listing_entries(self.request, org='OtherOrg')
+        self.assertEqual(entries, [])
+
+    def test_course_listing_entries_fallback(self):
+        """
+        Test that courses are listed from the modulestore until the course index has been built,
+        even once some courses have been added to it
+        """
+        CourseListingConfig(enabled=False).save()
+        course_keys = [
+            self._create_course_with_access_groups(CourseLocator(org, 'Course', 'Run'), self.user).id
+            for org in ('Org', 'OtherOrg')
+        ]
+        CourseListingEntry.objects.filter(id=course_keys[0]).delete()
+
+        courses, __ = _accessible_course_listing_entries(self.request)
+        self.assertSetEqual(set(course_keys), set(course.id for course in courses))
+        courses, __ = _accessible_course_listing_entries(self.request, org='OtherOrg')
+        self.assertEqual([course.id for course in courses], course_keys[1:])
+
+    def test_update_course_listing_command(self):
+        """
+        Test that the update_course_listing command builds the course index, then enables it
+        """
+        CourseListingConfig(enabled=False).save()
+        course_keys = [
+            self._create_course_with_access_groups(CourseLocator('Org', 'Course' + str(num), 'Run'), self.user).id
+            for num in range(2)
+        ]
+        CourseListingEntry.objects.all().delete()
+
+        call_command('update_course_listing')
+        self.assertTrue(CourseListingConfig.is_enabled())
+        with check_mongo_calls(0):
+            entries, __ = _accessible_course_listing_entries(self.request)
+        self.assertSetEqual(set(course_keys), set(entry.id for entry in entries))
+
+    @ddt.data('page=x', 'page=0&page_size=x', 'page=-1', 'page=0&page_size=0')
+    def test_course_listing_bad_page(self, query):
+        """
+        Test that invalid paging parameters are rejected
+        """
+        response = self.client.get('/home/?' + query, HTTP_ACCEPT='text/html')
+        self.assertEqual(response.status_code, 400)
+
+    def test_course_listing_entry_updates(self):
+        """
+        Test that the course index entry follows the course as it is published and deleted
+        """
+        course = self._create_course_with_access_groups(CourseLocator('Org', 'Course', 'Run'), self.user)
+        entry = CourseListingEntry.objects.get(id=course.id)
+        self.assertEqual(entry.display_name, course.display_name)
+        self.assertEqual(entry.modulestore_type, ModuleStoreEnum.Type.mongo)
+
+        course.display_name = u'Renamed Course'
+        self.store.update_item(course, self.user.id)
+        self.assertEqual(CourseListingEntry.objects.get(id=course.id).display_name, u'Renamed Course')
+
+        self.store.delete_course(course.id, self.user.id)
+        self.assertFalse(CourseListingEntry.objects.filter(id=course.id).exists())
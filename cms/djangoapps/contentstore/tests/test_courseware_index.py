@@ -27,6 +27,7 @@ from xmodule.tests import DATA_DIR
 from xmodule.x_module import XModuleMixin
 
 from search.search_engine_base import SearchEngine
+from search.tests.mock_search_engine import MockSearchEngine
 
 from contentstore.courseware_index import (
     CoursewareSearchIndexer,
@@ -201,6 +202,19 @@ class MixedWithOptionsTestCase(MixedSplitTestCase):
             store.update_item(about_item, ModuleStoreEnum.UserID.test, allow_not_found=True)
 
 
+class BulkIndexingSearchEngine(MockSearchEngine):
+    """
+    In-memory search engine whose index method takes a list of documents, as
+    search engines supporting bulk indexing do. Records the size of each batch.
+    """
+    batch_sizes = []
+
+    def index(self, doc_type, sources, **kwargs):  # pylint: disable=arguments-differ
+        BulkIndexingSearchEngine.batch_sizes.append(len(sources))
+        for source in sources:
+            super(BulkIndexingSearchEngine, self).index(doc_type, source, **kwargs)
+
+
 @ddt.ddt
 class TestCoursewareSearchIndexer(MixedWithOptionsTestCase):
     """ Tests the operation of the CoursewareSearchIndexer """
@@ -485,6 +499,16 @@ class TestCoursewareSearchIndexer(MixedWithOptionsTestCase):
         self.assertIn(CourseMode.HONOR, response["results"][0]["data"]["modes"])
         self.assertIn(CourseMode.VERIFIED, response["results"][0]["data"]["modes"])
 
+    @patch('django.conf.settings.SEARCH_ENGINE', 'contentstore.tests.test_courseware_index.BulkIndexingSearchEngine')
+    @patch('contentstore.courseware_index.INDEX_BATCH_SIZE', 3)
+    def _test_bulk_indexing(self, store):
+        """ Test that documents are sent in batches to search engines that support it """
+        BulkIndexingSearchEngine.batch_sizes = []
+        self.publish_item(store, self.vertical.location)
+        self.assertEqual(self.reindex_course(store), 4)
+        self.assertEqual(BulkIndexingSearchEngine.batch_sizes, [3, 1])
+        self.assertEqual(self.search()["total"], 4)
+
     @patch('django.conf.settings.SEARCH_ENGINE', 'search.tests.utils.ErroringIndexEngine')
     def _test_exception(self, store):
         """ Test that exception within indexing yields a SearchIndexingError """
@@ -492,6 +516,10 @@ class TestCoursewareSearchIndexer(MixedWithOptionsTestCase):
         with self.assertRaises(SearchIndexingError):
             self.reindex_course(store)
 
+    @ddt.data(*WORKS_WITH_STORES)
+    def test_bulk_indexing(self, store_type):
+        self._perform_test_using_store(store_type, self._test_bulk_indexing)
+
     @ddt.data(*WORKS_WITH_STORES)
     def test_indexing_course(self, store_type):
         self._perform_test_using_store(store_type, self._test_indexing_course)
@@ -846,6 +874,22 @@ class TestLibrarySearchIndexer(MixedWithOptionsTestCase):
         indexed_count = self.reindex_library(store)
         self.assertFalse(indexed_count)
 
+    @patch('django.conf.settings.SEARCH_ENGINE', 'contentstore.tests.test_courseware_index.BulkIndexingSearchEngine')
+    @patch('contentstore.courseware_index.INDEX_BATCH_SIZE', 2)
+    def _test_bulk_indexing(self, store):
+        """ Test that library documents are sent in batches to search engines that support it """
+        BulkIndexingSearchEngine.batch_sizes = []
+        ItemFactory.create(
+            parent_location=self.library.location,
+            category="html",
+            display_name="Html Content 3",
+            modulestore=store,
+            publish_item=False,
+        )
+        self.assertEqual(self.reindex_library(store), 3)
+        self.assertEqual(BulkIndexingSearchEngine.batch_sizes, [2, 1])
+        self.assertEqual(self.search()["total"], 3)
+
     @patch('django.conf.settings.SEARCH_ENGINE', 'search.tests.utils.ErroringIndexEngine')
     def _test_exception(self, store):
         """ Test that exception within indexing yields a SearchIndexingError """
@@ -876,6 +920,10 @@ class TestLibrarySearchIndexer(MixedWithOptionsTestCase):
     def test_search_disabled(self, store_type):
         self._perform_test_using_store(store_type, self._test_search_disabled)
 
+    @ddt.data(*WORKS_WITH_STORES)
+    def test_bulk_indexing(self, store_type):
+        self._perform_test_using_store(store_type, self._test_bulk_indexing)
+
     @ddt.data(*WORKS_WITH_STORES)
     def test_exception(self, store_type):
         self._perform_test_using_store(store_type, self._test_exception)
@@ -12,6 +12,7 @@ from django.conf import settings
 
 from edxmako.shortcuts import render_to_response
 from cache_toolbox.core import del_cached_content
+from static_replace import clear_course_static_url_map
 
 from contentstore.utils import reverse_course_url
 from xmodule.contentstore.django import contentstore
@@ -280,6 +281,7 @@ def _upload_asset(request, course_key):
     # then commit the content
     contentstore().save(content)
     del_cached_content(content.location)
+    clear_course_static_url_map(course_key)
 
     # readback the saved content - we need the database timestamp
     readback = contentstore().find(content.location)
@@ -338,6 +340,7 @@ def _update_asset(request, course_key, asset_key):
         contentstore().delete(content.get_id())
         # remove from cache
         del_cached_content(content.location)
+        clear_course_static_url_map(course_key)
         return JsonResponse()
 
     elif request.method in ('PUT', 'POST'):
@@ -13,6 +13,7 @@ from django.conf import settings
 from django.views.decorators.http import require_http_methods, require_GET
 from django.core.exceptions import PermissionDenied
 from django.core.urlresolvers import reverse
+from django.db.models import Q
 from django.http import HttpResponseBadRequest, HttpResponseNotFound, HttpResponse, Http404
 from util.json_request import JsonResponse, JsonResponseBadRequest
 from util.date_utils import get_default_time_display
@@ -35,6 +36,7 @@ from openedx.core.djangoapps.course_groups.partition_scheme import get_cohorted_
 from django_future.csrf import ensure_csrf_cookie
 from contentstore.course_info_model import get_course_updates, update_course_updates, delete_course_update
 from contentstore.courseware_index import CoursewareSearchIndexer, SearchIndexingError
+from contentstore.models import CourseListingConfig, CourseListingEntry
 from contentstore.utils import (
     add_instructor,
     initialize_permissions,
@@ -76,6 +78,7 @@ from student.roles import (
     CourseInstructorRole, CourseStaffRole, CourseCreatorRole, GlobalStaff, UserBasedRole
 )
 from student import auth
+from student.models import CourseAccessRole
 from course_action_state.models import CourseRerunState, CourseRerunUIStateManager
 from course_action_state.managers import CourseActionStateItemNotFoundError
 from microsite_configuration import microsite
@@ -93,6 +96,9 @@ MINIMUM_GROUP_ID = 100
 RANDOM_SCHEME = "random"
 COHORT_SCHEME = "cohort"
 
+# Number of courses per page of the course listing when a page is requested
+COURSE_LISTING_PAGE_SIZE = 50
+
 
 # Note: the following content group configuration strings are not
 # translated since they are not visible to users.
@@ -373,6 +379,60 @@ def _accessible_courses_list(request):
     return courses, in_process_course_actions
 
 
+def _accessible_course_listing_entries(request, org=None):
+    """
+    List the course index entries available to the logged in user, optionally only those of
+    the given org, without loading any course from the modulestore
+
+    Until the index has been built (see the update_course_listing command), the courses are
+    listed from the modulestore instead.
+    """
+    user = request.user
+    if not CourseListingConfig.is_enabled():
+        log.warning("The course index isn't built: listing courses from the modulestore. Run update_course_listing.")
+        courses, in_process_course_actions = get_courses_accessible_to_user(request)
+        if org is not None:
+            courses = [course for course in courses if course.location.org == org]
+            in_process_course_actions = [
+                course for course in in_process_course_actions if course.course_key.org == org
+            ]
+        return courses, in_process_course_actions
+
+    entries = CourseListingEntry.objects.order_by('display_name', 'id')
+    if org is not None:
+        entries = entries.filter(org=org)
+
+    if not GlobalStaff().has_user(user):
+        # narrow the query down to the orgs and courses the user has a role in, then check
+        # access for each remaining entry against the user's (cached) roles
+        orgs, course_keys = set(), set()
+        for access_role in CourseAccessRole.objects.filter(
+                user=user, role__in=[CourseInstructorRole.ROLE, CourseStaffRole.ROLE]
+        ):
+            if access_role.course_id:
+                course_keys.add(access_role.course_id)
+            else:
+                orgs.add(access_role.org)
+        if orgs or course_keys:
+            entries = entries.filter(Q(org__in=orgs) | Q(id__in=course_keys))
+        else:
+            entries = entries.none()
+        entries = [entry for entry in entries if has_studio_read_access(user, entry.id)]
+
+    # pylint: disable=fixme
+    # TODO remove this condition when templates purged from db
+    entries = [entry for entry in entries if entry.location.course != 'templates']
+
+    in_process_course_actions = [
+        course for course in
+        CourseRerunState.objects.find_all(
+            exclude_args={'state': CourseRerunUIStateManager.State.SUCCEEDED}, should_display=True
+        )
+        if (org is None or course.course_key.org == org) and has_studio_read_access(user, course.course_key)
+    ]
+    return entries, in_process_course_actions
+
+
 def _accessible_courses_list_from_groups(request):
     """
     List all courses available to the logged in user by reversing access group names
@@ -423,9 +483,26 @@ def _accessible_libraries_list(user):
 @ensure_csrf_cookie
 def course_listing(request):
     """
-    List all courses available to the logged in user
+    List all courses available to the logged in user, from the course index
+
+    GET
+        org: only list the courses of this organization
+        page: the page of courses to list (0-based); all courses are listed if omitted
+        page_size: the number of courses per page (defaults to 50)
     """
-    courses, in_process_course_actions = get_courses_accessible_to_user(request)
+    if 'page' in request.GET:
+        try:
+            requested_page = int(request.GET['page'])
+            requested_page_size = int(request.GET.get('page_size', COURSE_LISTING_PAGE_SIZE))
+        except ValueError:
+            return HttpResponseBadRequest("page and page_size must be integers")
+        if requested_page < 0 or requested_page_size < 1:
+            return HttpResponseBadRequest("page must not be negative, and page_size must be positive")
+
+    courses, in_process_course_actions = _accessible_course_listing_entries(request, org=request.GET.get('org'))
+    if 'page' in request.GET:
+        start = requested_page * requested_page_size
+        courses = courses[start:start + requested_page_size]
     libraries = _accessible_libraries_list(request.user) if LIBRARIES_ENABLED else []
 
     def format_in_process_course_view(uca):
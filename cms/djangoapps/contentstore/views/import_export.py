@@ -31,6 +31,7 @@ from xmodule.modulestore.xml_importer import import_course_from_xml, import_libr
 from xmodule.modulestore.xml_exporter import export_course_to_xml, export_library_to_xml
 from xmodule.modulestore import COURSE_ROOT, LIBRARY_ROOT
 
+from static_replace import clear_course_static_url_map
 from student.auth import has_course_author_access
 
 from openedx.core.lib.extract_tar import safetar_extractall
@@ -270,6 +271,7 @@ def _import_handler(request, courselike_key, root_name, successful_url, context_
 
                 new_location = courselike_items[0].location
                 logging.debug('new course at %s', new_location)
+                clear_course_static_url_map(courselike_key)
 
                 log.info("Course import %s: Course import successful", courselike_key)
                 _save_request_status(request, courselike_string, 4)
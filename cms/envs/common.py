@@ -329,6 +329,11 @@ XBLOCK_SELECT_FUNCTION = prefer_xmodules
 ############################ Modulestore Configuration ################################
 MODULESTORE_BRANCH = 'draft-preferred'
 
+# Local directory caching the contents of assets too large for memcache, so they
+# aren't read from GridFS on every request, e.g.
+# {'DIRECTORY': '/tmp/static_content_cache', 'MAX_SIZE': 10 * 1024 ** 3}. Disabled if None.
+STATIC_CONTENT_DISK_CACHE = None
+
 MODULESTORE = {
     'default': {
         'ENGINE': 'xmodule.modulestore.mixed.MixedModuleStore',
@@ -746,6 +751,7 @@ INSTALLED_APPS = (
     'edx_jsme',    # Molecular Structure
 
     'openedx.core.djangoapps.content.course_structures',
+    'openedx.core.djangoapps.content.course_overviews',
 )
 
 
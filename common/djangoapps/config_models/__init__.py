@@ -53,6 +53,11 @@ timeout in each ``ConfigurationModel`` by setting the ``cache_timeout`` property
 You can change the name of the cache key used by the ``ConfigurationModel`` by overriding
 the ``cache_key_name`` function.
 
+In front of that cache, each process keeps the ``current`` configuration it last read for
+``CONFIGURATION_MODEL_PROCESS_CACHE_TIMEOUT`` seconds (5 by default, 0 disables it). Once that
+time is up, it checks a version key in the django cache, which is changed whenever a new
+configuration entry is saved, and only reads the configuration again if it changed.
+
 Extension
 ---------
 
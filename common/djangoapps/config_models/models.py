@@ -1,6 +1,10 @@
 """
 Django Model baseclass for database-backed configuration.
 """
+import time
+from uuid import uuid4
+
+from django.conf import settings
 from django.db import models
 from django.contrib.auth.models import User
 from django.core.cache import get_cache, InvalidCacheBackendError
@@ -10,6 +14,18 @@ try:
 except InvalidCacheBackendError:
     from django.core.cache import cache
 
+# The number of seconds a process reuses a current configuration without
+# checking the shared cache for changes, unless overridden in settings.
+PROCESS_CACHE_TIMEOUT = 5
+
+# Per-process tier in front of the shared cache, mapping each
+# ConfigurationModel class to a (version, current entry, expiry time) tuple.
+_process_cache = {}  # pylint: disable=invalid-name
+
+# Per-process counts of current() calls served by the process tier (hits)
+# and by the shared cache or database (misses), keyed by class.
+_process_cache_stats = {}  # pylint: disable=invalid-name
+
 
 class ConfigurationModel(models.Model):
     """
@@ -36,18 +52,66 @@ class ConfigurationModel(models.Model):
         """
         super(ConfigurationModel, self).save(*args, **kwargs)
         cache.delete(self.cache_key_name())
+        # Other processes notice the new version once their entry expires
+        cache.set(self.version_key_name(), uuid4().hex, self.cache_timeout)
+        _process_cache.pop(type(self), None)
 
     @classmethod
     def cache_key_name(cls):
         """Return the name of the key to use to cache the current configuration"""
         return 'configuration/{}/current'.format(cls.__name__)
 
+    @classmethod
+    def version_key_name(cls):
+        """
+        Return the name of the key identifying the version of the current
+        configuration, which changes whenever a new entry is saved.
+        """
+        return 'configuration/{}/version'.format(cls.__name__)
+
     @classmethod
     def current(cls):
         """
         Return the active configuration entry, either from cache,
         from the database, or by creating a new empty entry (which is not
         persisted).
+
+        Each process reuses the entry it last read for
+        CONFIGURATION_MODEL_PROCESS_CACHE_TIMEOUT seconds. After that, it only
+        reads the entry from the shared cache again if the version key shows
+        that a new entry was saved since.
+        """
+        timeout = getattr(settings, 'CONFIGURATION_MODEL_PROCESS_CACHE_TIMEOUT', PROCESS_CACHE_TIMEOUT)
+        if not timeout:
+            return cls._current_from_cache()
+
+        stats = _process_cache_stats.setdefault(cls, {'hits': 0, 'misses': 0})
+        now = time.time()
+        local = _process_cache.get(cls)
+        if local is not None and local[2] > now:
+            stats['hits'] += 1
+            return local[1]
+
+        version = cache.get(cls.version_key_name())
+        if local is not None and version is not None and version == local[0]:
+            stats['hits'] += 1
+            _process_cache[cls] = (version, local[1], now + timeout)
+            return local[1]
+
+        stats['misses'] += 1
+        if version is None:
+            version = uuid4().hex
+            if not cache.add(cls.version_key_name(), version, cls.cache_timeout):
+                version = cache.get(cls.version_key_name())
+        current = cls._current_from_cache()
+        _process_cache[cls] = (version, current, now + timeout)
+        return current
+
+    @classmethod
+    def _current_from_cache(cls):
+        """
+        Return the active configuration entry from the shared cache, or from
+        the database if it isn't cached.
         """
         cached = cache.get(cls.cache_key_name())
         if cached is not None:
@@ -61,6 +125,14 @@ class ConfigurationModel(models.Model):
         cache.set(cls.cache_key_name(), current, cls.cache_timeout)
         return current
 
+    @classmethod
+    def process_cache_stats(cls):
+        """
+        Return a dict with the number of hits and misses of the per-process
+        cache of current() in this process.
+        """
+        return dict(_process_cache_stats.get(cls, {'hits': 0, 'misses': 0}))
+
     @classmethod
     def is_enabled(cls):
         """Returns True if this feature is configured as enabled, else False."""
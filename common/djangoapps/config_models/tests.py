@@ -3,12 +3,15 @@ Tests of ConfigurationModel
 """
 
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.db import models
 from django.test import TestCase
+from django.test.utils import override_settings
 
 from freezegun import freeze_time
 
 from mock import patch
+from config_models import models as config_models
 from config_models.models import ConfigurationModel
 
 
@@ -74,3 +77,73 @@ class ConfigurationModelTests(TestCase):
         ExampleConfig.current()
 
         mock_cache.set.assert_called_with(ExampleConfig.cache_key_name(), first, 300)
+
+
+@override_settings(CONFIGURATION_MODEL_PROCESS_CACHE_TIMEOUT=5)
+@patch('config_models.models.time')
+class ProcessCacheTests(TestCase):
+    """
+    Tests of the per-process cache of ConfigurationModel.current
+    """
+    def setUp(self):
+        self.user = User()
+        self.user.save()
+        cache.clear()
+        config_models._process_cache.clear()  # pylint: disable=protected-access
+        config_models._process_cache_stats.clear()  # pylint: disable=protected-access
+
+    def save_config(self, string_field):
+        """
+        Save a new ExampleConfig with the given string_field.
+        """
+        config = ExampleConfig(changed_by=self.user, string_field=string_field)
+        config.save()
+        return config
+
+    def save_config_elsewhere(self, string_field):
+        """
+        Save a new ExampleConfig as another process would, leaving this
+        process's cached entry in place.
+        """
+        cached = config_models._process_cache.get(ExampleConfig)  # pylint: disable=protected-access
+        self.save_config(string_field)
+        config_models._process_cache[ExampleConfig] = cached  # pylint: disable=protected-access
+
+    def test_reused_within_timeout(self, mock_time):
+        mock_time.time.return_value = 1000
+        self.save_config('first')
+        self.assertEquals(ExampleConfig.current().string_field, 'first')
+
+        with patch('config_models.models.cache') as mock_cache:
+            self.assertEquals(ExampleConfig.current().string_field, 'first')
+        self.assertFalse(mock_cache.get.called)
+        self.assertEquals(ExampleConfig.process_cache_stats(), {'hits': 1, 'misses': 1})
+
+    def test_save_in_process_is_seen_immediately(self, mock_time):
+        mock_time.time.return_value = 1000
+        self.save_config('first')
+        self.assertEquals(ExampleConfig.current().string_field, 'first')
+
+        self.save_config('second')
+        self.assertEquals(ExampleConfig.current().string_field, 'second')
+
+    def test_save_elsewhere_is_seen_after_timeout(self, mock_time):
+        mock_time.time.return_value = 1000
+        self.save_config('first')
+        self.assertEquals(ExampleConfig.current().string_field, 'first')
+
+        self.save_config_elsewhere('second')
+        self.assertEquals(ExampleConfig.current().string_field, 'first')
+
+        mock_time.time.return_value = 1006
+        self.assertEquals(ExampleConfig.current().string_field, 'second')
+
+    def test_unchanged_version_revalidates(self, mock_time):
+        mock_time.time.return_value = 1000
+        self.save_config('first')
+        ExampleConfig.current()
+
+        mock_time.time.return_value = 1006
+        with self.assertNumQueries(0):
+            self.assertEquals(ExampleConfig.current().string_field, 'first')
+        self.assertEquals(ExampleConfig.process_cache_stats(), {'hits': 1, 'misses': 1})
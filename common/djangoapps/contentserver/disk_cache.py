@@ -0,0 +1,170 @@
+"""
+Local disk cache for the contents of large assets.
+
+Assets too large for memcache are otherwise read from GridFS on every
+request. This keeps copies of them in a local directory, bounded in total
+size and evicting the least recently served files first. Several processes
+may share the directory.
+"""
+
+import errno
+import hashlib
+import logging
+import os
+import tempfile
+
+log = logging.getLogger(__name__)
+
+# Prefix of files being written, which are not yet part of the cache.
+TEMP_FILE_PREFIX = 'tmp-'
+
+
+class AssetDiskCache(object):
+    """
+    LRU cache of asset contents in a local directory.
+
+    Files are named after the asset location and content digest, so a
+    re-uploaded asset never matches the copy of its previous version.
+    """
+
+    def __init__(self, directory, max_size):
+        """
+        :Parameters:
+
+          - `directory`: the directory to store files in
+          - `max_size`: the maximum total size of the cached files, in bytes
+
+        """
+        self.directory = directory
+        self.max_size = max_size
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+    def can_cache(self, content):
+        """
+        Return whether content can be stored in this cache.
+        """
+        return (
+            getattr(content, 'content_digest', None) is not None and
+            content.length is not None and
+            content.length <= self.max_size
+        )
+
+    def _path(self, content):
+        """
+        Return the path of the file caching content.
+        """
+        key = u'{}:{}'.format(content.location, content.content_digest).encode('utf-8')
+        return os.path.join(self.directory, hashlib.sha1(key).hexdigest())
+
+    def open(self, content):
+        """
+        Return an open file with the data of content, or None if it isn't cached.
+        """
+        if not self.can_cache(content):
+            return None
+        path = self._path(content)
+        try:
+            cached_file = open(path, 'rb')
+        except IOError:
+            return None
+
+        # The modification time records when the file was last served.
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+        return cached_file
+
+    def tee(self, content, chunks):
+        """
+        Yield chunks (the full data of content), saving them in the cache.
+
+        The file is only added to the cache once all of the chunks have been
+        consumed, so an interrupted download never leaves a partial copy. If
+        the file can't be written (e.g. the disk is full), the chunks are
+        still all yielded, only without being cached.
+        """
+        try:
+            temp_file = tempfile.NamedTemporaryFile(dir=self.directory, prefix=TEMP_FILE_PREFIX, delete=False)
+        except (IOError, OSError):
+            log.exception(u"Could not create a file in the asset disk cache")
+            for chunk in chunks:
+                yield chunk
+            return
+
+        complete = False
+        try:
+            for chunk in chunks:
+                if temp_file is not None:
+                    try:
+                        temp_file.write(chunk)
+                    except (IOError, OSError):
+                        log.exception(u"Could not write to the asset disk cache")
+                        _discard(temp_file)
+                        temp_file = None
+                yield chunk
+            complete = True
+        finally:
+            if temp_file is not None:
+                if complete:
+                    self._add(temp_file, content)
+                else:
+                    _discard(temp_file)
+
+    def _add(self, temp_file, content):
+        """
+        Add the completely written temp_file to the cache, as the copy of content.
+        """
+        try:
+            temp_file.close()
+            os.rename(temp_file.name, self._path(content))
+            self._evict()
+        except (IOError, OSError):
+            log.exception(u"Could not add a file to the asset disk cache")
+            _discard(temp_file)
+
+    def _evict(self):
+        """
+        Remove the least recently served files until the cache fits in max_size.
+        """
+        files = []
+        for name in os.listdir(self.directory):
+            if name.startswith(TEMP_FILE_PREFIX):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                # Evicted by another process
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+
+        total_size = sum(size for __, size, __ in files)
+        for __, size, path in sorted(files):
+            if total_size <= self.max_size:
+                break
+            _remove(path)
+            total_size -= size
+
+
+def _discard(temp_file):
+    """
+    Close and remove temp_file, logging rather than raising any error.
+    """
+    try:
+        temp_file.close()
+        _remove(temp_file.name)
+    except (IOError, OSError):
+        log.exception(u"Could not remove a file from the asset disk cache")
+
+
+def _remove(path):
+    """
+    Remove the file at path, if it still exists.
+    """
+    try:
+        os.remove(path)
+    except OSError as error:
+        if error.errno != errno.ENOENT:
+            raise
@@ -3,14 +3,17 @@ Middleware to serve assets.
 """
 
 import logging
+from uuid import uuid4
 
+from django.conf import settings
 from django.http import (
     HttpResponse, HttpResponseNotModified, HttpResponseForbidden
 )
 from student.models import CourseEnrollment
 
+from contentserver.disk_cache import AssetDiskCache
 from xmodule.assetstore.assetmgr import AssetManager
-from xmodule.contentstore.content import StaticContent, XASSET_LOCATION_TAG
+from xmodule.contentstore.content import StaticContent, StaticContentStream, XASSET_LOCATION_TAG
 from xmodule.modulestore import InvalidLocationError
 from opaque_keys import InvalidKeyError
 from opaque_keys.edx.locator import AssetLocator
@@ -25,6 +28,13 @@ log = logging.getLogger(__name__)
 
 
 class StaticContentServer(object):
+    def __init__(self):
+        disk_cache_settings = getattr(settings, 'STATIC_CONTENT_DISK_CACHE', None)
+        if disk_cache_settings:
+            self.disk_cache = AssetDiskCache(disk_cache_settings['DIRECTORY'], disk_cache_settings['MAX_SIZE'])
+        else:
+            self.disk_cache = None
+
     def process_request(self, request):
         # look to see if the request is prefixed with an asset prefix tag
         if (
@@ -81,13 +91,36 @@ class StaticContentServer(object):
             # timestamp, so we can simply compare the strings
             last_modified_at_str = content.last_modified_at.strftime("%a, %d-%b-%Y %H:%M:%S GMT")
 
+            # Contents cached before digests were recorded have no content_digest
+            content_digest = getattr(content, 'content_digest', None)
+            etag = '"{}"'.format(content_digest) if content_digest else None
+
             # see if the client has cached this content, if so then compare the
-            # timestamps, if they are the same then just return a 304 (Not Modified)
-            if 'HTTP_IF_MODIFIED_SINCE' in request.META:
+            # ETags (or failing that the timestamps), if they are the same then
+            # just return a 304 (Not Modified)
+            if etag and 'HTTP_IF_NONE_MATCH' in request.META:
+                if_none_match = request.META['HTTP_IF_NONE_MATCH']
+                # If-None-Match uses the weak comparison: W/"x" matches "x"
+                tags = [_strip_weak_prefix(tag.strip()) for tag in if_none_match.split(',')]
+                if if_none_match.strip() == '*' or etag in tags:
+                    return HttpResponseNotModified()
+            elif 'HTTP_IF_MODIFIED_SINCE' in request.META:
                 if_modified_since = request.META['HTTP_IF_MODIFIED_SINCE']
                 if if_modified_since == last_modified_at_str:
                     return HttpResponseNotModified()
 
+            # Serve large assets from the local disk cache rather than GridFS, if they are there
+            if self.disk_cache and isinstance(content, StaticContentStream):
+                cached_file = self.disk_cache.open(content)
+                if cached_file is not None:
+                    content.close()
+                    content = _content_with_stream(content, cached_file)
+                    streamed_from_db = False
+                else:
+                    streamed_from_db = True
+            else:
+                streamed_from_db = isinstance(content, StaticContentStream)
+
             # *** File streaming within a byte range ***
             # If a Range is provided, parse Range attribute of the request
             # Add Content-Range in the response if Range is structurally correct
@@ -96,10 +129,6 @@ class StaticContentServer(object):
             # http://www.w3.org/Protocols/rfc2616/rfc2616-sec14.html#sec14.35
             response = None
             if request.META.get('HTTP_RANGE'):
-                # Data from cache (StaticContent) has no easy byte management, so we use the DB instead (StaticContentStream)
-                if type(content) == StaticContent:
-                    content = AssetManager.find(loc, as_stream=True)
-
                 header_value = request.META['HTTP_RANGE']
                 try:
                     unit, ranges = parse_range_header(header_value, content.length)
@@ -112,43 +141,138 @@ class StaticContentServer(object):
                     if unit != 'bytes':
                         # Only accept ranges in bytes
                         log.warning(u"Unknown unit in Range header: %s for content: %s", header_value, unicode(loc))
-                    elif len(ranges) > 1:
-                        # According to Http/1.1 spec content for multiple ranges should be sent as a multipart message.
-                        # http://www.w3.org/Protocols/rfc2616/rfc2616-sec14.html#sec14.16
-                        # But we send back the full content.
-                        log.warning(
-                            u"More than 1 ranges in Range header: %s for content: %s", header_value, unicode(loc)
-                        )
                     else:
-                        first, last = ranges[0]
-
-                        if 0 <= first <= last < content.length:
-                            # If the byte range is satisfiable
-                            response = HttpResponse(content.stream_data_in_range(first, last))
+                        # Unsatisfiable ranges are ignored, unless none of them is satisfiable.
+                        satisfiable_ranges = [
+                            (first, last) for first, last in ranges if 0 <= first <= last < content.length
+                        ]
+                        if not satisfiable_ranges:
+                            log.warning(
+                                u"Cannot satisfy ranges in Range header: %s for content: %s", header_value, unicode(loc)
+                            )
+                            return HttpResponse(status=416)  # Requested Range Not Satisfiable
+                        elif len(satisfiable_ranges) == 1:
+                            first, last = satisfiable_ranges[0]
+                            response = HttpResponse(_closing(content.stream_data_in_range(first, last), content))
                             response['Content-Range'] = 'bytes {first}-{last}/{length}'.format(
                                 first=first, last=last, length=content.length
                             )
                             response['Content-Length'] = str(last - first + 1)
+                            response['Content-Type'] = content.content_type
                             response.status_code = 206  # Partial Content
                         else:
-                            log.warning(
-                                u"Cannot satisfy ranges in Range header: %s for content: %s", header_value, unicode(loc)
-                            )
-                            return HttpResponse(status=416)  # Requested Range Not Satisfiable
+                            # According to Http/1.1 spec content for multiple ranges is sent as a multipart message.
+                            # http://www.w3.org/Protocols/rfc2616/rfc2616-sec14.html#sec14.16
+                            response = multipart_byteranges_response(content, satisfiable_ranges)
 
             # If Range header is absent or syntactically invalid return a full content response.
             if response is None:
-                response = HttpResponse(content.stream_data())
+                data = content.stream_data()
+                if streamed_from_db and self.disk_cache and self.disk_cache.can_cache(content):
+                    data = self.disk_cache.tee(content, data)
+                response = HttpResponse(_closing(data, content))
                 response['Content-Length'] = content.length
+                response['Content-Type'] = content.content_type
 
             # "Accept-Ranges: bytes" tells the user that only "bytes" ranges are allowed
             response['Accept-Ranges'] = 'bytes'
-            response['Content-Type'] = content.content_type
             response['Last-Modified'] = last_modified_at_str
+            if etag:
+                response['ETag'] = etag
 
             return response
 
 
+def _strip_weak_prefix(tag):
+    """
+    Return the entity tag tag without its weakness indicator, if any.
+    """
+    return tag[2:] if tag.startswith('W/') else tag
+
+
+class _ClosingIterator(object):
+    """
+    Iterable over chunks of the data of a StaticContentStream, which closes
+    the content's stream once they are exhausted, or when the response
+    serving them is closed.
+    """
+    def __init__(self, chunks, content):
+        self.chunks = chunks
+        self.content = content
+
+    def __iter__(self):
+        try:
+            for chunk in self.chunks:
+                yield chunk
+        finally:
+            self.close()
+
+    def close(self):
+        """
+        Close the chunks generator, then the content's stream.
+        """
+        if hasattr(self.chunks, 'close'):
+            self.chunks.close()
+        self.content.close()
+
+
+def _closing(chunks, content):
+    """
+    Return chunks, closing the stream of content once done with them if it is a StaticContentStream.
+    """
+    if isinstance(content, StaticContentStream):
+        return _ClosingIterator(chunks, content)
+    return chunks
+
+
+def _content_with_stream(content, stream):
+    """
+    Return a StaticContentStream with the attributes of content, reading its data from stream.
+    """
+    return StaticContentStream(
+        content.location, content.name, content.content_type, stream,
+        last_modified_at=content.last_modified_at, thumbnail_location=content.thumbnail_location,
+        import_path=content.import_path, length=content.length, locked=content.locked,
+        content_digest=content.content_digest
+    )
+
+
+def multipart_byteranges_response(content, ranges):
+    """
+    Returns a 206 response streaming the given (first, last) byte ranges of content as a
+    multipart/byteranges message.
+
+    See spec for details: http://www.w3.org/Protocols/rfc2616/rfc2616-sec19.html#sec19.2
+    """
+    boundary = uuid4().hex
+    part_headers = [
+        '--{boundary}\r\nContent-Type: {content_type}\r\nContent-Range: bytes {first}-{last}/{length}\r\n\r\n'.format(
+            boundary=boundary, content_type=content.content_type, first=first, last=last, length=content.length
+        )
+        for first, last in ranges
+    ]
+    closing = '--{boundary}--\r\n'.format(boundary=boundary)
+
+    def stream_parts():
+        """
+        Yield the parts one after the other, only reading each range when it is reached.
+        """
+        for part_header, (first, last) in zip(part_headers, ranges):
+            yield part_header
+            for chunk in content.stream_data_in_range(first, last):
+                yield chunk
+            yield '\r\n'
+        yield closing
+
+    response = HttpResponse(_closing(stream_parts(), content), status=206)
+    response['Content-Type'] = 'multipart/byteranges; boundary={}'.format(boundary)
+    response['Content-Length'] = str(
+        sum(len(part_header) + (last - first + 1) + 2 for part_header, (first, last) in zip(part_headers, ranges)) +
+        len(closing)
+    )
+    return response
+
+
 def parse_range_header(header_value, content_length):
     """
     Returns the unit and a list of (start, end) tuples of ranges.
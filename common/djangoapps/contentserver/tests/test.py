@@ -4,20 +4,27 @@ Tests for StaticContentServer
 import copy
 import ddt
 import logging
+import os
+import shutil
+import tempfile
 import unittest
+from mock import Mock, patch
+from tempfile import mkdtemp
 from uuid import uuid4
 
 from django.conf import settings
 from django.test.client import Client
 from django.test.utils import override_settings
 
+from xmodule.contentstore.content import StaticContent
 from xmodule.contentstore.django import contentstore
 from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
 from xmodule.modulestore import ModuleStoreEnum
 from xmodule.modulestore.xml_importer import import_course_from_xml
 
-from contentserver.middleware import parse_range_header
+from contentserver.disk_cache import AssetDiskCache, TEMP_FILE_PREFIX
+from contentserver.middleware import parse_range_header, _content_with_stream
 from student.models import CourseEnrollment
 
 log = logging.getLogger(__name__)
@@ -146,7 +153,7 @@ class ContentStoreToyCourseTest(ModuleStoreTestCase):
 
     def test_range_request_multiple_ranges(self):
         """
-        Test that multiple ranges in request outputs the full content.
+        Test that multiple ranges in request outputs a multipart message with each range.
         """
         first_byte = self.length_unlocked / 4
         last_byte = self.length_unlocked / 2
@@ -154,9 +161,46 @@ class ContentStoreToyCourseTest(ModuleStoreTestCase):
             first=first_byte, last=last_byte)
         )
 
-        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.status_code, 206)  # HTTP_206_PARTIAL_CONTENT
+        self.assertTrue(resp['Content-Type'].startswith('multipart/byteranges; boundary='))
         self.assertNotIn('Content-Range', resp)
-        self.assertEqual(resp['Content-Length'], str(self.length_unlocked))
+        self.assertEqual(resp['Content-Length'], str(len(resp.content)))
+
+        data = self.contentstore.find(self.unlocked_asset).data
+        for first, last in [(first_byte, last_byte), (self.length_unlocked - 100, self.length_unlocked - 1)]:
+            part = 'Content-Range: bytes {first}-{last}/{length}\r\n\r\n{data}\r\n'.format(
+                first=first, last=last, length=self.length_unlocked, data=data[first:last + 1]
+            )
+            self.assertIn(part, resp.content)
+
+    def test_range_request_cached_content(self):
+        """
+        Test that a range request for content cached in memory returns the right bytes.
+        """
+        self.client.get(self.url_unlocked)  # caches the content
+        resp = self.client.get(self.url_unlocked, HTTP_RANGE='bytes=10-19')
+
+        self.assertEqual(resp.status_code, 206)  # HTTP_206_PARTIAL_CONTENT
+        self.assertEqual(resp.content, self.contentstore.find(self.unlocked_asset).data[10:20])
+
+    def test_etag(self):
+        """
+        Test that assets have an ETag, and that a request with a matching If-None-Match
+        returns 304 Not Modified.
+        """
+        resp = self.client.get(self.url_unlocked)
+        self.assertEqual(resp.status_code, 200)
+        etag = resp['ETag']
+
+        resp = self.client.get(self.url_unlocked, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, 304)
+
+        resp = self.client.get(self.url_unlocked, HTTP_IF_NONE_MATCH='"outdated"')
+        self.assertEqual(resp.status_code, 200)
+
+        # weak entity tags match too
+        resp = self.client.get(self.url_unlocked, HTTP_IF_NONE_MATCH='"outdated", W/' + etag)
+        self.assertEqual(resp.status_code, 304)
 
     @ddt.data(
         'bytes 0-',
@@ -182,6 +226,27 @@ class ContentStoreToyCourseTest(ModuleStoreTestCase):
         )
         self.assertEqual(resp.status_code, 416)
 
+    def test_disk_cache(self):
+        """
+        Test that assets too large for memcache are served from the disk cache once it has them.
+        """
+        large_asset = self.course_key.make_asset_key('asset', 'large_static.txt')
+        data = 'abcdefghij' * 110000
+        self.contentstore.save(StaticContent(large_asset, 'large_static.txt', 'text/plain', data))
+
+        cache_dir = mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+        with override_settings(STATIC_CONTENT_DISK_CACHE={'DIRECTORY': cache_dir, 'MAX_SIZE': 2 * len(data)}):
+            resp = Client().get(unicode(large_asset))
+            self.assertEqual(resp.content, data)
+            self.assertEqual(len(os.listdir(cache_dir)), 1)
+
+            with patch('contentserver.middleware._content_with_stream', wraps=_content_with_stream) as mock_content:
+                resp = Client().get(unicode(large_asset), HTTP_RANGE='bytes=1000-1999')
+            self.assertTrue(mock_content.called)
+            self.assertEqual(resp.status_code, 206)
+            self.assertEqual(resp.content, data[1000:2000])
+
     def test_range_request_malformed_out_of_bounds(self):
         """
         Test that a range request with malformed Range (first_byte, last_byte == totalLength, offset by 1 error)
@@ -236,3 +301,83 @@ class ParseRangeHeaderTestCase(unittest.TestCase):
         self.assertRaisesRegexp(
             exception_class, exception_message_regex, parse_range_header, header_value, self.content_length
         )
+
+
+class AssetDiskCacheTestCase(unittest.TestCase):
+    """
+    Tests for AssetDiskCache.
+    """
+
+    def setUp(self):
+        self.directory = mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.cache = AssetDiskCache(self.directory, max_size=25)
+
+    def content(self, name, data):
+        """
+        Return a StaticContent for data.
+        """
+        return StaticContent(name, name, 'text/plain', data, length=len(data), content_digest=name + '-digest')
+
+    def cache_content(self, content):
+        """
+        Serve content through the cache, and return the served data.
+        """
+        return ''.join(self.cache.tee(content, content.stream_data()))
+
+    def test_open(self):
+        content = self.content('first', '0123456789')
+        self.assertIsNone(self.cache.open(content))
+
+        self.assertEqual(self.cache_content(content), '0123456789')
+        self.assertEqual(self.cache.open(content).read(), '0123456789')
+
+    def test_interrupted_download_not_cached(self):
+        content = self.content('first', '0123456789')
+        chunks = self.cache.tee(content, iter(['01234', '56789']))
+        next(chunks)
+        chunks.close()
+
+        self.assertIsNone(self.cache.open(content))
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_write_error_not_cached(self):
+        content = self.content('first', '0123456789')
+        temp_file = tempfile.NamedTemporaryFile(dir=self.directory, prefix=TEMP_FILE_PREFIX, delete=False)
+        failing_file = Mock()
+        failing_file.name = temp_file.name
+        failing_file.write.side_effect = IOError(28, 'No space left on device')
+        failing_file.close.side_effect = temp_file.close
+
+        with patch('contentserver.disk_cache.tempfile.NamedTemporaryFile', return_value=failing_file):
+            chunks = list(self.cache.tee(content, iter(['01234', '56789'])))
+
+        self.assertEqual(chunks, ['01234', '56789'])
+        self.assertIsNone(self.cache.open(content))
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_rename_error_not_cached(self):
+        content = self.content('first', '0123456789')
+        with patch('contentserver.disk_cache.os.rename', side_effect=OSError(28, 'No space left on device')):
+            self.assertEqual(self.cache_content(content), '0123456789')
+
+        self.assertIsNone(self.cache.open(content))
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_least_recently_used_evicted(self):
+        first, second, third = [self.content(name, '0123456789') for name in ('first', 'second', 'third')]
+        self.cache_content(first)
+        self.cache_content(second)
+        # Make sure modification times differ, then serve `first` so `second` is the least recently used
+        os.utime(self.cache._path(second), (0, 0))  # pylint: disable=protected-access
+        self.cache.open(first).close()
+
+        self.cache_content(third)
+
+        self.assertIsNotNone(self.cache.open(first))
+        self.assertIsNone(self.cache.open(second))
+        self.assertIsNotNone(self.cache.open(third))
+
+    def test_too_large_not_cached(self):
+        content = self.content('large', 'x' * 26)
+        self.assertFalse(self.cache.can_cache(content))
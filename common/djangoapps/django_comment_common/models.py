@@ -2,13 +2,14 @@ import logging
 
 from django.db import models
 from django.contrib.auth.models import User
+from django.core.cache import cache
 
 from django.dispatch import receiver
 from django.db.models.signals import post_save
 from django.utils.translation import ugettext_noop
 from student.models import CourseEnrollment
 
-from xmodule.modulestore.django import modulestore
+from xmodule.modulestore.django import modulestore, SignalHandler
 from xmodule.modulestore.exceptions import ItemNotFoundError
 from xmodule_django.models import CourseKeyField, NoneToEmptyManager
 
@@ -40,6 +41,21 @@ def assign_default_role_on_enrollment(sender, instance, **kwargs):
     assign_default_role(instance.course_id, instance.user)
 
 
+@receiver(SignalHandler.course_published)
+def invalidate_discussion_modules_on_publish(sender, course_key, **kwargs):  # pylint: disable=unused-argument
+    """
+    Discard the cached discussion modules of a course when it is published.
+    """
+    cache.delete(discussion_modules_cache_key(course_key))
+
+
+def discussion_modules_cache_key(course_key):
+    """
+    Return the cache key of the discussion module summaries of a course.
+    """
+    return u"django_comment_common.discussion_modules.{}".format(course_key)
+
+
 def assign_default_role(course_id, user):
     """
     Assign forum default role 'Student' to user
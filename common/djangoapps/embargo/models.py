@@ -11,6 +11,7 @@ file and check it in at the same time as your model changes. To do that,
 3. Add the migration file created in edx-platform/common/djangoapps/embargo/migrations/
 """
 
+from bisect import bisect_right
 import ipaddr
 import json
 import logging
@@ -675,11 +676,34 @@ class IPFilter(ConfigurationModel):
     class IPFilterList(object):
         """
         Represent a list of IP addresses with support of networks.
+
+        The networks are compiled into sorted, non-overlapping ranges of
+        integer addresses for each IP version, so membership is tested with a
+        binary search.
         """
 
         def __init__(self, ips):
             self.networks = [ipaddr.IPNetwork(ip) for ip in ips]
 
+            ranges = {4: [], 6: []}
+            for network in self.networks:
+                ranges[network.version].append((int(network.network), int(network.broadcast)))
+
+            # Map each IP version to the starts and ends of its merged ranges
+            self._starts = {}
+            self._ends = {}
+            for version, version_ranges in ranges.items():
+                starts = []
+                ends = []
+                for start, end in sorted(version_ranges):
+                    if ends and start <= ends[-1] + 1:
+                        ends[-1] = max(ends[-1], end)
+                    else:
+                        starts.append(start)
+                        ends.append(end)
+                self._starts[version] = starts
+                self._ends[version] = ends
+
         def __iter__(self):
             for network in self.networks:
                 yield network
@@ -690,26 +714,39 @@ class IPFilter(ConfigurationModel):
             except ValueError:
                 return False
 
-            for network in self.networks:
-                if network.Contains(ip):
-                    return True
+            address = int(ip)
+            index = bisect_right(self._starts[ip.version], address) - 1
+            return index >= 0 and address <= self._ends[ip.version][index]
 
-            return False
+    def _ip_filter_list(self, field_name):
+        """
+        Return the IPFilterList for the named field, compiling it on first use.
+
+        The list is kept on the instance, which ConfigurationModel.current()
+        reuses until a new configuration is saved.
+        """
+        attribute = '_{}_ips'.format(field_name)
+        filter_list = self.__dict__.get(attribute)
+        if filter_list is None:
+            value = getattr(self, field_name)
+            if value == '':
+                filter_list = []
+            else:
+                addresses = [addr.strip() for addr in value.split(',')]
+                filter_list = self.IPFilterList(addresses)  # pylint: disable=no-member
+            self.__dict__[attribute] = filter_list
+        return filter_list
 
     @property
     def whitelist_ips(self):
         """
         Return a list of valid IP addresses to whitelist
         """
-        if self.whitelist == '':
-            return []
-        return self.IPFilterList([addr.strip() for addr in self.whitelist.split(',')])  # pylint: disable=no-member
+        return self._ip_filter_list('whitelist')
 
     @property
     def blacklist_ips(self):
         """
         Return a list of valid IP addresses to blacklist
         """
-        if self.blacklist == '':
-            return []
-        return self.IPFilterList([addr.strip() for addr in self.blacklist.split(',')])  # pylint: disable=no-member
+        return self._ip_filter_list('blacklist')
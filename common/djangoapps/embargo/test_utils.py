@@ -7,6 +7,7 @@ import pygeoip
 from django.core.urlresolvers import reverse
 from django.core.cache import cache
 from embargo.models import Country, CountryAccessRule, RestrictedCourse
+from geoinfo.api import get_country_lookup
 
 
 @contextlib.contextmanager
@@ -40,9 +41,10 @@ def restrict_course(course_key, access_point="enrollment", disable_access_check=
     >>>     self.assertRedirects(resp, redirect_url)
 
     """
-    # Clear the cache to ensure that previous tests don't interfere
+    # Clear the caches to ensure that previous tests don't interfere
     # with this test.
     cache.clear()
+    get_country_lookup().clear_cache()
 
     with mock.patch.object(pygeoip.GeoIP, 'country_code_by_addr') as mock_ip:
 
@@ -26,6 +26,7 @@ from embargo.models import (
 from util.testing import UrlResetMixin
 from embargo import api as embargo_api
 from embargo.exceptions import InvalidAccessPoint
+from geoinfo.api import get_country_lookup
 from mock import patch
 
 
@@ -184,6 +185,7 @@ class EmbargoCheckAccessApiTests(ModuleStoreTestCase):
 
     @contextmanager
     def _mock_geoip(self, country_code):
+        get_country_lookup().clear_cache()
         with mock.patch.object(pygeoip.GeoIP, 'country_code_by_addr') as mock_ip:
             mock_ip.return_value = country_code
             yield
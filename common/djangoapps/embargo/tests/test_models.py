@@ -100,6 +100,23 @@ class EmbargoModelsTest(TestCase):
         self.assertTrue('1.1.1.0' in cblacklist)
         self.assertFalse('1.2.0.0' in cblacklist)
 
+    def test_ip_overlapping_networks(self):
+        blacklist = '1.1.0.0/16, 1.1.4.0/24, 1.2.0.0/16, 10.0.0.1, 2002:c0a8::/32, 2002:c0a8:101::42'
+
+        IPFilter(blacklist=blacklist).save()
+
+        cblacklist = IPFilter.current().blacklist_ips
+        for addr in ('1.1.0.0', '1.1.4.5', '1.2.255.255', '10.0.0.1', '2002:c0a8:ffff::1'):
+            self.assertIn(addr, cblacklist)
+        for addr in ('1.0.255.255', '1.3.0.0', '10.0.0.0', '10.0.0.2', '2002:c0a9::1', '::1', 'not an ip'):
+            self.assertNotIn(addr, cblacklist)
+
+    def test_ip_filter_compiled_once(self):
+        IPFilter(blacklist='1.1.0.0/16').save()
+
+        ip_filter = IPFilter.current()
+        self.assertIs(ip_filter.blacklist_ips, ip_filter.blacklist_ips)
+
 
 class RestrictedCourseTest(TestCase):
     """Test RestrictedCourse model. """
@@ -6,7 +6,6 @@ source to be used throughout the API.
 import logging
 from django.contrib.auth.models import User
 from opaque_keys.edx.keys import CourseKey
-from xmodule.modulestore.django import modulestore
 from enrollment.errors import (
     CourseNotFoundError, CourseEnrollmentClosedError, CourseEnrollmentFullError,
     CourseEnrollmentExistsError, UserNotFoundError,
@@ -16,6 +15,7 @@ from student.models import (
     CourseEnrollment, NonExistentCourseError, EnrollmentClosedError,
     CourseFullError, AlreadyEnrolledError,
 )
+from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
 
 log = logging.getLogger(__name__)
 
@@ -35,7 +35,11 @@ def get_course_enrollments(user_id):
     qset = CourseEnrollment.objects.filter(
         user__username=user_id, is_active=True
     ).order_by('created')
-    return CourseEnrollmentSerializer(qset).data  # pylint: disable=no-member
+    enrollments = list(qset)
+    course_overviews = CourseOverview.get_from_ids([enrollment.course_id for enrollment in enrollments])
+    return CourseEnrollmentSerializer(  # pylint: disable=no-member
+        enrollments, context={'course_overviews': course_overviews}
+    ).data
 
 
 def get_course_enrollment(username, course_id):
@@ -158,7 +162,7 @@ def get_course_enrollment_info(course_id):
 
     """
     course_key = CourseKey.from_string(course_id)
-    course = modulestore().get_course(course_key)
+    course = CourseOverview.get_from_id(course_key)
     if course is None:
         msg = u"Requested enrollment information for unknown course {course}".format(course=course_id)
         log.warning(msg)
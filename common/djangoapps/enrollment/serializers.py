@@ -7,6 +7,7 @@ import logging
 from rest_framework import serializers
 from student.models import CourseEnrollment
 from course_modes.models import CourseMode
+from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
 
 
 log = logging.getLogger(__name__)
@@ -33,8 +34,8 @@ class StringListField(serializers.CharField):
 class CourseField(serializers.RelatedField):
     """Read-Only representation of course enrollment information.
 
-    Aggregates course information from the CourseDescriptor as well as the Course Modes configured
-    for enrolling in the course.
+    Aggregates course information from the CourseOverview (or CourseDescriptor) as well as the Course
+    Modes configured for enrolling in the course.
 
     """
 
@@ -57,7 +58,11 @@ class CourseEnrollmentSerializer(serializers.ModelSerializer):
     """Serializes CourseEnrollment models
 
     Aggregates all data from the Course Enrollment table, and pulls in the serialization for
-    the Course Descriptor and course modes, to give a complete representation of course enrollment.
+    the Course Overview and course modes, to give a complete representation of course enrollment.
+
+    Callers serializing many enrollments can pass the overviews of their courses, as returned by
+    CourseOverview.get_from_ids, in the 'course_overviews' context item to avoid a query per
+    enrollment.
 
     """
     course_details = serializers.SerializerMethodField('get_course_details')
@@ -77,7 +82,13 @@ class CourseEnrollmentSerializer(serializers.ModelSerializer):
         return [enrollment for enrollment in serialized_data if enrollment.get('course_details')]
 
     def get_course_details(self, model):
-        if model.course is None:
+        course_overviews = self.context.get('course_overviews')
+        if course_overviews is not None:
+            course = course_overviews.get(model.course_id)
+        else:
+            course = CourseOverview.get_from_id(model.course_id)
+
+        if course is None:
             msg = u"Course '{0}' does not exist (maybe deleted), in which User (user_id: '{1}') is enrolled.".format(
                 model.course_id,
                 model.user.id
@@ -86,7 +97,7 @@ class CourseEnrollmentSerializer(serializers.ModelSerializer):
             return None
 
         field = CourseField()
-        return field.to_native(model.course)
+        return field.to_native(course)
 
     def get_username(self, model):
         """Retrieves the username from the associated model."""
@@ -0,0 +1,105 @@
+"""
+Process-wide lookup of the country of IP addresses.
+
+Opening a GeoIP database parses its header, so the databases are opened
+once per process (memory mapped, so their pages are shared between the
+worker processes of a server) and recent lookups are kept in an LRU cache.
+"""
+from collections import OrderedDict
+from threading import Lock
+
+import pygeoip
+
+from django.conf import settings
+
+# The number of IP addresses whose country is remembered.
+COUNTRY_CACHE_SIZE = 10000
+
+
+class CountryLookup(object):
+    """
+    Looks up the country of IPv4 and IPv6 addresses, caching the results.
+    """
+    def __init__(self, ipv4_path, ipv6_path, cache_size=COUNTRY_CACHE_SIZE, flags=pygeoip.MMAP_CACHE):
+        """
+        :Parameters:
+
+          - `ipv4_path`: the path of the IPv4 GeoIP country database
+          - `ipv6_path`: the path of the IPv6 GeoIP country database
+          - `cache_size`: the maximum number of addresses to cache
+          - `flags`: how pygeoip reads the databases
+
+        """
+        self.paths = {False: ipv4_path, True: ipv6_path}
+        self.cache_size = cache_size
+        self.flags = flags
+        self.hits = 0
+        self.misses = 0
+        self._databases = {}
+        self._cache = OrderedDict()
+        self._lock = Lock()
+
+    def _database(self, ipv6):
+        """
+        Return the GeoIP database for IPv6 or IPv4 addresses, opening it on first use.
+        """
+        database = self._databases.get(ipv6)
+        if database is None:
+            with self._lock:
+                database = self._databases.get(ipv6)
+                if database is None:
+                    database = pygeoip.GeoIP(self.paths[ipv6], self.flags)
+                    self._databases[ipv6] = database
+        return database
+
+    def country_code_by_addr(self, ip_addr):
+        """
+        Return the 2-letter country code of ip_addr, or an empty string if it is unknown.
+        """
+        with self._lock:
+            if ip_addr in self._cache:
+                self.hits += 1
+                country_code = self._cache.pop(ip_addr)
+                self._cache[ip_addr] = country_code
+                return country_code
+            self.misses += 1
+
+        country_code = self._database(ip_addr.find(':') >= 0).country_code_by_addr(ip_addr)
+
+        with self._lock:
+            self._cache[ip_addr] = country_code
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return country_code
+
+    def clear_cache(self):
+        """
+        Forget all cached lookups and reset the hit and miss counts.
+        """
+        with self._lock:
+            self._cache.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+_LOOKUP = None
+_LOOKUP_LOCK = Lock()
+
+
+def get_country_lookup():
+    """
+    Return the CountryLookup shared by the process, for the configured databases.
+    """
+    global _LOOKUP  # pylint: disable=global-statement
+    if _LOOKUP is None:
+        with _LOOKUP_LOCK:
+            if _LOOKUP is None:
+                _LOOKUP = CountryLookup(settings.GEOIP_PATH, settings.GEOIPV6_PATH)
+    return _LOOKUP
+
+
+def country_code_by_addr(ip_addr):
+    """
+    Return the 2-letter country code of an IPv4 or IPv6 address.
+    """
+    return get_country_lookup().country_code_by_addr(ip_addr)
@@ -0,0 +1,48 @@
+"""
+Compare the shared country lookup with opening the GeoIP database per lookup.
+"""
+import random
+import socket
+import struct
+import timeit
+
+import pygeoip
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from geoinfo.api import CountryLookup
+
+
+class Command(BaseCommand):
+    help = """Time country lookups of random IPv4 addresses.
+
+Usage: benchmark_geoip [LOOKUPS] [DISTINCT_ADDRESSES]
+
+Defaults to 10000 lookups spread over 1000 distinct addresses.
+"""
+
+    def handle(self, *args, **options):
+        lookups = int(args[0]) if len(args) > 0 else 10000
+        distinct = int(args[1]) if len(args) > 1 else 1000
+
+        addresses = [
+            socket.inet_ntoa(struct.pack('>I', random.randint(0x01000000, 0xdfffffff)))
+            for __ in xrange(distinct)
+        ]
+        requests = [random.choice(addresses) for __ in xrange(lookups)]
+
+        def per_call():  # pylint: disable=missing-docstring
+            for ip_addr in requests:
+                pygeoip.GeoIP(settings.GEOIP_PATH).country_code_by_addr(ip_addr)
+
+        lookup = CountryLookup(settings.GEOIP_PATH, settings.GEOIPV6_PATH)
+
+        def shared():  # pylint: disable=missing-docstring
+            for ip_addr in requests:
+                lookup.country_code_by_addr(ip_addr)
+
+        for name, function in (('GeoIP per lookup', per_call), ('CountryLookup', shared)):
+            seconds = timeit.timeit(function, number=1)
+            self.stdout.write("{}: {:.1f} us/lookup\n".format(name, seconds * 1e6 / lookups))
+        self.stdout.write("CountryLookup cache: {} hits, {} misses\n".format(lookup.hits, lookup.misses))
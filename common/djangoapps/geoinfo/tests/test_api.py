@@ -0,0 +1,60 @@
+"""
+Tests for the shared country lookup.
+"""
+from mock import patch
+import pygeoip
+
+from django.conf import settings
+from django.test import TestCase
+
+from geoinfo.api import CountryLookup
+
+
+class CountryLookupTests(TestCase):
+    """
+    Tests of CountryLookup.
+    """
+    def setUp(self):
+        super(CountryLookupTests, self).setUp()
+        self.lookup = CountryLookup(settings.GEOIP_PATH, settings.GEOIPV6_PATH, cache_size=2)
+
+    def test_matches_geoip(self):
+        addresses = (
+            ('8.8.8.8', settings.GEOIP_PATH),
+            ('2001:da8:20f:1502:edcf:550b:4a9c:207d', settings.GEOIPV6_PATH),
+        )
+        for ip_addr, path in addresses:
+            self.assertEqual(
+                self.lookup.country_code_by_addr(ip_addr),
+                pygeoip.GeoIP(path).country_code_by_addr(ip_addr)
+            )
+
+    @patch.object(pygeoip.GeoIP, 'country_code_by_addr')
+    def test_cached(self, mock_country_code_by_addr):
+        mock_country_code_by_addr.return_value = 'US'
+        self.assertEqual(self.lookup.country_code_by_addr('8.8.8.8'), 'US')
+        self.assertEqual(self.lookup.country_code_by_addr('8.8.8.8'), 'US')
+        self.assertEqual(mock_country_code_by_addr.call_count, 1)
+        self.assertEqual((self.lookup.hits, self.lookup.misses), (1, 1))
+
+    @patch.object(pygeoip.GeoIP, 'country_code_by_addr')
+    def test_least_recently_used_evicted(self, mock_country_code_by_addr):
+        mock_country_code_by_addr.return_value = 'US'
+        for ip_addr in ('1.1.1.1', '2.2.2.2', '1.1.1.1', '3.3.3.3'):
+            self.lookup.country_code_by_addr(ip_addr)
+        mock_country_code_by_addr.reset_mock()
+
+        self.lookup.country_code_by_addr('1.1.1.1')
+        self.assertFalse(mock_country_code_by_addr.called)
+        self.lookup.country_code_by_addr('2.2.2.2')
+        self.assertTrue(mock_country_code_by_addr.called)
+
+    @patch.object(pygeoip.GeoIP, 'country_code_by_addr')
+    def test_clear_cache(self, mock_country_code_by_addr):
+        mock_country_code_by_addr.return_value = 'US'
+        self.lookup.country_code_by_addr('8.8.8.8')
+        self.lookup.clear_cache()
+        self.assertEqual((self.lookup.hits, self.lookup.misses), (0, 0))
+
+        mock_country_code_by_addr.return_value = 'CA'
+        self.assertEqual(self.lookup.country_code_by_addr('8.8.8.8'), 'CA')
@@ -1,5 +1,7 @@
 import threading
 
+from celery.signals import task_prerun, task_postrun
+
 _request_cache_threadlocal = threading.local()
 _request_cache_threadlocal.data = {}
 
@@ -19,3 +21,13 @@ class RequestCache(object):
     def process_response(self, request, response):
         self.clear_request_cache()
         return response
+
+
+@task_prerun.connect
+@task_postrun.connect
+def clear_request_cache_for_task(**kwargs):  # pylint: disable=unused-argument
+    """
+    Celery tasks don't go through the middleware, so give each task in a
+    worker an empty request cache as well.
+    """
+    RequestCache().clear_request_cache()
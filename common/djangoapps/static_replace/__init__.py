@@ -1,10 +1,14 @@
 import logging
+import os
 import re
 
 from staticfiles.storage import staticfiles_storage
 from staticfiles import finders
 from django.conf import settings
+from django.core.cache import cache
 
+from request_cache.middleware import RequestCache
+from xmodule.contentstore.django import contentstore
 from xmodule.modulestore.django import modulestore
 from xmodule.modulestore import ModuleStoreEnum
 from xmodule.contentstore.content import StaticContent
@@ -13,6 +17,16 @@ from opaque_keys.edx.locator import AssetLocator
 
 log = logging.getLogger(__name__)
 
+# How long the map of a course's static urls stays cached, when no asset is
+# uploaded or deleted in the meantime.
+COURSE_STATIC_URL_MAP_TIMEOUT = 60 * 60 * 24
+
+# The paths collectstatic gathers into staticfiles_storage, and the urls of
+# those which have been looked up. Static files only change with a deployment,
+# so both are kept for the life of the process.
+_staticfiles_manifest = None  # pylint: disable=invalid-name
+_staticfiles_urls = {}  # pylint: disable=invalid-name
+
 
 def _url_replace_regex(prefix):
     """
@@ -45,6 +59,89 @@ def try_staticfiles_lookup(path):
     return url
 
 
+def _get_staticfiles_manifest():
+    """
+    Return the set of the paths of the static files found by the staticfiles
+    finders, which collectstatic copies into staticfiles_storage.
+    """
+    global _staticfiles_manifest  # pylint: disable=global-statement, invalid-name
+    if _staticfiles_manifest is None:
+        manifest = set()
+        for finder in finders.get_finders():
+            for path, storage in finder.list([]):
+                prefix = getattr(storage, 'prefix', None)
+                manifest.add(os.path.join(prefix, path) if prefix else path)
+        _staticfiles_manifest = manifest
+    return _staticfiles_manifest
+
+
+def _staticfiles_url(path):
+    """
+    Return the url of `path` in staticfiles_storage if it is one of the collected
+    static files, or None.
+    """
+    if path not in _get_staticfiles_manifest():
+        return None
+    url = _staticfiles_urls.get(path)
+    if url is None:
+        url = _staticfiles_urls[path] = try_staticfiles_lookup(path)
+    return url
+
+
+def _course_asset_url(path, course_id):
+    """
+    Return the url of the asset at `path` in the course's contentstore.
+    """
+    url = StaticContent.convert_legacy_static_url_with_course_id(path, course_id)
+    if AssetLocator.CANONICAL_NAMESPACE in url:
+        url = url.replace('block@', 'block/', 1)
+    return url
+
+
+def _course_static_url_map_cache_key(course_id):
+    """
+    Return the cache key of the static url map of a course.
+    """
+    return u'static_replace.static_url_map.{}'.format(course_id)
+
+
+def get_course_static_url_map(course_id):
+    """
+    Return a dict mapping the /static/ paths of the assets of a contentstore
+    backed course, by name and by import path, to the urls they are replaced with.
+
+    The map is built from the course's asset metadata the first time it is
+    needed, and cached until `clear_course_static_url_map` is called.
+    """
+    cache_key = _course_static_url_map_cache_key(course_id)
+    request_cache = RequestCache.get_request_cache()
+    url_map = request_cache.data.get(cache_key)
+    if url_map is None:
+        url_map = cache.get(cache_key)
+        if url_map is None:
+            url_map = {}
+            assets, __ = contentstore().get_all_content_for_course(course_id)
+            for asset in assets:
+                # imported assets are referenced by their path in the course's
+                # static directory (e.g. sub/dir/file.png), not by their name
+                for path in (asset['asset_key'].name, asset.get('import_path')):
+                    if path:
+                        # collected static files take precedence over course assets
+                        url_map[path] = _staticfiles_url(path) or _course_asset_url(path, course_id)
+            cache.set(cache_key, url_map, COURSE_STATIC_URL_MAP_TIMEOUT)
+        request_cache.data[cache_key] = url_map
+    return url_map
+
+
+def clear_course_static_url_map(course_id):
+    """
+    Forget the static url map of a course, after its assets have changed.
+    """
+    cache_key = _course_static_url_map_cache_key(course_id)
+    cache.delete(cache_key)
+    RequestCache.get_request_cache().data.pop(cache_key, None)
+
+
 def replace_jump_to_id_urls(text, course_id, jump_to_id_base_url):
     """
     This will replace a link to another piece of courseware to a 'jump_to'
@@ -150,6 +247,13 @@ def replace_static_urls(text, data_directory=None, course_id=None, static_asset_
     static_asset_path: Path for static assets, which overrides data_directory and course_namespace, if nonempty
     """
 
+    # if we're running with a MongoBacked store course_namespace is not None, then use studio style urls
+    static_url_map = None
+    if (not static_asset_path) \
+            and course_id \
+            and modulestore().get_modulestore_type(course_id) != ModuleStoreEnum.Type.xml:
+        static_url_map = get_course_static_url_map(course_id)
+
     def replace_static_url(original, prefix, quote, rest):
         """
         Replace a single matched url.
@@ -161,29 +265,25 @@ def replace_static_urls(text, data_directory=None, course_id=None, static_asset_
         # In debug mode, if we can find the url as is,
         if settings.DEBUG and finders.find(rest, True):
             return original
-        # if we're running with a MongoBacked store course_namespace is not None, then use studio style urls
-        elif (not static_asset_path) \
-                and course_id \
-                and modulestore().get_modulestore_type(course_id) != ModuleStoreEnum.Type.xml:
+        elif static_url_map is not None:
             # first look in the static file pipeline and see if we are trying to reference
-            # a piece of static content which is in the edx-platform repo (e.g. JS associated with an xmodule)
-
-            exists_in_staticfiles_storage = False
-            try:
-                exists_in_staticfiles_storage = staticfiles_storage.exists(rest)
-            except Exception as err:
-                log.warning("staticfiles_storage couldn't find path {0}: {1}".format(
-                    rest, str(err)))
-
-            if exists_in_staticfiles_storage:
-                url = staticfiles_storage.url(rest)
-            else:
-                # if not, then assume it's courseware specific content and then look in the
-                # Mongo-backed database
-                url = StaticContent.convert_legacy_static_url_with_course_id(rest, course_id)
-
-                if AssetLocator.CANONICAL_NAMESPACE in url:
-                    url = url.replace('block@', 'block/', 1)
+            # a piece of static content which is in the edx-platform repo (e.g. JS associated with an xmodule),
+            # then at the course's assets.
+            url = static_url_map.get(rest) or _staticfiles_url(rest)
+            if url is None:
+                # Not a known asset or collected static file (e.g. a url with a query string), so check the
+                # storage to be sure, then assume it's courseware specific content in the Mongo-backed database
+                exists_in_staticfiles_storage = False
+                try:
+                    exists_in_staticfiles_storage = staticfiles_storage.exists(rest)
+                except Exception as err:
+                    log.warning("staticfiles_storage couldn't find path {0}: {1}".format(
+                        rest, str(err)))
+
+                if exists_in_staticfiles_storage:
+                    url = staticfiles_storage.url(rest)
+                else:
+                    url = _course_asset_url(rest, course_id)
 
         # Otherwise, look the file up in staticfiles_storage, and append the data directory if needed
         else:
@@ -2,6 +2,7 @@ import re
 
 from nose.tools import assert_equals, assert_true, assert_false  # pylint: disable=no-name-in-module
 from static_replace import (
+    clear_course_static_url_map,
     replace_static_urls,
     replace_course_urls,
     _url_replace_regex,
@@ -143,6 +144,45 @@ def test_static_url_with_query(mock_modulestore, mock_storage):
     assert_equals(post_text, replace_static_urls(pre_text, DATA_DIRECTORY, COURSE_KEY))
 
 
+@patch.dict('static_replace._staticfiles_urls', clear=True)
+@patch('static_replace._get_staticfiles_manifest')
+@patch('static_replace.contentstore')
+@patch('static_replace.staticfiles_storage')
+@patch('static_replace.modulestore')
+def test_course_static_url_map(mock_modulestore, mock_storage, mock_contentstore, mock_manifest):
+    """
+    Make sure that urls of course assets and collected static files are replaced
+    without checking the storage, and that the map of the course's assets is only
+    built again once cleared.
+    """
+    mock_modulestore.return_value = Mock(MongoModuleStore)
+    mock_contentstore.return_value.get_all_content_for_course.return_value = (
+        [
+            {'asset_key': COURSE_KEY.make_asset_key('asset', 'file.png')},
+            {'asset_key': COURSE_KEY.make_asset_key('asset', 'sub_dir_file.png'), 'import_path': 'sub/dir/file.png'},
+        ], 2
+    )
+    mock_manifest.return_value = {'js/vendor/jquery.js'}
+    mock_storage.url.return_value = '/static/js/vendor/jquery.abcdef.js'
+    clear_course_static_url_map(COURSE_KEY)
+
+    text = '"/static/file.png" "/static/sub/dir/file.png" "/static/js/vendor/jquery.js"'
+    expected = (
+        '"/c4x/org/course/asset/file.png" "/c4x/org/course/asset/sub_dir_file.png" '
+        '"/static/js/vendor/jquery.abcdef.js"'
+    )
+    assert_equals(expected, replace_static_urls(text, DATA_DIRECTORY, COURSE_KEY))
+    assert_equals(expected, replace_static_urls(text, DATA_DIRECTORY, COURSE_KEY))
+    assert_false(mock_storage.exists.called)
+    assert_equals(mock_contentstore.return_value.get_all_content_for_course.call_count, 1)
+    assert_equals(mock_storage.url.call_count, 1)
+
+    clear_course_static_url_map(COURSE_KEY)
+    assert_equals(expected, replace_static_urls(text, DATA_DIRECTORY, COURSE_KEY))
+    assert_equals(mock_contentstore.return_value.get_all_content_for_course.call_count, 2)
+    clear_course_static_url_map(COURSE_KEY)
+
+
 def test_regex():
     yes = ('"/static/foo.png"',
            '"/static/foo.png"',
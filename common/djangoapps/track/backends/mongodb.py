@@ -2,7 +2,12 @@
 
 from __future__ import absolute_import
 
+import atexit
 import logging
+import os
+import Queue
+import threading
+import time
 
 import pymongo
 from pymongo import MongoClient
@@ -13,6 +18,9 @@ from track.backends import BaseBackend
 
 log = logging.getLogger(__name__)
 
+# Log a warning every this many events dropped by BufferedMongoBackend.
+DROPPED_EVENTS_LOG_INTERVAL = 1000
+
 
 class MongoBackend(BaseBackend):
     """Class for a MongoDB event tracker Backend"""
@@ -95,3 +103,168 @@ class MongoBackend(BaseBackend):
             # during the next event.
             msg = 'Error inserting to MongoDB event tracker backend'
             log.exception(msg)
+
+
+class BufferedMongoBackend(MongoBackend):
+    """
+    MongoDB event tracker backend that inserts events in batches.
+
+    `send` only puts the event on an in-memory queue; a background thread
+    inserts queued events into the collection, as soon as `max_batch_size`
+    events are waiting or `flush_interval` seconds after the first of them
+    arrived. When the queue holds `max_queue_size` events new ones are
+    dropped and counted in `dropped_events`. Queued events, and the batch
+    the background thread is inserting, are flushed when the process exits.
+    """
+
+    def __init__(self, **kwargs):
+        """
+        Connect to a MongoDB.
+
+        :Parameters:
+
+          Those of `MongoBackend`, and
+
+          - `max_batch_size`: maximum number of events per insert
+          - `flush_interval`: maximum number of seconds an event waits
+            for a batch to fill up
+          - `max_queue_size`: maximum number of events waiting to be
+            inserted
+          - `flush_timeout`: maximum number of seconds `flush` waits for
+            the background thread to insert the batch it holds
+
+        """
+        super(BufferedMongoBackend, self).__init__(**kwargs)
+
+        self.max_batch_size = kwargs.get('max_batch_size', 100)
+        self.flush_interval = kwargs.get('flush_interval', 1.0)
+        self.max_queue_size = kwargs.get('max_queue_size', 10000)
+        self.flush_timeout = kwargs.get('flush_timeout', 5.0)
+
+        self.dropped_events = 0
+        self._lock = threading.Lock()
+        self._queue = None
+        self._worker_pid = None
+
+        atexit.register(self.flush)
+
+    def send(self, event):
+        """Queue the event to be inserted by the background thread"""
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait(event)
+        except Queue.Full:
+            with self._lock:
+                self.dropped_events += 1
+                dropped_events = self.dropped_events
+            if dropped_events % DROPPED_EVENTS_LOG_INTERVAL == 1:
+                log.warning(
+                    'MongoDB event tracker backend queue is full, %d events dropped so far',
+                    dropped_events
+                )
+
+    def flush(self):
+        """
+        Insert all queued events from the calling thread, then wait up to
+        `flush_timeout` seconds for the background thread to insert the
+        events it already took off the queue.
+        """
+        if self._worker_pid != os.getpid():
+            # Nothing was sent from this process. A queue inherited from the
+            # parent process holds the parent's events, which it inserts itself.
+            self._queue = None
+            return
+        while True:
+            batch = []
+            try:
+                while len(batch) < self.max_batch_size:
+                    batch.append(self._queue.get_nowait())
+            except Queue.Empty:
+                pass
+            if batch:
+                self._insert_batch(batch)
+            if len(batch) < self.max_batch_size:
+                break
+
+        # Every event put on the queue is marked done once inserted (or lost).
+        all_tasks_done = self._queue.all_tasks_done
+        deadline = time.time() + self.flush_timeout
+        with all_tasks_done:
+            while self._queue.unfinished_tasks:
+                timeout = deadline - time.time()
+                if timeout <= 0:
+                    log.warning(
+                        'MongoDB event tracker backend flush timed out, %d events not inserted',
+                        self._queue.unfinished_tasks
+                    )
+                    return
+                all_tasks_done.wait(timeout)
+
+    def _ensure_worker(self):
+        """
+        Start the queue and background thread, if this process hasn't yet.
+
+        Threads don't survive a fork, so this is checked per process id
+        rather than done once in `__init__`.
+        """
+        if self._worker_pid == os.getpid():
+            return
+        with self._lock:
+            if self._worker_pid != os.getpid():
+                # Replace any queue inherited from the parent process, so its
+                # events aren't inserted a second time from this one.
+                self._queue = Queue.Queue(self.max_queue_size)
+                self._start_worker()
+                self._worker_pid = os.getpid()
+
+    def _start_worker(self):
+        """Start the daemon thread inserting queued events"""
+        worker = threading.Thread(target=self._run, name='BufferedMongoBackend')
+        worker.daemon = True
+        worker.start()
+
+    def _run(self):
+        """Insert batches of queued events, forever"""
+        while True:
+            batch = self._next_batch()
+            try:
+                self._insert_batch(batch)
+            except Exception:  # pylint: disable=broad-except
+                # Whatever happens to a batch, keep the thread alive for the next ones.
+                log.exception('Error inserting to MongoDB event tracker backend')
+
+    def _insert_batch(self, batch):
+        """Insert a list of events taken off the queue, then mark them as done"""
+        try:
+            self._insert(batch)
+        finally:
+            for __ in batch:
+                self._queue.task_done()
+
+    def _next_batch(self):
+        """
+        Wait for an event, then return it along with the events queued until
+        the batch is full or `flush_interval` seconds have elapsed.
+        """
+        batch = [self._queue.get()]
+        deadline = time.time() + self.flush_interval
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - time.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=timeout))
+            except Queue.Empty:
+                break
+        return batch
+
+    def _insert(self, batch):
+        """Insert a list of events in to the Mongo collection"""
+        try:
+            self.collection.insert(batch, manipulate=False, continue_on_error=True)
+        except PyMongoError:
+            # The events will be lost in case of a connection error.
+            # pymongo will re-connect/re-authenticate automatically
+            # during the next batch.
+            msg = 'Error inserting to MongoDB event tracker backend'
+            log.exception(msg)
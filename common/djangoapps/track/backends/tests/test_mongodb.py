@@ -1,10 +1,12 @@
 from __future__ import absolute_import
 
+import time
+
 from mock import patch
 
 from django.test import TestCase
 
-from track.backends.mongodb import MongoBackend
+from track.backends.mongodb import MongoBackend, BufferedMongoBackend
 
 
 class TestMongoBackend(TestCase):
@@ -36,3 +38,90 @@ class TestMongoBackend(TestCase):
 
         self.assertEqual(events[0], first_argument(calls[0]))
         self.assertEqual(events[1], first_argument(calls[1]))
+
+
+class TestBufferedMongoBackend(TestCase):
+    def setUp(self):
+        self.mongo_patcher = patch('track.backends.mongodb.MongoClient')
+        self.addCleanup(self.mongo_patcher.stop)
+        self.mongo_patcher.start()
+
+    def inserted_batches(self, backend):
+        """Return the lists of events passed to collection.insert"""
+        return [args[0] for _, args, _ in backend.collection.insert.mock_calls]
+
+    @patch.object(BufferedMongoBackend, '_start_worker')
+    def test_flush_inserts_batches(self, _start_worker):
+        backend = BufferedMongoBackend(max_batch_size=2)
+        events = [{'test': i} for i in range(5)]
+        for event in events:
+            backend.send(event)
+
+        self.assertFalse(backend.collection.insert.called)
+        backend.flush()
+
+        self.assertEqual(self.inserted_batches(backend), [events[0:2], events[2:4], events[4:5]])
+
+    @patch.object(BufferedMongoBackend, '_start_worker')
+    def test_full_queue_drops_events(self, _start_worker):
+        backend = BufferedMongoBackend(max_queue_size=2)
+        for i in range(5):
+            backend.send({'test': i})
+
+        self.assertEqual(backend.dropped_events, 3)
+        backend.flush()
+        self.assertEqual(self.inserted_batches(backend), [[{'test': 0}, {'test': 1}]])
+
+    def test_background_insert(self):
+        backend = BufferedMongoBackend(flush_interval=0.01)
+        events = [{'test': 1}, {'test': 2}]
+        for event in events:
+            backend.send(event)
+
+        deadline = time.time() + 5
+        while sum(len(batch) for batch in self.inserted_batches(backend)) < 2 and time.time() < deadline:
+            time.sleep(0.01)
+
+        self.assertEqual(sum(self.inserted_batches(backend), []), events)
+
+    def test_worker_survives_errors(self):
+        backend = BufferedMongoBackend(flush_interval=0.01)
+        backend.collection.insert.side_effect = [ValueError('Cannot encode event'), None]
+        backend.send({'test': 1})
+        deadline = time.time() + 5
+        while not backend.collection.insert.called and time.time() < deadline:
+            time.sleep(0.01)
+
+        backend.send({'test': 2})
+        backend.flush()
+        self.assertEqual(self.inserted_batches(backend), [[{'test': 1}], [{'test': 2}]])
+
+    def test_flush_waits_for_worker(self):
+        backend = BufferedMongoBackend(flush_interval=0.01)
+
+        def slow_insert(*_args, **_kwargs):
+            """Take a while to insert the batch"""
+            time.sleep(0.1)
+
+        backend.collection.insert.side_effect = slow_insert
+        backend.send({'test': 1})
+        deadline = time.time() + 5
+        while not backend.collection.insert.called and time.time() < deadline:
+            time.sleep(0.01)
+
+        # The worker holds the only event: flush returns once it has been inserted.
+        backend.flush()
+        self.assertEqual(backend._queue.unfinished_tasks, 0)  # pylint: disable=protected-access
+
+    @patch.object(BufferedMongoBackend, '_start_worker')
+    def test_forked_process_drops_inherited_events(self, _start_worker):
+        backend = BufferedMongoBackend()
+        backend.send({'test': 1})
+
+        # In a forked process, the parent's queued events are neither flushed nor inserted by a new worker.
+        with patch('track.backends.mongodb.os.getpid', return_value=-1):
+            backend.flush()
+            self.assertFalse(backend.collection.insert.called)
+            backend.send({'test': 2})
+            backend.flush()
+        self.assertEqual(self.inserted_batches(backend), [[{'test': 2}]])
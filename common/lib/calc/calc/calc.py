@@ -1,12 +1,15 @@
 """
 Parser and evaluator for FormulaResponse and NumericalResponse
 
-Uses pyparsing to parse. Main function as of now is evaluator().
+Uses pyparsing to parse. Main functions as of now are evaluator() and
+evaluator_many(); parsed expressions are cached by compile_expression().
 """
 
 import math
 import operator
-import numbers
+import threading
+from collections import OrderedDict
+
 import numpy
 import scipy.constants
 import functions
@@ -73,6 +76,10 @@ SUFFIXES = {
 }
 
 
+# Number of parsed expressions kept by `compile_expression`.
+PARSE_CACHE_SIZE = 2048
+
+
 class UndefinedVariable(Exception):
     """
     Indicate when a student inputs a variable which was not expected.
@@ -121,8 +128,8 @@ def eval_atom(parse_result):
 
     In the case of parenthesis, ignore them.
     """
-    # Find first number in the list
-    result = next(k for k in parse_result if isinstance(k, numbers.Number))
+    # Find first number (or array of numbers) in the list
+    result = next(k for k in parse_result if not isinstance(k, basestring))
     return result
 
 
@@ -136,7 +143,7 @@ def eval_power(parse_result):
     # `reduce` will go from left to right; reverse the list.
     parse_result = reversed(
         [k for k in parse_result
-         if isinstance(k, numbers.Number)]  # Ignore the '^' marks.
+         if not isinstance(k, basestring)]  # Ignore the '^' marks.
     )
     # Having reversed it, raise `b` to the power of `a`.
     power = reduce(lambda a, b: b ** a, parse_result)
@@ -155,10 +162,12 @@ def eval_parallel(parse_result):
     """
     if len(parse_result) == 1:
         return parse_result[0]
+    # With arrays of several samples the membership test is ambiguous and
+    # raises, so `evaluator_many` falls back to evaluating sample by sample.
     if 0 in parse_result:
         return float('nan')
     reciprocals = [1. / e for e in parse_result
-                   if isinstance(e, numbers.Number)]
+                   if not isinstance(e, basestring)]
     return 1. / sum(reciprocals)
 
 
@@ -173,12 +182,12 @@ def eval_sum(parse_result):
     total = 0.0
     current_op = operator.add
     for token in parse_result:
-        if token == '+':
+        if not isinstance(token, basestring):
+            total = current_op(total, token)
+        elif token == '+':
             current_op = operator.add
         elif token == '-':
             current_op = operator.sub
-        else:
-            total = current_op(total, token)
     return total
 
 
@@ -191,12 +200,12 @@ def eval_product(parse_result):
     prod = 1.0
     current_op = operator.mul
     for token in parse_result:
-        if token == '*':
+        if not isinstance(token, basestring):
+            prod = current_op(prod, token)
+        elif token == '*':
             current_op = operator.mul
         elif token == '/':
             current_op = operator.truediv
-        else:
-            prod = current_op(prod, token)
     return prod
 
 
@@ -216,30 +225,47 @@ def add_defaults(variables, functions, case_sensitive):
     return (all_variables, all_functions)
 
 
-def evaluator(variables, functions, math_expr, case_sensitive=False):
-    """
-    Evaluate an expression; that is, take a string of math and return a float.
+_PARSE_CACHE = OrderedDict()
+_PARSE_CACHE_LOCK = threading.Lock()
 
-    -Variables are passed as a dictionary from string to value. They must be
-     python numbers.
-    -Unary functions are passed as a dictionary from string to function.
+
+def compile_expression(math_expr, case_sensitive=False):
     """
-    # No need to go further.
-    if math_expr.strip() == "":
-        return float('nan')
+    Return a parsed `ParseAugmenter` for `math_expr`.
 
-    # Parse the tree.
+    Parsing is by far the most expensive part of evaluating an expression, so
+    the most recently used `PARSE_CACHE_SIZE` parse trees are kept, keyed on
+    `(math_expr, case_sensitive)`. The returned object is shared: callers must
+    only read from it (e.g. `reduce_tree`, `check_variables`).
+
+    Raises a `ParseException` if `math_expr` isn't valid.
+    """
+    key = (math_expr, case_sensitive)
+    with _PARSE_CACHE_LOCK:
+        math_interpreter = _PARSE_CACHE.pop(key, None)
+        if math_interpreter is not None:
+            _PARSE_CACHE[key] = math_interpreter
+            return math_interpreter
+
+    # Parse outside of the lock; at worst two threads parse the same string.
     math_interpreter = ParseAugmenter(math_expr, case_sensitive)
     math_interpreter.parse_algebra()
 
-    # Get our variables together.
-    all_variables, all_functions = add_defaults(variables, functions, case_sensitive)
+    with _PARSE_CACHE_LOCK:
+        _PARSE_CACHE[key] = math_interpreter
+        while len(_PARSE_CACHE) > PARSE_CACHE_SIZE:
+            _PARSE_CACHE.popitem(last=False)
+    return math_interpreter
 
-    # ...and check them
-    math_interpreter.check_variables(all_variables, all_functions)
 
-    # Create a recursion to evaluate the tree.
-    if case_sensitive:
+def _evaluate_tree(math_interpreter, all_variables, all_functions):
+    """
+    Evaluate the tree of a parsed `math_interpreter`.
+
+    `all_variables` and `all_functions` must include the defaults, and be
+    lowercased if the expression is case insensitive.
+    """
+    if math_interpreter.case_sensitive:
         casify = lambda x: x
     else:
         casify = lambda x: x.lower()  # Lowercase for case insens.
@@ -258,6 +284,80 @@ def evaluator(variables, functions, math_expr, case_sensitive=False):
     return math_interpreter.reduce_tree(evaluate_actions)
 
 
+def evaluator(variables, functions, math_expr, case_sensitive=False):
+    """
+    Evaluate an expression; that is, take a string of math and return a float.
+
+    -Variables are passed as a dictionary from string to value. They must be
+     python numbers.
+    -Unary functions are passed as a dictionary from string to function.
+    """
+    # No need to go further.
+    if math_expr.strip() == "":
+        return float('nan')
+
+    # Parse the tree.
+    math_interpreter = compile_expression(math_expr, case_sensitive)
+
+    # Get our variables together.
+    all_variables, all_functions = add_defaults(variables, functions, case_sensitive)
+
+    # ...and check them
+    math_interpreter.check_variables(all_variables, all_functions)
+
+    return _evaluate_tree(math_interpreter, all_variables, all_functions)
+
+
+def evaluator_many(variables_list, functions, math_expr, case_sensitive=False):
+    """
+    Evaluate an expression at several points; return a list of results.
+
+    Equivalent to calling `evaluator` once per dictionary in `variables_list`
+    (which must all define the same variables), but the expression is
+    evaluated once over numpy arrays holding every sample. If that fails, or
+    hits a floating point error the scalar evaluation might handle
+    differently (e.g. division by zero), each sample is evaluated on its own
+    so results and exceptions are exactly those of `evaluator`.
+
+    -Unary functions are passed as a dictionary from string to function, and
+     should accept numpy arrays (as numpy ufuncs do).
+    """
+    if not variables_list:
+        return []
+
+    # No need to go further.
+    if math_expr.strip() == "":
+        return [float('nan')] * len(variables_list)
+
+    math_interpreter = compile_expression(math_expr, case_sensitive)
+
+    names = set(variables_list[0])
+    if all(set(variables) == names for variables in variables_list):
+        samples = {
+            name: numpy.array([variables[name] for variables in variables_list])
+            for name in names
+        }
+        all_variables, all_functions = add_defaults(samples, functions, case_sensitive)
+        math_interpreter.check_variables(all_variables, all_functions)
+
+        try:
+            with numpy.errstate(all='raise', under='ignore'):
+                result = _evaluate_tree(math_interpreter, all_variables, all_functions)
+        except Exception:  # pylint: disable=broad-except
+            pass
+        else:
+            if numpy.ndim(result) == 0:
+                # The expression doesn't depend on the sampled variables.
+                return [result] * len(variables_list)
+            if numpy.shape(result) == (len(variables_list),):
+                return result.tolist()
+
+    return [
+        evaluator(variables, functions, math_expr, case_sensitive)
+        for variables in variables_list
+    ]
+
+
 class ParseAugmenter(object):
     """
     Holds the data for a particular parse.
@@ -559,3 +559,55 @@ class EvaluatorTest(unittest.TestCase):
             calc.evaluator({'r1': 5}, {}, "r1+r2")
         with self.assertRaisesRegexp(calc.UndefinedVariable, 'r1 r3'):
             calc.evaluator(variables, {}, "r1*r3", case_sensitive=True)
+
+
+class EvaluatorManyTest(unittest.TestCase):
+    """
+    Run tests for calc.evaluator_many and calc.compile_expression
+    """
+
+    def assert_matches_evaluator(self, math_expr, variables_list, functions=None, case_sensitive=False):
+        """
+        Check that `evaluator_many` gives the same results as `evaluator`.
+        """
+        functions = functions or {}
+        results = calc.evaluator_many(variables_list, functions, math_expr, case_sensitive)
+        self.assertEqual(len(results), len(variables_list))
+        for variables, result in zip(variables_list, results):
+            expected = calc.evaluator(variables, functions, math_expr, case_sensitive)
+            if numpy.isnan(expected):
+                self.assertTrue(numpy.isnan(result), math_expr)
+            else:
+                self.assertAlmostEqual(result, expected, msg=math_expr)
+
+    def test_matches_evaluator(self):
+        variables_list = [{'x': 0.5, 'y': 2.0}, {'x': 1.5, 'y': -3.0}, {'x': 4.0, 'y': 0.25}]
+        for math_expr in (
+                "x + y", "-x - 2*y", "x^y^2", "x/y", "sin(x)*cos(y)", "sqrt(x)^2 + e^x",
+                "2k*x || 4k", "x*i + y", "arccot(y)", "fact(3)*x", "42", "",
+        ):
+            self.assert_matches_evaluator(math_expr, variables_list)
+
+    def test_case_sensitivity(self):
+        variables_list = [{'X': 2.0, 'x': 3.0}, {'X': 5.0, 'x': 7.0}]
+        self.assert_matches_evaluator("X - x", variables_list, case_sensitive=True)
+        self.assertEqual(calc.evaluator_many(variables_list, {}, "X - x", case_sensitive=True), [-1.0, -2.0])
+
+    def test_errors_match_evaluator(self):
+        variables_list = [{'x': 1.0}, {'x': -1.0}]
+        with self.assertRaisesRegexp(ValueError, 'factorial'):
+            calc.evaluator_many(variables_list, {}, "fact(x)")
+        with self.assertRaisesRegexp(calc.UndefinedVariable, 'y'):
+            calc.evaluator_many(variables_list, {}, "x + y")
+        with self.assertRaises(ZeroDivisionError):
+            calc.evaluator_many(variables_list, {}, "1/(x - 1)")
+
+    def test_empty_variables_list(self):
+        self.assertEqual(calc.evaluator_many([], {}, "x + 1"), [])
+
+    def test_compile_expression_is_cached(self):
+        tree = calc.compile_expression("3*x + 1")
+        self.assertIs(calc.compile_expression("3*x + 1"), tree)
+        self.assertIsNot(calc.compile_expression("3*x + 1", case_sensitive=True), tree)
+        with self.assertRaises(ParseException):
+            calc.compile_expression("3*x +")
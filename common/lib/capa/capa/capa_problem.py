@@ -13,8 +13,10 @@ Main module which shows problems (of "capa" type).
 This is used by capa_module.
 """
 
+from collections import OrderedDict
 from copy import deepcopy
 from datetime import datetime
+import hashlib
 import logging
 import os.path
 import re
@@ -58,6 +60,43 @@ html_problem_semantics = [
 
 log = logging.getLogger(__name__)
 
+# The number of parsed problems each process keeps in memory; 0 disables the cache.
+PARSED_PROBLEM_CACHE_SIZE = 500
+
+# Parsed problems, before any seed or student dependent processing, keyed by a
+# hash of the problem text (and of the files it includes), least recently used first.
+_parsed_problems = OrderedDict()  # pylint: disable=invalid-name
+
+
+def _get_parsed_problem(key):
+    """
+    Return the cached parsed problem with the given key, or None.
+    """
+    parsed = _parsed_problems.pop(key, None)
+    if parsed is not None:
+        _parsed_problems[key] = parsed
+    return parsed
+
+
+def _set_parsed_problem(key, parsed):
+    """
+    Cache a parsed problem under the given key, evicting the least recently used ones as needed.
+    """
+    if PARSED_PROBLEM_CACHE_SIZE <= 0:
+        return
+    _parsed_problems[key] = parsed
+    while len(_parsed_problems) > PARSED_PROBLEM_CACHE_SIZE:
+        _parsed_problems.popitem(last=False)
+
+
+def _hash(text):
+    """
+    Return the hex sha1 of a string, encoding unicode ones in utf-8.
+    """
+    if isinstance(text, unicode):
+        text = text.encode('utf-8')
+    return hashlib.sha1(text).hexdigest()
+
 #-----------------------------------------------------------------------------
 # main class for this module
 
@@ -154,16 +193,8 @@ class LoncapaProblem(object):
         self.done = state.get('done', False)
         self.input_state = state.get('input_state', {})
 
-        # Convert startouttext and endouttext to proper <text></text>
-        problem_text = re.sub(r"startouttext\s*/", "text", problem_text)
-        problem_text = re.sub(r"endouttext\s*/", "/text", problem_text)
-        self.problem_text = problem_text
-
-        # parse problem XML file into an element tree
-        self.tree = etree.XML(problem_text)
-
-        # handle any <include file="foo"> tags
-        self._process_includes()
+        # parse problem XML file into an element tree, and handle any <include file="foo"> tags
+        self._parse_problem(problem_text)
 
         # construct script processor context (eg for customresponse problems)
         self.context = self._extract_context(self.tree)
@@ -529,6 +560,48 @@ class LoncapaProblem(object):
 
     # ======= Private Methods Below ========
 
+    def _parse_problem(self, problem_text):
+        """
+        Set self.problem_text and self.tree from the problem's xml, inserting
+        the files it includes into the tree.
+
+        The same problem is parsed for every student, so the result is cached,
+        keyed by the problem text and the content of its included files, and
+        each instance gets its own copy of the cached tree.
+        """
+        text_key = _hash(problem_text)
+        parsed = _get_parsed_problem(text_key)
+        if parsed is None:
+            # Convert startouttext and endouttext to proper <text></text>
+            problem_text = re.sub(r"startouttext\s*/", "text", problem_text)
+            problem_text = re.sub(r"endouttext\s*/", "/text", problem_text)
+            tree = etree.XML(problem_text)
+            includes = [inc.get('file') for inc in tree.findall('.//include') if inc.get('file') is not None]
+            parsed = (problem_text, tree, includes)
+            _set_parsed_problem(text_key, parsed)
+
+        self.problem_text, tree, includes = parsed
+        if not includes:
+            self.tree = deepcopy(tree)
+            return
+
+        try:
+            include_keys = [_hash(self.capa_system.filestore.open(filename).read()) for filename in includes]
+        except Exception:  # pylint: disable=broad-except
+            # let _process_includes deal with the missing files, without caching the result
+            self.tree = deepcopy(tree)
+            self._process_includes()
+            return
+
+        key = _hash(':'.join([text_key] + include_keys))
+        included_tree = _get_parsed_problem(key)
+        if included_tree is None:
+            self.tree = deepcopy(tree)
+            self._process_includes()
+            _set_parsed_problem(key, deepcopy(self.tree))
+        else:
+            self.tree = deepcopy(included_tree)
+
     def _process_includes(self):
         """
         Handle any <include file="foo"> tags by reading in the specified file and inserting it
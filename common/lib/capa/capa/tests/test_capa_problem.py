@@ -0,0 +1,77 @@
+"""
+Tests of the caching of parsed problems by LoncapaProblem.
+"""
+import os
+import textwrap
+import unittest
+
+import mock
+from lxml import etree
+
+from capa import capa_problem
+from .response_xml_factory import StringResponseXMLFactory
+from . import test_capa_system, new_loncapa_problem
+
+
+class ParsedProblemCacheTest(unittest.TestCase):
+    """
+    Problems are only parsed once, and each instance gets its own tree.
+    """
+    def setUp(self):
+        super(ParsedProblemCacheTest, self).setUp()
+        self.capa_system = test_capa_system()
+        capa_problem._parsed_problems.clear()  # pylint: disable=protected-access
+        self.addCleanup(capa_problem._parsed_problems.clear)  # pylint: disable=protected-access
+
+    def _create_test_file(self, path, content_str):
+        """
+        Write a file in the test filestore, removed after the test.
+        """
+        test_fp = self.capa_system.filestore.open(path, "w")
+        test_fp.write(content_str)
+        test_fp.close()
+        self.addCleanup(lambda: os.remove(test_fp.name))
+
+    def test_parsed_once(self):
+        xml_str = StringResponseXMLFactory().build_xml(answer="Michigan")
+        with mock.patch('capa.capa_problem.etree', wraps=etree) as mock_etree:
+            first = new_loncapa_problem(xml_str, seed=1)
+            second = new_loncapa_problem(xml_str, seed=2)
+        self.assertEqual(mock_etree.XML.call_count, 1)
+
+        # Each instance preprocesses its own copy of the tree
+        self.assertIsNot(first.tree, second.tree)
+        self.assertEqual(etree.tostring(first.tree), etree.tostring(second.tree))
+        self.assertEqual(first.get_question_answers(), second.get_question_answers())
+
+    def test_outtext_converted(self):
+        xml_str = "<problem><startouttext/>Test text<endouttext/></problem>"
+        new_loncapa_problem(xml_str)
+        problem = new_loncapa_problem(xml_str)
+        self.assertEqual(problem.problem_text, "<problem><text>Test text</text></problem>")
+        self.assertEqual(problem.tree.find('text').text, 'Test text')
+
+    def test_include_changed(self):
+        self._create_test_file('test_include.xml', '<test>First</test>')
+        xml_str = textwrap.dedent("""
+            <problem>
+                <include file="test_include.xml"/>
+            </problem>
+        """)
+        problem = new_loncapa_problem(xml_str, capa_system=self.capa_system)
+        self.assertEqual(problem.tree.find('test').text, 'First')
+        problem = new_loncapa_problem(xml_str, capa_system=self.capa_system)
+        self.assertEqual(problem.tree.find('test').text, 'First')
+
+        with self.capa_system.filestore.open('test_include.xml', 'w') as test_fp:
+            test_fp.write('<test>Second</test>')
+        problem = new_loncapa_problem(xml_str, capa_system=self.capa_system)
+        self.assertEqual(problem.tree.find('test').text, 'Second')
+
+    def test_cache_disabled(self):
+        xml_str = StringResponseXMLFactory().build_xml(answer="Michigan")
+        with mock.patch('capa.capa_problem.PARSED_PROBLEM_CACHE_SIZE', 0):
+            with mock.patch('capa.capa_problem.etree', wraps=etree) as mock_etree:
+                new_loncapa_problem(xml_str)
+                new_loncapa_problem(xml_str)
+        self.assertEqual(mock_etree.XML.call_count, 2)
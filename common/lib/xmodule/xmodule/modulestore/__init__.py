@@ -23,6 +23,7 @@ from contracts import contract, new_contract
 from xblock.plugin import default_select
 
 from .exceptions import InvalidLocationError, InsufficientSpecificationError
+from .search import clear_navigation_index
 from xmodule.errortracker import make_error_tracker
 from xmodule.assetstore import AssetMetadata
 from opaque_keys.edx.keys import CourseKey, UsageKey, AssetKey
@@ -287,6 +288,8 @@ class BulkOperationsMixin(object):
         """
         Sends out the signal that items have been published from within this course.
         """
+        if bulk_ops_record.has_publish_item:
+            clear_navigation_index(self, course_id)
         signal_handler = getattr(self, 'signal_handler', None)
         if signal_handler and bulk_ops_record.has_publish_item:
             signal_handler.send("course_published", course_key=course_id)
@@ -1337,6 +1340,8 @@ class ModuleStoreWriteBase(ModuleStoreReadBase, ModuleStoreWrite):
         Arguments:
             course_key - course_key to which the signal applies
         """
+        # drop the navigation index now, as old mongo writes aren't deferred until the end of bulk operations
+        clear_navigation_index(self, course_key)
         signal_handler = getattr(self, 'signal_handler', None)
         if signal_handler:
             bulk_record = self._get_bulk_ops_record(course_key) if isinstance(self, BulkOperationsMixin) else None
@@ -1345,6 +1350,14 @@ class ModuleStoreWriteBase(ModuleStoreReadBase, ModuleStoreWrite):
             else:
                 signal_handler.send("course_published", course_key=course_key)
 
+    def _emit_course_deleted_signal(self, course_key):
+        """
+        Helper method used to emit the course_deleted signal.
+        """
+        signal_handler = getattr(self, 'signal_handler', None)
+        if signal_handler:
+            signal_handler.send("course_deleted", course_key=course_key)
+
     def _flag_library_updated_event(self, library_key):
         """
         Wrapper around calls to fire the library_updated signal
@@ -23,6 +23,8 @@ import django.utils
 from xmodule.contentstore.django import contentstore
 from xmodule.modulestore.draft_and_published import BranchSettingMixin
 from xmodule.modulestore.mixed import MixedModuleStore
+from xmodule.modulestore.split_mongo.mongo_connection import StructureCache
+from xmodule.modulestore.split_mongo.split import SplitMongoModuleStore
 from xmodule.util.django import get_current_request_hostname
 import xblock.reference.plugins
 
@@ -80,10 +82,12 @@ class SignalHandler(object):
 
     """
     course_published = django.dispatch.Signal(providing_args=["course_key"])
+    course_deleted = django.dispatch.Signal(providing_args=["course_key"])
     library_updated = django.dispatch.Signal(providing_args=["library_key"])
 
     _mapping = {
         "course_published": course_published,
+        "course_deleted": course_deleted,
         "library_updated": library_updated
     }
 
@@ -151,6 +155,9 @@ def create_modulestore_instance(
     if issubclass(class_, BranchSettingMixin):
         _options['branch_setting_func'] = _get_modulestore_branch_setting
 
+    if issubclass(class_, SplitMongoModuleStore):
+        _options['structure_cache'] = _get_split_structure_cache()
+
     if HAS_USER_SERVICE and not user_service:
         xb_user_service = DjangoXBlockUserService(get_current_user())
     else:
@@ -171,6 +178,22 @@ def create_modulestore_instance(
     )
 
 
+def _get_split_structure_cache():
+    """
+    Returns a StructureCache backed by the 'course_structure_cache' django cache,
+    or None if that cache isn't configured.
+    """
+    try:
+        cache = get_cache('course_structure_cache')
+    except InvalidCacheBackendError:
+        return None
+
+    return StructureCache(
+        cache,
+        max_size=getattr(settings, 'COURSE_STRUCTURE_CACHE_MAX_SIZE', StructureCache.DEFAULT_MAX_SIZE)
+    )
+
+
 # A singleton instance of the Mixed Modulestore
 _MIXED_MODULESTORE = None
 
@@ -15,7 +15,6 @@ structure:
 import pymongo
 import sys
 import logging
-import copy
 import re
 from uuid import uuid4
 
@@ -161,6 +160,99 @@ class MongoKeyValueStore(InheritanceKeyValueStore):
         )
 
 
+# Marks metadata missing from an inheritance frame
+_MISSING = object()
+
+
+class MetadataInheritanceTree(object):
+    """
+    The inheritable metadata of each block in a course, and each block's parent.
+
+    Blocks don't hold a copy of the metadata they inherit. Instead they refer
+    to one of a list of shared frames, each holding the resolved inheritable
+    metadata of a container. A container only gets a frame of its own if it
+    overrides an inherited value; otherwise it shares its parent's. A course
+    thus has one frame per distinct set of inherited values rather than one
+    dict per block, which keeps the tree small to cache and to pickle.
+
+    Frames must not be modified by callers.
+    """
+    def __init__(self):
+        # list of dicts of resolved inheritable metadata
+        self.frames = []
+        # location url -> index in frames of the metadata the block inherits
+        self.blocks = {}
+        # branch setting -> location url -> location url of the parent
+        self.parents = {}
+
+    def inherited_metadata(self, url):
+        """
+        Return the dict of inheritable metadata for the block at url (empty if unknown).
+        """
+        index = self.blocks.get(url)
+        return {} if index is None else self.frames[index]
+
+    def parent_url(self, url, branch):
+        """
+        Return the url of the parent of the block at url, as found with the given branch setting, or None.
+        """
+        return self.parents.get(branch, {}).get(url)
+
+    def keys(self):
+        """
+        Return the urls of the blocks in the tree.
+        """
+        return self.blocks.keys()
+
+    def update(self, other):
+        """
+        Add the blocks of another tree to this one, replacing any already present.
+
+        Frames already in this tree are reused rather than added again, so that
+        updating with the same tree (or another copy of it, e.g. unpickled from
+        the cache) any number of times doesn't grow the tree.
+        """
+        if other is self:
+            return
+        if not self.blocks:
+            self.frames = list(other.frames)
+            self.blocks = dict(other.blocks)
+            self.parents = {branch: dict(parents) for branch, parents in other.parents.iteritems()}
+            return
+
+        frame_indexes = {id(frame): index for index, frame in enumerate(self.frames)}
+        new_indexes = []
+        for other_index, frame in enumerate(other.frames):
+            index = frame_indexes.get(id(frame))
+            if index is None:
+                index = self._find_frame(frame, other_index)
+            if index is None:
+                index = len(self.frames)
+                self.frames.append(frame)
+                frame_indexes[id(frame)] = index
+            new_indexes.append(index)
+
+        for url, index in other.blocks.iteritems():
+            self.blocks[url] = new_indexes[index]
+        for branch, parents in other.parents.iteritems():
+            self.parents.setdefault(branch, {}).update(parents)
+
+    def _find_frame(self, frame, hint):
+        """
+        Return the index of a frame of this tree equal to the given one, trying
+        the index `hint` first, or None.
+        """
+        if hint < len(self.frames) and self.frames[hint] == frame:
+            return hint
+        for index, own_frame in enumerate(self.frames):
+            if own_frame == frame:
+                return index
+        return None
+
+    def __len__(self):
+        return len(self.blocks)
+
+
 class CachingDescriptorSystem(MakoDescriptorSystem, EditInfoRuntimeMixin):
     """
     A system that has a cache of module json that it will use to load modules
@@ -243,7 +335,8 @@ class CachingDescriptorSystem(MakoDescriptorSystem, EditInfoRuntimeMixin):
                 parent = None
                 if self.cached_metadata is not None:
                     # fish the parent out of here if it's available
-                    parent_url = self.cached_metadata.get(unicode(location), {}).get('parent', {}).get(
+                    parent_url = self.cached_metadata.parent_url(
+                        unicode(location),
                         ModuleStoreEnum.Branch.published_only if location.revision is None
                         else ModuleStoreEnum.Branch.draft_preferred
                     )
@@ -282,7 +375,7 @@ class CachingDescriptorSystem(MakoDescriptorSystem, EditInfoRuntimeMixin):
 
                     # Convert the serialized fields values in self.cached_metadata
                     # to python values
-                    metadata_to_inherit = self.cached_metadata.get(unicode(non_draft_loc), {})
+                    metadata_to_inherit = self.cached_metadata.inherited_metadata(unicode(non_draft_loc))
                     inherit_metadata(module, metadata_to_inherit)
 
                 module._edit_info = json_data.get('edit_info')
@@ -709,43 +802,53 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
                 root = location_url
 
         # now traverse the tree and compute down the inherited metadata
-        metadata_to_inherit = {}
+        tree = MetadataInheritanceTree()
+        parents = tree.parents.setdefault(self.get_branch_setting(), {})
 
-        def _compute_inherited_metadata(url):
+        def _add_frame(metadata):
             """
-            Helper method for computing inherited metadata for a specific location url
+            Add a frame to the tree and return its index
             """
-            my_metadata = results_by_url[url].get('metadata', {})
+            tree.frames.append(metadata)
+            return len(tree.frames) - 1
+
+        def _compute_inherited_metadata(url, frame_index):
+            """
+            Helper method for computing inherited metadata for the children of a
+            specific location url, whose resolved metadata is in the given frame
+            """
+            frame = tree.frames[frame_index]
 
             # go through all the children and recurse, but only if we have
             # in the result set. Remember results will not contain leaf nodes
             for child in results_by_url[url].get('definition', {}).get('children', []):
                 if child in results_by_url:
-                    new_child_metadata = copy.deepcopy(my_metadata)
-                    new_child_metadata.update(results_by_url[child].get('metadata', {}))
-                    results_by_url[child]['metadata'] = new_child_metadata
-                    metadata_to_inherit[child] = new_child_metadata
-                    _compute_inherited_metadata(child)
+                    child_metadata = results_by_url[child].get('metadata', {})
+                    if any(frame.get(name, _MISSING) != value for name, value in child_metadata.iteritems()):
+                        new_frame = dict(frame)
+                        new_frame.update(child_metadata)
+                        child_frame_index = _add_frame(new_frame)
+                    else:
+                        child_frame_index = frame_index
+                    tree.blocks[child] = child_frame_index
+                    _compute_inherited_metadata(child, child_frame_index)
                 else:
-                    # this is likely a leaf node, so let's record what metadata we need to inherit
-                    metadata_to_inherit[child] = my_metadata.copy()
-                # WARNING: 'parent' is not part of inherited metadata, but
-                # we're piggybacking on this recursive traversal to grab
-                # and cache the child's parent, as a performance optimization.
-                # The 'parent' key will be popped out of the dictionary during
-                # CachingDescriptorSystem.load_item
-                metadata_to_inherit[child].setdefault('parent', {})[self.get_branch_setting()] = url
+                    # this is likely a leaf node, so it inherits the container's metadata
+                    tree.blocks[child] = frame_index
+                # we're piggybacking on this recursive traversal to grab and
+                # cache the child's parent, as a performance optimization.
+                parents[child] = url
 
         if root is not None:
-            _compute_inherited_metadata(root)
+            _compute_inherited_metadata(root, _add_frame(results_by_url[root].get('metadata', {})))
 
-        return metadata_to_inherit
+        return tree
 
     def _get_cached_metadata_inheritance_tree(self, course_id, force_refresh=False):
         '''
         Compute the metadata inheritance for the course.
         '''
-        tree = {}
+        tree = None
 
         course_id = self.fill_in_run(course_id)
         if not force_refresh:
@@ -755,14 +858,15 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
 
             # then look in any caching subsystem (e.g. memcached)
             if self.metadata_inheritance_cache_subsystem is not None:
-                tree = self.metadata_inheritance_cache_subsystem.get(unicode(course_id), {})
+                tree = self.metadata_inheritance_cache_subsystem.get(unicode(course_id))
             else:
                 logging.warning(
                     'Running MongoModuleStore without a metadata_inheritance_cache_subsystem. This is \
                     OK in localdev and testing environment. Not OK in production.'
                 )
 
-        if not tree:
+        # trees cached in an older format are recomputed too
+        if not isinstance(tree, MetadataInheritanceTree):
             # if not in subsystem, or we are on force refresh, then we have to compute
             tree = self._compute_metadata_inheritance_tree(course_id)
 
@@ -886,7 +990,7 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
         root = self.fs_root / data_dir
         resource_fs = _OSFS_INSTANCE.setdefault(root, OSFS(root, create=True))
 
-        cached_metadata = {}
+        cached_metadata = MetadataInheritanceTree()
         if apply_cached_metadata:
             cached_metadata = self._get_cached_metadata_inheritance_tree(course_key)
 
@@ -1255,7 +1359,7 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
                 resources_fs=None,
                 error_tracker=self.error_tracker,
                 render_template=self.render_template,
-                cached_metadata={},
+                cached_metadata=MetadataInheritanceTree(),
                 mixins=self.xblock_mixins,
                 select=self.xblock_select,
                 services=services,
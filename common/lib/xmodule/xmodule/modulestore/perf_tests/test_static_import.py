@@ -0,0 +1,90 @@
+"""
+Performance test for importing static files into the contentstore.
+"""
+import itertools
+import os
+from path import path
+from shutil import rmtree
+from tempfile import mkdtemp
+import unittest
+
+import ddt
+from nose.plugins.skip import SkipTest
+from opaque_keys.edx.locator import CourseLocator
+
+from xmodule.modulestore.tests.test_cross_modulestore_import_export import MongoContentstoreBuilder
+from xmodule.modulestore.xml_importer import import_static_content, STATIC_IMPORT_WORKERS
+
+# The dependency below needs to be installed manually from the development.txt file, which doesn't
+# get installed during unit tests!
+try:
+    from code_block_timer import CodeBlockTimer
+except ImportError:
+    CodeBlockTimer = None
+
+# Number and size (in bytes) of the static files imported per test run.
+STATIC_FILES_PER_TEST = (
+    (1000, 10 * 1024),
+    (100, 1024 * 1024),
+    (10, 50 * 1024 * 1024),
+)
+
+# Number of threads importing the files.
+WORKERS_PER_TEST = (1, STATIC_IMPORT_WORKERS)
+
+
+@ddt.ddt
+# Eventually, exclude this attribute from regular unittests while running *only* tests
+# with this attribute during regular performance tests.
+# @attr("perf_test")
+@unittest.skip
+class StaticImportTest(unittest.TestCase):
+    """
+    This class exists to time the import of static files of different sizes,
+    with and without a pool of import threads.
+    """
+
+    # Use this attribute to skip this test on regular unittest CI runs.
+    perf_test = True
+
+    def setUp(self):
+        super(StaticImportTest, self).setUp()
+        self.course_dir = path(mkdtemp())
+        self.addCleanup(rmtree, self.course_dir, ignore_errors=True)
+
+    def make_static_files(self, num_files, file_size):
+        """
+        Write num_files files of file_size random bytes into the course's static directory.
+        """
+        static_dir = self.course_dir / 'static'
+        os.makedirs(static_dir)
+        for index in range(num_files):
+            with open(static_dir / 'file{}.bin'.format(index), 'wb') as static_file:
+                static_file.write(os.urandom(file_size))
+
+    @ddt.data(*[
+        files + (workers,) for files, workers in itertools.product(STATIC_FILES_PER_TEST, WORKERS_PER_TEST)
+    ])
+    @ddt.unpack
+    def test_generate_static_import_timings(self, num_files, file_size, workers):
+        """
+        Generate timings for importing, and importing again unchanged, static files.
+        """
+        if CodeBlockTimer is None:
+            raise SkipTest("CodeBlockTimer undefined.")
+
+        self.make_static_files(num_files, file_size)
+        course_key = CourseLocator('a', 'course', 'course')
+
+        desc = "StaticImport:{}x{}:{}workers".format(num_files, file_size, workers)
+        with CodeBlockTimer(desc):
+            with MongoContentstoreBuilder().build() as content_store:
+                with CodeBlockTimer("initial_import"):
+                    import_static_content(
+                        self.course_dir, content_store, course_key, workers=workers, skip_unchanged=True
+                    )
+
+                with CodeBlockTimer("unchanged_import"):
+                    import_static_content(
+                        self.course_dir, content_store, course_key, workers=workers, skip_unchanged=True
+                    )
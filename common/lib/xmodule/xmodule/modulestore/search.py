@@ -1,11 +1,150 @@
 ''' useful functions for finding content and its position '''
 from logging import getLogger
+from uuid import uuid4
 
 from .exceptions import (ItemNotFoundError, NoPathToItem)
 
 LOGGER = getLogger(__name__)
 
 
+class NavigationIndex(object):
+    """
+    The parent of, and position within that parent's children of, every block which can be reached from a
+    course's root through get_children, for one version of the course.
+
+    Blocks are identified by (block_type, block_id) pairs, so that the index can be pickled into a cache
+    and is independent of the branch and version information in usage keys.
+    """
+    def __init__(self, root):
+        self.root = root
+        self.parents = {}
+        self.positions = {}
+
+    @classmethod
+    def build(cls, course):
+        """
+        Walk the given course, which should have been loaded with all of its descendants, and index it.
+        """
+        index = cls(_index_key(course.location))
+        stack = [course]
+        while stack:
+            block = stack.pop()
+            if not block.has_children:
+                continue
+            block_key = _index_key(block.location)
+            # this calls get_children rather than just children b/c old mongo includes private children
+            # in children but not in get_children
+            for position, child in enumerate(block.get_children(), start=1):
+                child_key = _index_key(child.location)
+                # as get_parent_location does, keep a single parent for blocks reachable through several
+                if child_key in index.parents or child_key == index.root:
+                    continue
+                index.parents[child_key] = block_key
+                index.positions[child_key] = position
+                stack.append(child)
+        return index
+
+    def path(self, usage_key):
+        """
+        Return the blocks from the course root down to the given block, or None if the block isn't in the index.
+        """
+        block_key = _index_key(usage_key)
+        path = [block_key]
+        while block_key != self.root:
+            block_key = self.parents.get(block_key)
+            if block_key is None:
+                return None
+            path.append(block_key)
+        path.reverse()
+        return path
+
+
+def _index_key(usage_key):
+    """
+    Identify a block of a course within a NavigationIndex.
+    """
+    return (usage_key.block_type, usage_key.block_id)
+
+
+def _navigation_index_generation(cache, course_key):
+    """
+    Return the token identifying the current generation of the course's cached navigation indexes, creating one
+    if there is none (e.g. it was evicted from the cache).
+    """
+    generation_key = _navigation_index_generation_key(course_key)
+    generation = cache.get(generation_key)
+    if generation is None:
+        generation = uuid4().hex
+        cache.set(generation_key, generation)
+    return generation
+
+
+def _navigation_index_generation_key(course_key):
+    """
+    Return the cache key of the generation of the course's navigation indexes, shared by all branches and
+    versions of the course.
+    """
+    return u'navigation_index.{}.generation'.format(course_key.replace(branch=None, version_guid=None))
+
+
+def clear_navigation_index(modulestore, course_key):
+    """
+    Forget the cached navigation indexes of the course, after content was published to it.
+
+    Publishing doesn't always change the course root's subtree_edited_on (e.g. in old mongo, publishing from a
+    chapter or sequential leaves the ancestors untouched), so the indexes are also keyed by a generation token
+    which is replaced here.
+    """
+    request_cache = getattr(modulestore, 'request_cache', None)
+    if request_cache is not None:
+        request_cache.data.pop('navigation_index', None)
+    cache = getattr(modulestore, 'metadata_inheritance_cache_subsystem', None)
+    if cache is not None:
+        cache.set(_navigation_index_generation_key(course_key), uuid4().hex)
+
+
+def _get_navigation_index(modulestore, course_key):
+    """
+    Return the course's id and the NavigationIndex of its current version, from the modulestore's request cache
+    or caching subsystem if present, otherwise by walking the course. Cached indexes are dropped by
+    clear_navigation_index whenever the course is published.
+
+    Returns None if the modulestore has no caches to keep the index in, or the course or its version can't be
+    determined, in which case callers should walk the modulestore instead.
+    """
+    request_cache = getattr(modulestore, 'request_cache', None)
+    cache = getattr(modulestore, 'metadata_inheritance_cache_subsystem', None)
+    if request_cache is None and cache is None:
+        # the index would be rebuilt on every call, which costs more than walking up from a single block
+        return None
+
+    course = modulestore.get_course(course_key)
+    if course is None:
+        return None
+    try:
+        version = course.subtree_edited_on
+    except AttributeError:
+        # e.g. xml courses, which don't track edits
+        version = None
+    if version is None:
+        return None
+
+    branch = modulestore.get_branch_setting() if hasattr(modulestore, 'get_branch_setting') else None
+    generation = _navigation_index_generation(cache, course.id) if cache is not None else None
+    cache_key = u'navigation_index.{}.{}.{}.{}'.format(course.id, branch, version.isoformat(), generation)
+    request_indexes = request_cache.data.setdefault('navigation_index', {}) if request_cache is not None else {}
+
+    index = request_indexes.get(cache_key)
+    if index is None and cache is not None:
+        index = cache.get(cache_key)
+    if not isinstance(index, NavigationIndex):
+        index = NavigationIndex.build(modulestore.get_course(course_key, depth=None))
+        if cache is not None:
+            cache.set(cache_key, index)
+    request_indexes[cache_key] = index
+    return course.id, index
+
+
 def path_to_location(modulestore, usage_key):
     '''
     Try to find a course_id/chapter/section[/position] path to location in
@@ -74,6 +213,14 @@ def path_to_location(modulestore, usage_key):
             queue.append((parent, newpath))
 
     with modulestore.bulk_operations(usage_key.course_key):
+        indexed = _get_navigation_index(modulestore, usage_key.course_key)
+        if indexed is not None:
+            course_id, index = indexed
+            index_path = index.path(usage_key)
+            if index_path is not None:
+                return _location_from_index_path(course_id, index, index_path)
+
+        # blocks missing from the index (e.g. orphans) are looked for the long way
         if not modulestore.has_item(usage_key):
             raise ItemNotFoundError(usage_key)
 
@@ -112,6 +259,24 @@ def path_to_location(modulestore, usage_key):
         return (course_id, chapter, section, position)
 
 
+def _location_from_index_path(course_id, index, path):
+    """
+    Return the (course_id, chapter, section, position) tuple for a path of blocks found in a NavigationIndex,
+    in the same form as path_to_location computes it from the modulestore.
+    """
+    n = len(path)
+    chapter = path[1][1] if n > 1 else None
+    section = path[2][1] if n > 2 else None
+    position = None
+    if n > 3:
+        position = "_".join(
+            str(index.positions[path[path_index + 1]])
+            for path_index in range(2, n - 1)
+            if path[path_index][0] in ('sequential', 'videosequence')
+        )
+    return (course_id, chapter, section, position)
+
+
 def navigation_index(position):
     """
     Get the navigation index from the position argument (where the position argument was recieved from a call to
@@ -1,7 +1,9 @@
 """
 Segregation of pymongo functions from the data modeling mechanisms for split modulestore.
 """
+import cPickle as pickle
 import re
+import zlib
 from mongodb_proxy import autoretry_read, MongoProxy
 import pymongo
 
@@ -9,6 +11,7 @@ import pymongo
 from pymongo.errors import DuplicateKeyError  # pylint: disable=unused-import
 
 from contracts import check, new_contract
+import dogstats_wrapper as dog_stats_api
 from xmodule.exceptions import HeartbeatFailure
 from xmodule.modulestore import BlockData
 from xmodule.modulestore.split_mongo import BlockKey
@@ -70,17 +73,92 @@ def structure_to_mongo(structure):
     return new_structure
 
 
+class StructureCache(object):
+    """
+    A cross-request cache of course structures, keyed by version guid.
+
+    Structures are immutable once written, so entries never need to be
+    invalidated. They are stored as zlib-compressed pickles in `cache`, which
+    can be any django-style cache (memcached, local memory, ...). Structures
+    whose compressed size exceeds `max_size` bytes are not cached.
+    """
+    # Default cap, just under memcached's default 1MB item size limit
+    DEFAULT_MAX_SIZE = 1000 * 1000
+
+    def __init__(self, cache, max_size=DEFAULT_MAX_SIZE):
+        self.cache = cache
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.too_large = 0
+
+    def _record(self, result, count=1):
+        """
+        Count `count` cache lookups or writes with the given `result`.
+        """
+        if count:
+            dog_stats_api.increment('split_mongo.structure_cache', value=count, tags=[u'result:{}'.format(result)])
+
+    @staticmethod
+    def _key(version_guid):
+        """
+        Return the cache key of the structure with id `version_guid`.
+        """
+        return u'split_structure.{}'.format(version_guid)
+
+    def get(self, version_guid):
+        """
+        Return the structure with id `version_guid`, or None if it isn't cached.
+        """
+        data = self.cache.get(self._key(version_guid))
+        if data is None:
+            self.misses += 1
+            self._record('miss')
+            return None
+        self.hits += 1
+        self._record('hit')
+        return pickle.loads(zlib.decompress(data))
+
+    def get_many(self, version_guids):
+        """
+        Return a dict mapping each cached id in `version_guids` to its structure.
+        """
+        keys = {self._key(version_guid): version_guid for version_guid in version_guids}
+        found = self.cache.get_many(keys.keys())
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        self._record('hit', len(found))
+        self._record('miss', len(keys) - len(found))
+        return {keys[key]: pickle.loads(zlib.decompress(data)) for key, data in found.iteritems()}
+
+    def set(self, structure):
+        """
+        Cache `structure` (already converted by `structure_from_mongo`) under its id.
+        """
+        # Level 1 compresses fastest, at the cost of slightly larger entries
+        data = zlib.compress(pickle.dumps(structure, pickle.HIGHEST_PROTOCOL), 1)
+        if len(data) > self.max_size:
+            self.too_large += 1
+            self._record('too_large')
+            return
+        self.cache.set(self._key(structure['_id']), data)
+
+
 class MongoConnection(object):
     """
     Segregation of pymongo functions from the data modeling mechanisms for split modulestore.
     """
     def __init__(
         self, db, collection, host, port=27017, tz_aware=True, user=None, password=None,
-        asset_collection=None, retry_wait_time=0.1, **kwargs
+        asset_collection=None, retry_wait_time=0.1, structure_cache=None, **kwargs
     ):
         """
         Create & open the connection, authenticate, and provide pointers to the collections
+
+        If `structure_cache` (a StructureCache) is given, structures read by id are
+        cached in it across requests.
         """
+        self.structure_cache = structure_cache
         self.database = MongoProxy(
             pymongo.database.Database(
                 pymongo.MongoClient(
@@ -122,7 +200,15 @@ class MongoConnection(object):
         """
         Get the structure from the persistence mechanism whose id is the given key
         """
-        return structure_from_mongo(self.structures.find_one({'_id': key}))
+        if self.structure_cache is not None:
+            structure = self.structure_cache.get(key)
+            if structure is not None:
+                return structure
+
+        structure = structure_from_mongo(self.structures.find_one({'_id': key}))
+        if self.structure_cache is not None:
+            self.structure_cache.set(structure)
+        return structure
 
     @autoretry_read()
     def find_structures_by_id(self, ids):
@@ -132,7 +218,18 @@ class MongoConnection(object):
         Arguments:
             ids (list): A list of structure ids
         """
-        return [structure_from_mongo(structure) for structure in self.structures.find({'_id': {'$in': ids}})]
+        if self.structure_cache is None:
+            return [structure_from_mongo(structure) for structure in self.structures.find({'_id': {'$in': ids}})]
+
+        cached = self.structure_cache.get_many(ids)
+        structures = cached.values()
+        missing = [structure_id for structure_id in ids if structure_id not in cached]
+        if missing:
+            for structure in self.structures.find({'_id': {'$in': missing}}):
+                structure = structure_from_mongo(structure)
+                self.structure_cache.set(structure)
+                structures.append(structure)
+        return structures
 
     @autoretry_read()
     def find_structures_derived_from(self, ids):
@@ -27,7 +27,7 @@ from tempfile import mkdtemp
 from xmodule.x_module import XModuleMixin
 from xmodule.modulestore.edit_info import EditInfoMixin
 from xmodule.modulestore.inheritance import InheritanceMixin
-from xmodule.modulestore.tests.test_cross_modulestore_import_export import MongoContentstoreBuilder
+from xmodule.modulestore.tests.test_cross_modulestore_import_export import MemoryCache, MongoContentstoreBuilder
 from xmodule.contentstore.content import StaticContent
 from opaque_keys.edx.keys import CourseKey
 from xmodule.modulestore.xml_importer import import_course_from_xml
@@ -1139,6 +1139,65 @@ class TestMixedModuleStore(CommonMixedModuleStoreSetup):
         with self.assertRaises(NoPathToItem):
             path_to_location(self.store, orphan)
 
+    @ddt.data('draft', 'split')
+    def test_path_to_location_from_index(self, default_ms):
+        """
+        Make sure that path_to_location answers from the cached navigation index, without walking up the tree
+        """
+        self.initdb(default_ms)
+        self.store.metadata_inheritance_cache_subsystem = MemoryCache()
+
+        course_key = self.course_locations[self.MONGO_COURSEID].course_key
+        with self.store.branch_setting(ModuleStoreEnum.Branch.published_only, course_key):
+            self._create_block_hierarchy()
+
+            # the first call builds and caches the index
+            path_to_location(self.store, self.chapter_x)
+
+            should_work = (
+                (self.problem_x1a_2,
+                 (course_key, u"Chapter_x", u"Sequential_x1", '1')),
+                (self.vertical_x1b,
+                 (course_key, u"Chapter_x", u"Sequential_x1", '2')),
+                (self.chapter_x,
+                 (course_key, "Chapter_x", None, None)),
+            )
+            for location, expected in should_work:
+                with check_exact_number_of_calls(self.store, 'get_parent_location', 0):
+                    self.assertEqual(path_to_location(self.store, location), expected)
+
+    @ddt.data('draft', 'split')
+    def test_path_to_location_index_after_publish(self, default_ms):
+        """
+        Make sure that the cached navigation index isn't used once the course has been published, even when
+        publishing from a chapter doesn't change the course root
+        """
+        self.initdb(default_ms)
+        cache = MemoryCache()
+        self.store.metadata_inheritance_cache_subsystem = cache
+        for store in self.store.modulestores:
+            store.metadata_inheritance_cache_subsystem = cache
+
+        course_key = self.course_locations[self.MONGO_COURSEID].course_key
+        self._create_block_hierarchy()
+        self.store.publish(self.chapter_x, self.user_id)
+        with self.store.branch_setting(ModuleStoreEnum.Branch.published_only, course_key):
+            self.assertEqual(
+                path_to_location(self.store, self.vertical_x1b),
+                (course_key, u"Chapter_x", u"Sequential_x1", '2')
+            )
+
+        # add a unit before the others, and publish it from its chapter
+        self.store.create_child(
+            self.user_id, self.sequential_x1, 'vertical', block_id='Vertical_x1_new', position=0
+        )
+        self.store.publish(self.chapter_x, self.user_id)
+        with self.store.branch_setting(ModuleStoreEnum.Branch.published_only, course_key):
+            self.assertEqual(
+                path_to_location(self.store, self.vertical_x1b),
+                (course_key, u"Chapter_x", u"Sequential_x1", '3')
+            )
+
     def test_xml_path_to_location(self):
         """
         Make sure that path_to_location works: should be passed a modulestore
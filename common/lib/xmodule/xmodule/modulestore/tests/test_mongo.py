@@ -9,6 +9,7 @@ from nose.tools import assert_equals, assert_raises, \
     assert_not_equals, assert_false, assert_true, assert_greater, assert_is_instance, assert_is_none
 # pylint: enable=E0611
 from path import path
+import pickle
 import pymongo
 import logging
 import shutil
@@ -39,7 +40,7 @@ from nose.tools import assert_in
 from xmodule.exceptions import NotFoundError
 from git.test.lib.asserts import assert_not_none
 from xmodule.x_module import XModuleMixin
-from xmodule.modulestore.mongo.base import as_draft
+from xmodule.modulestore.mongo.base import as_draft, MetadataInheritanceTree
 from xmodule.modulestore.tests.mongo_connection import MONGO_PORT_NUM, MONGO_HOST
 from xmodule.modulestore.tests.utils import LocationMixin
 from xmodule.modulestore.edit_info import EditInfoMixin
@@ -778,6 +779,48 @@ class TestMongoModuleStore(TestMongoModuleStoreBase):
         # Clean up the data so we don't break other tests which apparently expect a particular state
         self.draft_store.delete_course(course.id, self.dummy_user)
 
+    def test_metadata_inheritance_tree(self):
+        """
+        Blocks share the inheritance frames of their containers instead of holding copies.
+        """
+        course_key = SlashSeparatedCourseKey('edX', 'toy', '2012_Fall')
+        tree = self.draft_store._compute_metadata_inheritance_tree(course_key)  # pylint: disable=protected-access
+
+        chapter_url = unicode(course_key.make_usage_key('chapter', 'Overview'))
+        sequence_url = unicode(course_key.make_usage_key('videosequence', 'Toy_Videos'))
+        video_url = unicode(course_key.make_usage_key('video', 'Welcome'))
+        html_url = unicode(course_key.make_usage_key('html', 'toyjumpto'))
+
+        self.assertIs(tree.inherited_metadata(video_url), tree.inherited_metadata(chapter_url))
+        self.assertIs(tree.inherited_metadata(html_url), tree.inherited_metadata(sequence_url))
+        self.assertLess(len(tree.frames), len(tree.keys()))
+
+        sequence_metadata = tree.inherited_metadata(sequence_url)
+        self.assertEqual(sequence_metadata['format'], 'Lecture Sequence')
+        self.assertEqual(sequence_metadata['graceperiod'], tree.inherited_metadata(video_url)['graceperiod'])
+        self.assertEqual(tree.inherited_metadata(unicode(course_key.make_usage_key('html', 'missing'))), {})
+
+        self.assertEqual(tree.parent_url(video_url, ModuleStoreEnum.Branch.draft_preferred), chapter_url)
+        self.assertEqual(tree.parent_url(html_url, ModuleStoreEnum.Branch.draft_preferred), sequence_url)
+
+    def test_metadata_inheritance_tree_update(self):
+        """
+        Updating a tree with the same tree, or a copy of it, doesn't add frames again.
+        """
+        course_key = SlashSeparatedCourseKey('edX', 'toy', '2012_Fall')
+        tree = self.draft_store._compute_metadata_inheritance_tree(course_key)  # pylint: disable=protected-access
+        video_url = unicode(course_key.make_usage_key('video', 'Welcome'))
+
+        runtime_tree = MetadataInheritanceTree()
+        for other in (tree, tree, pickle.loads(pickle.dumps(tree))):
+            runtime_tree.update(other)
+            self.assertEqual(len(runtime_tree.frames), len(tree.frames))
+            self.assertEqual(runtime_tree.inherited_metadata(video_url), tree.inherited_metadata(video_url))
+            self.assertEqual(
+                runtime_tree.parent_url(video_url, ModuleStoreEnum.Branch.draft_preferred),
+                tree.parent_url(video_url, ModuleStoreEnum.Branch.draft_preferred)
+            )
+
 
 class TestMongoModuleStoreWithNoAssetCollection(TestMongoModuleStore):
     '''
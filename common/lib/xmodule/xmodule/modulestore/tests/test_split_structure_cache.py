@@ -0,0 +1,89 @@
+"""
+Tests for the cross-request cache of split modulestore structures.
+"""
+import unittest
+from bson.objectid import ObjectId
+from mock import Mock
+
+from xmodule.modulestore.split_mongo import BlockKey
+from xmodule.modulestore.split_mongo.mongo_connection import (
+    MongoConnection, StructureCache, structure_from_mongo
+)
+
+
+class DictCache(object):
+    """
+    Minimal stand-in for a django cache.
+    """
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def get_many(self, keys):
+        return {key: self.data[key] for key in keys if key in self.data}
+
+    def set(self, key, value):
+        self.data[key] = value
+
+
+def mongo_structure(structure_id):
+    """
+    Return a structure as it is stored in mongo.
+    """
+    return {
+        '_id': structure_id,
+        'root': ['course', 'course'],
+        'blocks': [
+            {'block_type': 'course', 'block_id': 'course', 'fields': {'children': [['chapter', 'intro']]}},
+            {'block_type': 'chapter', 'block_id': 'intro', 'fields': {'display_name': 'Intro'}},
+        ],
+    }
+
+
+class TestStructureCache(unittest.TestCase):
+    """
+    Tests of StructureCache and its use by MongoConnection.
+    """
+    def setUp(self):
+        super(TestStructureCache, self).setUp()
+        self.cache = StructureCache(DictCache())
+        self.connection = MongoConnection.__new__(MongoConnection)
+        self.connection.structure_cache = self.cache
+        self.connection.structures = Mock(name='structures')
+
+    def test_get_structure_is_cached(self):
+        structure_id = ObjectId()
+        self.connection.structures.find_one.side_effect = lambda query: mongo_structure(query['_id'])
+
+        first = self.connection.get_structure(structure_id)
+        second = self.connection.get_structure(structure_id)
+
+        self.assertEqual(self.connection.structures.find_one.call_count, 1)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+        self.assertEqual(second['root'], BlockKey('course', 'course'))
+        self.assertEqual(
+            second['blocks'][BlockKey('course', 'course')].fields['children'],
+            [BlockKey('chapter', 'intro')]
+        )
+        self.assertEqual(set(first['blocks']), set(second['blocks']))
+        # Every read gets its own copy, so callers can't corrupt the cache
+        self.assertIsNot(first, second)
+
+    def test_find_structures_by_id_only_queries_missing(self):
+        cached_id, missing_id = ObjectId(), ObjectId()
+        self.cache.set(structure_from_mongo(mongo_structure(cached_id)))
+        self.connection.structures.find.return_value = [mongo_structure(missing_id)]
+
+        structures = self.connection.find_structures_by_id([cached_id, missing_id])
+
+        self.connection.structures.find.assert_called_once_with({'_id': {'$in': [missing_id]}})
+        self.assertEqual(set(structure['_id'] for structure in structures), {cached_id, missing_id})
+        self.assertIsNotNone(self.cache.get(missing_id))
+
+    def test_size_cap(self):
+        cache = StructureCache(DictCache(), max_size=10)
+        cache.set(structure_from_mongo(mongo_structure(ObjectId())))
+        self.assertEqual(cache.too_large, 1)
+        self.assertEqual(cache.cache.data, {})
@@ -20,8 +20,14 @@ Modulestore virtual   |          XML physical (draft, published)
              (a, a)   |  (a, a) | (x, a) | (x, x) | (x, y) | (a, x)
              (a, b)   |  (a, b) | (x, b) | (x, x) | (x, y) | (a, x)
 """
+import hashlib
+import itertools
 import logging
 from abc import abstractmethod
+from collections import OrderedDict
+from contextlib import contextmanager
+from multiprocessing.pool import ThreadPool
+import time
 from opaque_keys.edx.locator import LibraryLocator
 import os
 import mimetypes
@@ -52,11 +58,28 @@ from xmodule.modulestore.tests.utils import LocationMixin
 
 log = logging.getLogger(__name__)
 
+# Static files larger than this (in bytes) are streamed into the content store instead of read into memory
+STATIC_STREAM_THRESHOLD = 4 * 1024 * 1024
+# The size of the chunks in which static files are streamed
+STATIC_STREAM_CHUNK_SIZE = 1024 * 1024
+# The number of threads importing static files
+STATIC_IMPORT_WORKERS = 4
+
 
 def import_static_content(
         course_data_path, static_content_store,
-        target_id, subpath='static', verbose=False):
+        target_id, subpath='static', verbose=False,
+        workers=STATIC_IMPORT_WORKERS, skip_unchanged=False):
+    """
+    Import the files in course_data_path/subpath into static_content_store as assets of target_id.
 
+    Files larger than STATIC_STREAM_THRESHOLD are streamed into the store in chunks rather than
+    read into memory. Reading, thumbnailing and saving the files is spread over `workers` threads.
+    If skip_unchanged is True, files whose contents and metadata match the asset already in the
+    store are not uploaded again.
+
+    Returns a dict mapping the imported file paths (relative to subpath) to their asset keys.
+    """
     remap_dict = {}
 
     # now import all static assets
@@ -75,70 +98,157 @@ def import_static_content(
     mimetypes.add_type('application/octet-stream', '.srt')
     mimetypes_list = mimetypes.types_map.values()
 
-    for dirname, _, filenames in os.walk(static_dir):
-        for filename in filenames:
-
-            content_path = os.path.join(dirname, filename)
+    existing_assets = {}
+    if skip_unchanged:
+        assets, __ = static_content_store.get_all_content_for_course(target_id)
+        existing_assets = {asset['asset_key']: asset for asset in assets}
 
-            if re.match(ASSET_IGNORE_REGEX, filename):
-                if verbose:
-                    log.debug('skipping static content %s...', content_path)
-                continue
+    def static_files():
+        """
+        Yield the path, name and asset metadata of each static file to import.
+        """
+        for dirname, _, filenames in os.walk(static_dir):
+            for filename in filenames:
 
-            if verbose:
-                log.debug('importing static content %s...', content_path)
+                content_path = os.path.join(dirname, filename)
 
-            try:
-                with open(content_path, 'rb') as f:
-                    data = f.read()
-            except IOError:
-                if filename.startswith('._'):
-                    # OS X "companion files". See
-                    # http://www.diigo.com/annotated/0c936fda5da4aa1159c189cea227e174
+                if re.match(ASSET_IGNORE_REGEX, filename):
+                    if verbose:
+                        log.debug('skipping static content %s...', content_path)
                     continue
-                # Not a 'hidden file', then re-raise exception
-                raise
 
-            # strip away leading path from the name
-            fullname_with_subpath = content_path.replace(static_dir, '')
-            if fullname_with_subpath.startswith('/'):
-                fullname_with_subpath = fullname_with_subpath[1:]
-            asset_key = StaticContent.compute_location(target_id, fullname_with_subpath)
-
-            policy_ele = policy.get(asset_key.path, {})
-            displayname = policy_ele.get('displayname', filename)
-            locked = policy_ele.get('locked', False)
-            mime_type = policy_ele.get('contentType')
-
-            # Check extracted contentType in list of all valid mimetypes
-            if not mime_type or mime_type not in mimetypes_list:
-                mime_type = mimetypes.guess_type(filename)[0]   # Assign guessed mimetype
-            content = StaticContent(
-                asset_key, displayname, mime_type, data,
-                import_path=fullname_with_subpath, locked=locked
-            )
+                # strip away leading path from the name
+                fullname_with_subpath = content_path.replace(static_dir, '')
+                if fullname_with_subpath.startswith('/'):
+                    fullname_with_subpath = fullname_with_subpath[1:]
+                asset_key = StaticContent.compute_location(target_id, fullname_with_subpath)
 
-            # first let's save a thumbnail so we can get back a thumbnail location
-            thumbnail_content, thumbnail_location = static_content_store.generate_thumbnail(content)
+                policy_ele = policy.get(asset_key.path, {})
+                displayname = policy_ele.get('displayname', filename)
+                locked = policy_ele.get('locked', False)
+                mime_type = policy_ele.get('contentType')
 
-            if thumbnail_content is not None:
-                content.thumbnail_location = thumbnail_location
+                # Check extracted contentType in list of all valid mimetypes
+                if not mime_type or mime_type not in mimetypes_list:
+                    mime_type = mimetypes.guess_type(filename)[0]   # Assign guessed mimetype
 
-            # then commit the content
-            try:
-                static_content_store.save(content)
-            except Exception as err:
-                log.exception(u'Error importing {0}, error={1}'.format(
-                    fullname_with_subpath, err
-                ))
+                yield content_path, fullname_with_subpath, asset_key, displayname, mime_type, locked
+
+    def import_file(static_file):
+        """
+        Save one static file (and its thumbnail) in the content store.
 
+        Returns the path of the file relative to subpath and its asset key, or None if the file was skipped.
+        """
+        content_path, fullname_with_subpath, asset_key, displayname, mime_type, locked = static_file
+        if verbose:
+            log.debug('importing static content %s...', content_path)
+
+        try:
+            static_file_size = os.path.getsize(content_path)
+            if skip_unchanged and _is_unchanged_asset(
+                    existing_assets.get(asset_key), content_path,
+                    fullname_with_subpath, displayname, mime_type, locked
+            ):
+                return fullname_with_subpath, asset_key, False
+            if static_file_size > STATIC_STREAM_THRESHOLD:
+                data = _static_file_chunks(open(content_path, 'rb'))
+            else:
+                with open(content_path, 'rb') as f:
+                    data = f.read()
+        except (IOError, OSError):
+            if os.path.basename(content_path).startswith('._'):
+                # OS X "companion files". See
+                # http://www.diigo.com/annotated/0c936fda5da4aa1159c189cea227e174
+                return None
+            # Not a 'hidden file', then re-raise exception
+            raise
+
+        content = StaticContent(
+            asset_key, displayname, mime_type, data,
+            import_path=fullname_with_subpath, locked=locked,
+            length=static_file_size
+        )
+
+        # first let's save a thumbnail so we can get back a thumbnail location;
+        # streamed content can only be read once, so the thumbnail is made from the file
+        thumbnail_content, thumbnail_location = static_content_store.generate_thumbnail(
+            content, tempfile_path=content_path if static_file_size > STATIC_STREAM_THRESHOLD else None
+        )
+
+        if thumbnail_content is not None:
+            content.thumbnail_location = thumbnail_location
+
+        # then commit the content
+        try:
+            static_content_store.save(content)
+        except Exception as err:
+            log.exception(u'Error importing {0}, error={1}'.format(
+                fullname_with_subpath, err
+            ))
+        finally:
+            if hasattr(data, 'close'):
+                data.close()
+
+        return fullname_with_subpath, asset_key, True
+
+    pool = ThreadPool(workers) if workers > 1 else None
+    try:
+        imap = pool.imap_unordered if pool else itertools.imap
+        imported = imap(import_file, static_files())
+        unchanged_count = 0
+        for result in imported:
+            if result is None:
+                continue
+            fullname_with_subpath, asset_key, uploaded = result
+            if not uploaded:
+                unchanged_count += 1
             # store the remapping information which will be needed
             # to subsitute in the module data
             remap_dict[fullname_with_subpath] = asset_key
-
+    finally:
+        if pool:
+            pool.close()
+            pool.join()
+
+    log.info(
+        u'Imported %d static files from %s (%d unchanged, not uploaded again)',
+        len(remap_dict), static_dir, unchanged_count
+    )
     return remap_dict
 
 
+def _static_file_chunks(static_file):
+    """
+    Yield the contents of the open static_file in chunks, closing it once they have been read.
+    """
+    with static_file:
+        for chunk in iter(lambda: static_file.read(STATIC_STREAM_CHUNK_SIZE), ''):
+            yield chunk
+
+
+def _is_unchanged_asset(asset, content_path, import_path, displayname, mime_type, locked):
+    """
+    Returns whether asset (a content store asset dictionary, or None) already holds the contents
+    of the file at content_path along with the given metadata.
+    """
+    if asset is None or asset.get('md5') is None:
+        return False
+    if (
+            asset.get('import_path') != import_path or
+            asset.get('displayname') != displayname or
+            asset.get('contentType') != mime_type or
+            asset.get('locked', False) != locked
+    ):
+        return False
+
+    digest = hashlib.md5()
+    with open(content_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(STATIC_STREAM_CHUNK_SIZE), ''):
+            digest.update(chunk)
+    return digest.hexdigest() == asset['md5']
+
+
 class ImportManager(object):
     """
     Import xml-based courselikes from data_dir into modulestore.
@@ -171,6 +281,10 @@ class ImportManager(object):
             Otherwise, it throws an InvalidLocationError if the courselike does not exist.
 
         default_class, load_error_modules: are arguments for constructing the XMLModuleStore (see its doc)
+
+    After run_imports has been iterated over, `timings` maps each phase of the import
+    ('courselike', 'static', 'asset_metadata', 'children', 'drafts') to the number of seconds
+    spent in it, summed over all of the imported courselikes.
     """
     store_class = XMLModuleStore
 
@@ -203,6 +317,18 @@ class ImportManager(object):
             target_course_id=target_id,
         )
         self.logger, self.errors = make_error_tracker()
+        self.timings = OrderedDict()
+
+    @contextmanager
+    def timed(self, phase):
+        """
+        Add the time spent in the body of the context to the timing of phase.
+        """
+        start = time.time()
+        try:
+            yield
+        finally:
+            self.timings[phase] = self.timings.get(phase, 0.0) + time.time() - start
 
     def preflight(self):
         """
@@ -221,7 +347,8 @@ class ImportManager(object):
             # first pass to find everything in /static/
             import_static_content(
                 data_path, self.static_content_store,
-                dest_id, subpath='static', verbose=self.verbose
+                dest_id, subpath='static', verbose=self.verbose,
+                skip_unchanged=True
             )
 
         elif self.verbose and not self.do_import_static:
@@ -244,7 +371,8 @@ class ImportManager(object):
         if os.path.exists(data_path / simport):
             import_static_content(
                 data_path, self.static_content_store,
-                dest_id, subpath=simport, verbose=self.verbose
+                dest_id, subpath=simport, verbose=self.verbose,
+                skip_unchanged=True
             )
 
     def import_asset_metadata(self, data_dir, course_id):
@@ -430,26 +558,35 @@ class ImportManager(object):
             # This bulk operation wraps all the operations to populate the published branch.
             with self.store.bulk_operations(dest_id):
                 # Retrieve the course itself.
-                source_courselike, courselike, data_path = self.get_courselike(courselike_key, runtime, dest_id)
+                with self.timed('courselike'):
+                    source_courselike, courselike, data_path = self.get_courselike(courselike_key, runtime, dest_id)
 
                 # Import all static pieces.
-                self.import_static(data_path, dest_id)
+                with self.timed('static'):
+                    self.import_static(data_path, dest_id)
 
                 # Import asset metadata stored in XML.
-                self.import_asset_metadata(data_path, dest_id)
+                with self.timed('asset_metadata'):
+                    self.import_asset_metadata(data_path, dest_id)
 
                 # Import all children
-                self.import_children(source_courselike, courselike, courselike_key, dest_id)
+                with self.timed('children'):
+                    self.import_children(source_courselike, courselike, courselike_key, dest_id)
 
             # This bulk operation wraps all the operations to populate the draft branch with any items
             # from the /drafts subdirectory.
             # Drafts must be imported in a separate bulk operation from published items to import properly,
             # due to the recursive_build() above creating a draft item for each course block
             # and then publishing it.
-            with self.store.bulk_operations(dest_id):
-                # Import all draft items into the courselike.
-                courselike = self.import_drafts(courselike, courselike_key, data_path, dest_id)
-
+            with self.timed('drafts'):
+                with self.store.bulk_operations(dest_id):
+                    # Import all draft items into the courselike.
+                    courselike = self.import_drafts(courselike, courselike_key, data_path, dest_id)
+
+            log.info(
+                u'Imported %s; time spent per phase so far: %s', dest_id,
+                u', '.join(u'{}={:.2f}s'.format(phase, seconds) for phase, seconds in self.timings.items())
+            )
             yield courselike
 
 
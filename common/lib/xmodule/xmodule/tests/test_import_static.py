@@ -1,8 +1,9 @@
 """
 Tests that check that we ignore the appropriate files when importing courses.
 """
+import hashlib
 import unittest
-from mock import Mock
+from mock import Mock, patch
 from xmodule.modulestore.xml_importer import import_static_content
 from opaque_keys.edx.locations import SlashSeparatedCourseKey
 from xmodule.tests import DATA_DIR
@@ -39,3 +40,45 @@ class IgnoredFilesTestCase(unittest.TestCase):
         self.assertNotIn(".DS_Store", name_val)
         self.assertIn("GREEN", name_val["example.txt"])
         self.assertIn("BLUE", name_val[".example.txt"])
+
+
+class StaticImportTestCase(unittest.TestCase):
+    "Tests for streaming and skipping static files during import"
+    def setUp(self):
+        super(StaticImportTestCase, self).setUp()
+        self.course_dir = DATA_DIR / "tilde"
+        self.course_id = SlashSeparatedCourseKey("edX", "tilde", "Fall_2012")
+        self.content_store = Mock()
+        self.content_store.generate_thumbnail.return_value = (None, "location")
+
+    @patch('xmodule.modulestore.xml_importer.STATIC_STREAM_THRESHOLD', 1)
+    @patch('xmodule.modulestore.xml_importer.STATIC_STREAM_CHUNK_SIZE', 2)
+    def test_large_files_streamed(self):
+        saved_data = {}
+        self.content_store.save.side_effect = lambda content: saved_data.setdefault(content.name, list(content.data))
+        import_static_content(self.course_dir, self.content_store, self.course_id)
+        chunks = saved_data["example.txt"]
+        self.assertGreater(len(chunks), 1)
+        self.assertIn("GREEN", "".join(chunks))
+        self.assertEqual(
+            self.content_store.generate_thumbnail.call_args[1]['tempfile_path'],
+            self.course_dir / "static" / "example.txt"
+        )
+
+    def test_unchanged_files_skipped(self):
+        with open(self.course_dir / "static" / "example.txt", 'rb') as f:
+            md5 = hashlib.md5(f.read()).hexdigest()
+        asset_key = self.course_id.make_asset_key('asset', 'example.txt')
+        asset = {
+            'asset_key': asset_key, 'md5': md5, 'import_path': 'example.txt',
+            'displayname': 'example.txt', 'contentType': 'text/plain', 'locked': False,
+        }
+        self.content_store.get_all_content_for_course.return_value = ([asset], 1)
+
+        remap = import_static_content(self.course_dir, self.content_store, self.course_id, skip_unchanged=True)
+        self.assertEqual(remap["example.txt"], asset_key)
+        self.assertFalse(self.content_store.save.called)
+
+        asset['md5'] = hashlib.md5('other contents').hexdigest()
+        import_static_content(self.course_dir, self.content_store, self.course_id, skip_unchanged=True)
+        self.assertTrue(self.content_store.save.called)
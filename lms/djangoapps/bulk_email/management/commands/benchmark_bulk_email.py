@@ -0,0 +1,98 @@
+"""
+Measure how fast bulk course email is rendered and sent to an SMTP server.
+"""
+import asyncore
+import smtpd
+import threading
+import time
+
+from django.core.mail import EmailMultiAlternatives
+from django.core.management.base import BaseCommand
+
+from bulk_email.models import CourseEmailTemplate
+from bulk_email.tasks import EmailConnectionPool
+
+
+class SinkServer(smtpd.SMTPServer):
+    """
+    SMTP server that accepts and discards every message.
+    """
+    def process_message(self, peer, mailfrom, rcpttos, data):
+        return None
+
+
+class Command(BaseCommand):
+    help = """Render and send bulk email messages, timing both.
+
+Usage: benchmark_bulk_email [MESSAGES] [CONNECTIONS] [HOST:PORT]
+
+Defaults to 1000 messages sent over 1 and then 4 connections, to an SMTP
+server on a local port which discards them.
+"""
+
+    def handle(self, *args, **options):
+        num_messages = int(args[0]) if len(args) > 0 else 1000
+        num_connections = int(args[1]) if len(args) > 1 else 4
+        if len(args) > 2:
+            host, port = args[2].split(':')
+            port = int(port)
+        else:
+            server = SinkServer(('localhost', 0), None)
+            host, port = server.socket.getsockname()
+            sink = threading.Thread(target=asyncore.loop, kwargs={'timeout': 0.1})
+            sink.daemon = True
+            sink.start()
+
+        template = CourseEmailTemplate.get_template()
+        html_message = u'<p>Dear %%USER_FULLNAME%%,</p>' + u'<p>This is an announcement for the course.</p>' * 50
+        context = {
+            'course_title': u'Benchmark Course',
+            'course_url': u'https://example.com/courses/benchmark',
+            'course_image_url': u'https://example.com/static/course.jpg',
+            'course_end_date': u'Dec 31, 2050',
+            'account_settings_url': u'https://example.com/account/settings',
+            'platform_name': u'edX',
+            'course_id': u'edX/Benchmark/2050',
+            'name': '',
+            'email': '',
+        }
+        recipients = [
+            {'name': u'Learner {}'.format(index), 'email': u'learner{}@example.com'.format(index), 'user_id': index}
+            for index in xrange(num_messages)
+        ]
+
+        start = time.time()
+        for recipient in recipients:
+            context.update(recipient)
+            template.render_htmltext(html_message, context)
+        self.stdout.write("render_htmltext: {:.1f} us/message\n".format((time.time() - start) * 1e6 / num_messages))
+
+        compiled = template.compile_htmltext(html_message, context)
+        start = time.time()
+        html_messages = []
+        for recipient in recipients:
+            context.update(recipient)
+            html_messages.append(compiled.render(context))
+        self.stdout.write("compiled render: {:.1f} us/message\n".format((time.time() - start) * 1e6 / num_messages))
+
+        for size in sorted(set([1, num_connections])):
+            pool = EmailConnectionPool(
+                size, backend='django.core.mail.backends.smtp.EmailBackend', host=host, port=port, use_tls=False
+            )
+            messages = []
+            for recipient, html_msg in zip(recipients, html_messages):
+                message = EmailMultiAlternatives(
+                    u'[Benchmark Course] Announcement', html_msg, 'benchmark@example.com', [recipient['email']]
+                )
+                message.attach_alternative(html_msg, 'text/html')
+                messages.append(message)
+
+            failures = 0
+            start = time.time()
+            for index in xrange(0, num_messages, size):
+                failures += sum(1 for error in pool.send(messages[index:index + size]) if error is not None)
+            elapsed = time.time() - start
+            pool.close()
+            self.stdout.write("{} connection(s): {:.1f} messages/s, {} failed\n".format(
+                size, num_messages / elapsed, failures
+            ))
@@ -12,12 +12,15 @@ file and check it in at the same time as your model changes. To do that,
 
 """
 import logging
+import re
+from string import Formatter
+
 from django.conf import settings
 from django.contrib.auth.models import User
 from django.db import models, transaction
 
 from openedx.core.lib.html_to_text import html_to_text
-from openedx.core.lib.mail_utils import wrap_message
+from openedx.core.lib.mail_utils import MAX_LINE_LENGTH, wrap_line
 
 from xmodule_django.models import CourseKeyField
 from util.keyword_substitution import substitute_keywords_with_data
@@ -150,6 +153,89 @@ class Optout(models.Model):
 # the location where the email message body is to be inserted.
 COURSE_EMAIL_MESSAGE_BODY_TAG = '{{message_body}}'
 
+# Keys of the template context whose values differ between the recipients of an email.
+RECIPIENT_CONTEXT_KEYS = frozenset(['name', 'email', 'user_id'])
+
+# Maximum number of wrapped long lines remembered by a compiled template.
+WRAPPED_LINE_CACHE_SIZE = 1000
+
+
+class CompiledCourseEmailTemplate(object):
+    """
+    A template and message body prepared for rendering to many recipients.
+
+    The template is split once into literal text, fields that only depend on
+    the context shared by all recipients (which are formatted right away), and
+    slots for the fields that depend on the recipient. Rendering for a
+    recipient then only formats the slots, and long lines that are the same for
+    every recipient are only wrapped once.
+
+    render() returns the same text as CourseEmailTemplate._render would.
+    """
+    def __init__(self, format_string, message_body, context, recipient_keys=RECIPIENT_CONTEXT_KEYS):
+        self.message_body = message_body
+        self.message_body_tag = COURSE_EMAIL_MESSAGE_BODY_TAG.format()
+        # list of (text, is_slot) pairs; the text of a slot is a format string for a single field
+        self.segments = []
+        self._wrapped_lines = {}
+
+        for literal_text, field_name, format_spec, conversion in Formatter().parse(format_string):
+            if literal_text:
+                self._append(literal_text, False)
+            if field_name is None:
+                continue
+            field = '{' + field_name
+            if conversion:
+                field += '!' + conversion
+            if format_spec:
+                field += ':' + format_spec
+            field += '}'
+            root_name = re.match(r'[^.\[]*', field_name).group()
+            if root_name in context and root_name not in recipient_keys and '{' not in format_spec:
+                self._append(field.format(**context), False)
+            else:
+                # formatted for each recipient, which also raises the same errors as formatting the whole template
+                self._append(field, True)
+
+    def _append(self, text, is_slot):
+        """
+        Add a segment, merging literal text into the previous literal segment.
+        """
+        if not is_slot and self.segments and not self.segments[-1][1]:
+            self.segments[-1] = (self.segments[-1][0] + text, False)
+        else:
+            self.segments.append((text, is_slot))
+
+    def _wrap(self, message):
+        """
+        Wrap the long lines of message, as wrap_message does.
+        """
+        lines = message.split('\n')
+        for index, line in enumerate(lines):
+            # wrap_line leaves lines that fit unchanged
+            if len(line) <= MAX_LINE_LENGTH:
+                continue
+            wrapped_line = self._wrapped_lines.get(line)
+            if wrapped_line is None:
+                wrapped_line = wrap_line(line)
+                if len(self._wrapped_lines) < WRAPPED_LINE_CACHE_SIZE:
+                    self._wrapped_lines[line] = wrapped_line
+            lines[index] = wrapped_line
+        return '\n'.join(lines)
+
+    def render(self, context):
+        """
+        Return the message for the recipient described by context.
+        """
+        message_body = self.message_body
+        # Substitute all %%-encoded keywords in the message body
+        if 'user_id' in context and 'course_id' in context:
+            message_body = substitute_keywords_with_data(message_body, context)
+
+        result = u''.join(text.format(**context) if is_slot else text for text, is_slot in self.segments)
+        result = result.replace(self.message_body_tag, message_body, 1)
+        return self._wrap(result)
+
 
 class CourseEmailTemplate(models.Model):
     """
@@ -194,21 +280,7 @@ class CourseEmailTemplate(models.Model):
         Such encoding is left to the email code, which will use the value
         of settings.DEFAULT_CHARSET to encode the message.
         """
-
-        # Substitute all %%-encoded keywords in the message body
-        if 'user_id' in context and 'course_id' in context:
-            message_body = substitute_keywords_with_data(message_body, context)
-
-        result = format_string.format(**context)
-
-        # Note that the body tag in the template will now have been
-        # "formatted", so we need to do the same to the tag being
-        # searched for.
-        message_body_tag = COURSE_EMAIL_MESSAGE_BODY_TAG.format()
-        result = result.replace(message_body_tag, message_body, 1)
-
-        # finally, return the result, after wrapping long lines and without converting to an encoded byte array.
-        return wrap_message(result)
+        return CompiledCourseEmailTemplate(format_string, message_body, context).render(context)
 
     def render_plaintext(self, plaintext, context):
         """
@@ -228,6 +300,22 @@ class CourseEmailTemplate(models.Model):
         """
         return CourseEmailTemplate._render(self.html_template, htmltext, context)
 
+    def compile_plaintext(self, plaintext, context):
+        """
+        Prepare the plain text message for rendering to many recipients.
+
+        `context` holds the values shared by all recipients; see CompiledCourseEmailTemplate.
+        """
+        return CompiledCourseEmailTemplate(self.plain_template, plaintext, context)
+
+    def compile_htmltext(self, htmltext, context):
+        """
+        Prepare the HTML text message for rendering to many recipients.
+
+        `context` holds the values shared by all recipients; see CompiledCourseEmailTemplate.
+        """
+        return CompiledCourseEmailTemplate(self.html_template, htmltext, context)
+
 
 class CourseAuthorization(models.Model):
     """
@@ -8,6 +8,7 @@ import json
 from time import sleep
 from collections import Counter
 import logging
+from multiprocessing.pool import ThreadPool
 
 import dogstats_wrapper as dog_stats_api
 from smtplib import SMTPServerDisconnected, SMTPDataError, SMTPConnectError, SMTPException
@@ -94,6 +95,62 @@ BULK_EMAIL_FAILURE_ERRORS = (
 )
 
 
+class EmailConnectionPool(object):
+    """
+    A fixed number of open email connections, over which messages are sent in parallel.
+
+    `connection_kwargs` are passed to django.core.mail.get_connection.
+    """
+    def __init__(self, size, **connection_kwargs):
+        self.connections = [get_connection(**connection_kwargs) for __ in range(size)]
+        self._threads = ThreadPool(size) if size > 1 else None
+        try:
+            for connection in self.connections:
+                connection.open()
+        except Exception:
+            self.close()
+            raise
+
+    @property
+    def size(self):
+        """
+        The number of messages that can be sent at once.
+        """
+        return len(self.connections)
+
+    def send(self, messages, stats_tags=None):
+        """
+        Send each message of `messages` (at most `size` of them) over its own connection.
+
+        Returns a list with, for each message, None if it was sent or else the
+        exception raised when sending it.
+        """
+        def send_message(index):
+            """
+            Send the index'th message over the index'th connection.
+            """
+            try:
+                with dog_stats_api.timer('course_email.single_send.time.overall', tags=stats_tags):
+                    self.connections[index].send_messages([messages[index]])
+            except Exception as exc:  # pylint: disable=broad-except
+                return exc
+            return None
+
+        if self._threads is None or len(messages) == 1:
+            return [send_message(index) for index in range(len(messages))]
+        return self._threads.map(send_message, range(len(messages)))
+
+    def close(self):
+        """
+        Close the connections and stop the sending threads.
+        """
+        if self._threads is not None:
+            self._threads.close()
+            self._threads.join()
+        for connection in self.connections:
+            connection.close()
+
+
 def _get_recipient_querysets(user_id, to_option, course_id):
     """
     Returns a list of query sets of email recipients corresponding to the
@@ -482,138 +539,164 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
 
     # use the CourseEmailTemplate that was associated with the CourseEmail
     course_email_template = course_email.get_template()
+
+    # Define context values to use in all course emails:
+    email_context = {'name': '', 'email': ''}
+    email_context.update(global_email_context)
+    email_context['course_id'] = course_email.course_id
+
+    # Throttle if we have gotten the rate limiter.  This is not very high-tech,
+    # but if a task has been retried for rate-limiting reasons, then we send
+    # one email at a time and sleep for a period of time between all emails
+    # within this task.  Choice of the value depends on the number of workers
+    # that might be sending email in parallel, and what the SES throttle rate is.
+    throttle = subtask_status.retried_nomax > 0
+    pool = None
     try:
-        connection = get_connection()
-        connection.open()
+        # Split the templates once into the parts shared by all recipients and the per-recipient slots
+        plaintext_template = course_email_template.compile_plaintext(course_email.text_message, email_context)
+        htmltext_template = course_email_template.compile_htmltext(course_email.html_message, email_context)
 
-        # Define context values to use in all course emails:
-        email_context = {'name': '', 'email': ''}
-        email_context.update(global_email_context)
+        pool = EmailConnectionPool(1 if throttle else settings.BULK_EMAIL_SMTP_CONNECTIONS)
 
         while to_list:
-            # Update context with user-specific values from the user at the end of the list.
-            # At the end of processing this user, they will be popped off of the to_list.
+            # Send to the recipients at the end of the list, one per connection.
+            # They are only removed from the to_list once they have been processed.
             # That way, the to_list will always contain the recipients remaining to be emailed.
             # This is convenient for retries, which will need to send to those who haven't
             # yet been emailed, but not send to those who have already been sent to.
-            recipient_num += 1
-            current_recipient = to_list[-1]
-            email = current_recipient['email']
-            email_context['email'] = email
-            email_context['name'] = current_recipient['profile__name']
-            email_context['user_id'] = current_recipient['pk']
-            email_context['course_id'] = course_email.course_id
-
-            # Construct message content using templates and context:
-            plaintext_msg = course_email_template.render_plaintext(course_email.text_message, email_context)
-            html_msg = course_email_template.render_htmltext(course_email.html_message, email_context)
-
-            # Create email:
-            email_msg = EmailMultiAlternatives(
-                subject,
-                plaintext_msg,
-                from_addr,
-                [email],
-                connection=connection
-            )
-            email_msg.attach_alternative(html_msg, 'text/html')
-
-            # Throttle if we have gotten the rate limiter.  This is not very high-tech,
-            # but if a task has been retried for rate-limiting reasons, then we sleep
-            # for a period of time between all emails within this task.  Choice of
-            # the value depends on the number of workers that might be sending email in
-            # parallel, and what the SES throttle rate is.
-            if subtask_status.retried_nomax > 0:
+            recipients = to_list[:-pool.size - 1:-1]
+            email_messages = []
+            for index, current_recipient in enumerate(recipients):
+                # Update context with user-specific values:
+                email_context['email'] = current_recipient['email']
+                email_context['name'] = current_recipient['profile__name']
+                email_context['user_id'] = current_recipient['pk']
+
+                # Construct message content using templates and context:
+                plaintext_msg = plaintext_template.render(email_context)
+                html_msg = htmltext_template.render(email_context)
+
+                # Create email:
+                email_msg = EmailMultiAlternatives(
+                    subject,
+                    plaintext_msg,
+                    from_addr,
+                    [current_recipient['email']],
+                    connection=pool.connections[index]
+                )
+                email_msg.attach_alternative(html_msg, 'text/html')
+                email_messages.append(email_msg)
+
+            if throttle:
                 sleep(settings.BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS)
 
-            try:
+            for index, current_recipient in enumerate(recipients):
                 log.info(
                     "BulkEmail ==> Task: %s, SubTask: %s, EmailId: %s, Recipient num: %s/%s, \
                     Recipient name: %s, Email address: %s",
                     parent_task_id,
                     task_id,
                     email_id,
-                    recipient_num,
+                    recipient_num + index + 1,
                     total_recipients,
                     current_recipient['profile__name'],
-                    email
+                    current_recipient['email']
                 )
-                with dog_stats_api.timer('course_email.single_send.time.overall', tags=[_statsd_tag(course_title)]):
-                    connection.send_messages([email_msg])
-
-            except SMTPDataError as exc:
-                # According to SMTP spec, we'll retry error codes in the 4xx range.  5xx range indicates hard failure.
-                total_recipients_failed += 1
-                log.error(
-                    "BulkEmail ==> Status: Failed(SMTPDataError), Task: %s, SubTask: %s, EmailId: %s, \
-                    Recipient num: %s/%s, Email address: %s",
-                    parent_task_id,
-                    task_id,
-                    email_id,
-                    recipient_num,
-                    total_recipients,
-                    email
-                )
-                if exc.smtp_code >= 400 and exc.smtp_code < 500:
-                    # This will cause the outer handler to catch the exception and retry the entire task.
-                    raise exc
-                else:
+            send_errors = pool.send(email_messages, stats_tags=[_statsd_tag(course_title)])
+
+            # Recipients whose email was not sent and must be retried, and the error to retry for
+            unsent_recipients = []
+            retry_exc = None
+            for current_recipient, exc in zip(recipients, send_errors):
+                recipient_num += 1
+                email = current_recipient['email']
+
+                if exc is None:
+                    total_recipients_successful += 1
+                    log.info(
+                        "BulkEmail ==> Status: Success, Task: %s, SubTask: %s, EmailId: %s, \
+                        Recipient num: %s/%s, Email address: %s,",
+                        parent_task_id,
+                        task_id,
+                        email_id,
+                        recipient_num,
+                        total_recipients,
+                        email
+                    )
+                    dog_stats_api.increment('course_email.sent', tags=[_statsd_tag(course_title)])
+                    if settings.BULK_EMAIL_LOG_SENT_EMAILS:
+                        log.info('Email with id %s sent to %s', email_id, email)
+                    else:
+                        log.debug('Email with id %s sent to %s', email_id, email)
+                    subtask_status.increment(succeeded=1)
+
+                elif isinstance(exc, SMTPDataError):
+                    # According to SMTP spec, we'll retry error codes in the 4xx range.
+                    # 5xx range indicates hard failure.
+                    total_recipients_failed += 1
+                    log.error(
+                        "BulkEmail ==> Status: Failed(SMTPDataError), Task: %s, SubTask: %s, EmailId: %s, \
+                        Recipient num: %s/%s, Email address: %s",
+                        parent_task_id,
+                        task_id,
+                        email_id,
+                        recipient_num,
+                        total_recipients,
+                        email
+                    )
+                    if exc.smtp_code >= 400 and exc.smtp_code < 500:
+                        # This will cause the outer handler to catch the exception and retry the entire task.
+                        unsent_recipients.append(current_recipient)
+                        retry_exc = exc if retry_exc is None else retry_exc
+                        continue
+                    else:
+                        # This will fall through and not retry the message.
+                        log.warning(
+                            'BulkEmail ==> Task: %s, SubTask: %s, EmailId: %s, Recipient num: %s/%s, \
+                            Email not delivered to %s due to error %s',
+                            parent_task_id,
+                            task_id,
+                            email_id,
+                            recipient_num,
+                            total_recipients,
+                            email,
+                            exc.smtp_error
+                        )
+                        dog_stats_api.increment('course_email.error', tags=[_statsd_tag(course_title)])
+                        subtask_status.increment(failed=1)
+
+                elif isinstance(exc, SINGLE_EMAIL_FAILURE_ERRORS):
                     # This will fall through and not retry the message.
-                    log.warning(
-                        'BulkEmail ==> Task: %s, SubTask: %s, EmailId: %s, Recipient num: %s/%s, \
-                        Email not delivered to %s due to error %s',
+                    total_recipients_failed += 1
+                    log.error(
+                        "BulkEmail ==> Status: Failed(SINGLE_EMAIL_FAILURE_ERRORS), Task: %s, SubTask: %s, \
+                        EmailId: %s, Recipient num: %s/%s, Email address: %s, Exception: %s",
                         parent_task_id,
                         task_id,
                         email_id,
                         recipient_num,
                         total_recipients,
                         email,
-                        exc.smtp_error
+                        exc
                     )
                     dog_stats_api.increment('course_email.error', tags=[_statsd_tag(course_title)])
                     subtask_status.increment(failed=1)
 
-            except SINGLE_EMAIL_FAILURE_ERRORS as exc:
-                # This will fall through and not retry the message.
-                total_recipients_failed += 1
-                log.error(
-                    "BulkEmail ==> Status: Failed(SINGLE_EMAIL_FAILURE_ERRORS), Task: %s, SubTask: %s, \
-                    EmailId: %s, Recipient num: %s/%s, Email address: %s, Exception: %s",
-                    parent_task_id,
-                    task_id,
-                    email_id,
-                    recipient_num,
-                    total_recipients,
-                    email,
-                    exc
-                )
-                dog_stats_api.increment('course_email.error', tags=[_statsd_tag(course_title)])
-                subtask_status.increment(failed=1)
-
-            else:
-                total_recipients_successful += 1
-                log.info(
-                    "BulkEmail ==> Status: Success, Task: %s, SubTask: %s, EmailId: %s, \
-                    Recipient num: %s/%s, Email address: %s,",
-                    parent_task_id,
-                    task_id,
-                    email_id,
-                    recipient_num,
-                    total_recipients,
-                    email
-                )
-                dog_stats_api.increment('course_email.sent', tags=[_statsd_tag(course_title)])
-                if settings.BULK_EMAIL_LOG_SENT_EMAILS:
-                    log.info('Email with id %s sent to %s', email_id, email)
                 else:
-                    log.debug('Email with id %s sent to %s', email_id, email)
-                subtask_status.increment(succeeded=1)
+                    # Handled by the outer handlers, after the other recipients have been accounted for.
+                    unsent_recipients.append(current_recipient)
+                    retry_exc = exc if retry_exc is None else retry_exc
+                    continue
+
+                recipients_info[email] += 1
 
-            # Pop the user that was emailed off the end of the list only once they have
-            # successfully been processed.  (That way, if there were a failure that
-            # needed to be retried, the user is still on the list.)
-            recipients_info[email] += 1
-            to_list.pop()
+            # Take the processed recipients off the end of the list, leaving those that
+            # need to be retried (in their original order).
+            del to_list[-len(recipients):]
+            to_list.extend(reversed(unsent_recipients))
+            if retry_exc is not None:
+                raise retry_exc
 
         log.info(
             "BulkEmail ==> Task: %s, SubTask: %s, EmailId: %s, Total Successful Recipients: %s/%s, \
@@ -692,7 +775,8 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
         return subtask_status, None
     finally:
         # Clean up at the end.
-        connection.close()
+        if pool is not None:
+            pool.close()
 
 
 def _get_current_task():
@@ -133,6 +133,29 @@ class CourseEmailTemplateTest(TestCase):
         context = self._get_sample_plain_context()
         template.render_plaintext("My new plain text.", context)
 
+    def test_compiled_matches_render(self):
+        template = CourseEmailTemplate.get_template()
+        context = self._get_sample_html_context()
+        compiled_plaintext = template.compile_plaintext("My new plain text.", context)
+        compiled_htmltext = template.compile_htmltext("My new html text.", context)
+        for email in ('first@test.com', 'second@test.com'):
+            context['email'] = email
+            self.assertEqual(
+                compiled_plaintext.render(context), template.render_plaintext("My new plain text.", context)
+            )
+            self.assertEqual(
+                compiled_htmltext.render(context), template.render_htmltext("My new html text.", context)
+            )
+            self.assertIn(email, compiled_htmltext.render(context))
+
+    def test_compiled_without_context(self):
+        template = CourseEmailTemplate.get_template()
+        context = self._get_sample_plain_context()
+        del context['email']
+        compiled = template.compile_plaintext("My new plain text.", context)
+        with self.assertRaises(KeyError):
+            compiled.render(context)
+
 
 class CourseAuthorizationTest(TestCase):
     """Test the CourseAuthorization model."""
@@ -27,6 +27,7 @@ from celery.states import SUCCESS, FAILURE
 
 from django.conf import settings
 from django.core.management import call_command
+from django.test.utils import override_settings
 
 from bulk_email.models import CourseEmail, Optout, SEND_TO_ALL
 
@@ -213,6 +214,43 @@ class TestBulkEmailInstructorTask(InstructorTaskCourseTestCase):
         self.assertEquals(parent_status.get('succeeded'), num_emails)
         self.assertEquals(parent_status.get('failed'), 0)
 
+    @override_settings(BULK_EMAIL_SMTP_CONNECTIONS=4)
+    def test_successful_parallel(self):
+        num_emails = settings.BULK_EMAIL_EMAILS_PER_TASK
+        # We also send email to the instructor:
+        self._create_students(num_emails - 1)
+        with patch('bulk_email.tasks.get_connection', autospec=True) as get_conn:
+            get_conn.return_value.send_messages.side_effect = cycle([None])
+            self._test_run_with_task(send_bulk_course_email, 'emailed', num_emails, num_emails)
+        self.assertEquals(get_conn.call_count, 4)
+        self.assertEquals(get_conn.return_value.send_messages.call_count, num_emails)
+
+    @override_settings(BULK_EMAIL_SMTP_CONNECTIONS=4)
+    def test_retry_parallel_after_limited_retry_error(self):
+        num_emails = settings.BULK_EMAIL_MAX_RETRIES
+        # We also send email to the instructor:
+        students = self._create_students(num_emails - 1)
+        failing_email = students[0].email
+        failures = []
+        sent_emails = []
+
+        def send_messages(messages):
+            """Disconnect the first time an email is sent to failing_email."""
+            email = messages[0].to[0]
+            if email == failing_email and not failures:
+                failures.append(email)
+                raise SMTPServerDisconnected(425, "Disconnecting")
+            sent_emails.append(email)
+
+        with patch('bulk_email.tasks.get_connection', autospec=True) as get_conn:
+            get_conn.return_value.send_messages.side_effect = send_messages
+            self._test_run_with_task(
+                send_bulk_course_email, 'emailed', num_emails, num_emails, retried_withmax=1
+            )
+        # Nobody was sent the email twice, even though their messages were sent alongside the failing one
+        self.assertEquals(len(sent_emails), num_emails)
+        self.assertEquals(len(set(sent_emails)), num_emails)
+
     def test_unactivated_user(self):
         # Select number of emails to fit into a single subtask.
         num_emails = settings.BULK_EMAIL_EMAILS_PER_TASK
@@ -11,6 +11,7 @@ from django.db import transaction, IntegrityError
 
 from courseware.field_overrides import FieldOverrideProvider  # pylint: disable=import-error
 from ccx import ACTIVE_CCX_KEY  # pylint: disable=import-error
+from request_cache.middleware import RequestCache  # pylint: disable=import-error
 
 from .models import CcxMembership, CcxFieldOverride
 
@@ -30,6 +31,13 @@ class CustomCoursesForEdxOverrideProvider(FieldOverrideProvider):
             return get_override_for_ccx(ccx, block, name, default)
         return default
 
+    def has_overrides(self, block):
+        """
+        Check the overrides of the current ccx, if there is one
+        """
+        ccx = get_current_ccx()
+        return bool(ccx and _get_overrides_index(ccx))
+
 
 class _CcxContext(threading.local):
     """
@@ -93,18 +101,50 @@ def _get_overrides_for_ccx(ccx, block):
     Returns a dictionary mapping field name to overriden value for any
     overrides set on this block for this CCX.
     """
+    index = _get_overrides_index(ccx)
+    location = CcxFieldOverride._meta.get_field('location').get_prep_value(block.location)
     overrides = {}
-    query = CcxFieldOverride.objects.filter(
-        ccx=ccx,
-        location=block.location
-    )
-    for override in query:
-        field = block.fields[override.field]
-        value = field.from_json(json.loads(override.value))
-        overrides[override.field] = value
+    for name, value in index.get(location, {}).iteritems():
+        field = block.fields[name]
+        overrides[name] = field.from_json(value)
     return overrides
 
 
+def _get_overrides_index(ccx):
+    """
+    Returns a dictionary mapping each location overridden in this CCX to a
+    dictionary of its overriden values (in their json form), keyed by field
+    name.  All the overrides of the CCX are loaded with a single query the
+    first time this is called in a request.
+    """
+    cache_key = _overrides_index_cache_key(ccx)
+    request_cache = RequestCache.get_request_cache()
+    index = request_cache.data.get(cache_key)
+    if index is None:
+        index = {}
+        query = CcxFieldOverride.objects.filter(ccx=ccx).values_list('location', 'field', 'value')
+        for location, field, value in query:
+            index.setdefault(location, {})[field] = json.loads(value)
+        request_cache.data[cache_key] = index
+    return index
+
+
+def _overrides_index_cache_key(ccx):
+    """
+    Returns the request cache key of the overrides index of `ccx`.
+    """
+    return u'ccx.overrides.{}'.format(ccx.id)
+
+
+def _clear_cached_overrides(ccx, block):
+    """
+    Forgets the cached overrides of `ccx`, after they have been changed.
+    """
+    RequestCache.get_request_cache().data.pop(_overrides_index_cache_key(ccx), None)
+    if hasattr(block, '_ccx_overrides'):
+        block._ccx_overrides.pop(ccx.id, None)  # pylint: disable=protected-access
+
+
 @transaction.commit_on_success
 def override_field_for_ccx(ccx, block, name, value):
     """
@@ -128,8 +168,7 @@ def override_field_for_ccx(ccx, block, name, value):
             field=name)
         override.value = value
     override.save()
-    if hasattr(block, '_ccx_overrides'):
-        del block._ccx_overrides[ccx.id]  # pylint: disable=protected-access
+    _clear_cached_overrides(ccx, block)
 
 
 def clear_override_for_ccx(ccx, block, name):
@@ -145,8 +184,7 @@ def clear_override_for_ccx(ccx, block, name):
             location=block.location,
             field=name).delete()
 
-        if hasattr(block, '_ccx_overrides'):
-            del block._ccx_overrides[ccx.id]  # pylint: disable=protected-access
+        _clear_cached_overrides(ccx, block)
 
     except CcxFieldOverride.DoesNotExist:
         pass
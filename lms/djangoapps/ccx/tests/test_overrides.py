@@ -5,6 +5,7 @@ import datetime
 import mock
 import pytz
 
+from celery.signals import task_postrun
 from courseware.field_overrides import OverrideFieldData  # pylint: disable=import-error
 from django.test.utils import override_settings
 from student.tests.factories import AdminFactory  # pylint: disable=import-error
@@ -12,7 +13,7 @@ from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
 from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
 
 from ..models import CustomCourseForEdX
-from ..overrides import override_field_for_ccx
+from ..overrides import override_field_for_ccx, _get_overrides_index
 
 from .test_views import flatten, iter_blocks
 
@@ -105,6 +106,31 @@ class TestFieldOverrides(ModuleStoreTestCase):
             dummy2 = chapter.start
             dummy3 = chapter.start
 
+    def test_overrides_loaded_in_one_query(self):
+        """
+        Test that the overrides of the whole course are loaded at once, when
+        accessing fields of many blocks.
+        """
+        ccx_start = datetime.datetime(2014, 12, 25, 00, 00, tzinfo=pytz.UTC)
+        chapter = self.course.get_children()[0]
+        override_field_for_ccx(self.ccx, chapter, 'start', ccx_start)
+        with self.assertNumQueries(1):
+            for block in iter_blocks(self.course):
+                dummy = block.start
+                dummy = block.due
+
+    def test_overrides_reloaded_in_each_task(self):
+        """
+        Test that the overrides loaded in a celery task are not reused by the
+        next task run by the same worker.
+        """
+        _get_overrides_index(self.ccx)
+        with self.assertNumQueries(0):
+            _get_overrides_index(self.ccx)
+        task_postrun.send(sender=None)
+        with self.assertNumQueries(1):
+            _get_overrides_index(self.ccx)
+
     def test_override_is_inherited(self):
         """
         Test that sequentials inherit overridden start date from chapter.
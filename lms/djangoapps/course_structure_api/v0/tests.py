@@ -350,6 +350,27 @@ class CourseStructureTests(CourseDetailMixin, CourseViewTestsMixin, ModuleStoreT
         self.maxDiff = None
         self.assertDictEqual(response.data, expected)
 
+    def test_get_not_modified(self):
+        """
+        The view should send the structure's version as an ETag, and a 304 to clients which already have it.
+        """
+        uri = reverse(self.view, kwargs={'course_id': self.course_id})
+        response = self.http_get(uri)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+        self.assertEqual(etag, '"{}"'.format(CourseStructure.objects.get(course_id=self.course.id).version))
+
+        response = self.http_get(uri, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+        # Once the structure changes, the client gets the new one.
+        ItemFactory.create(category="chapter", parent_location=self.course.location, display_name="Chapter 2")
+        update_course_structure(unicode(self.course.id))
+        response = self.http_get(uri, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
 
 class CourseGradingPolicyTests(CourseDetailMixin, CourseViewTestsMixin, ModuleStoreTestCase):
     view = 'course_structure_api:v0:grading_policy'
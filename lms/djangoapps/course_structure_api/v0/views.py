@@ -226,23 +226,35 @@ class CourseStructure(CourseViewMixin, RetrieveAPIView):
 
           * children: If the block has child blocks, a list of IDs of the child
             blocks.
+
+        The response carries an ETag header identifying the version of the
+        structure. Requests sending it back in an If-None-Match header get an
+        empty 304 response while the structure is unchanged.
     """
     serializer_class = serializers.CourseStructureSerializer
     course = None
+    structure_version = None
 
     def retrieve(self, request, *args, **kwargs):
         try:
-            return super(CourseStructure, self).retrieve(request, *args, **kwargs)
+            structure = self.get_object()
         except models.CourseStructure.DoesNotExist:
             # If we don't have data stored, generate it and return a 503.
             tasks.update_course_structure.delay(unicode(self.course.id))
             return Response(status=503, headers={'Retry-After': '120'})
 
+        etag = '"{}"'.format(self.structure_version)
+        if etag in [tag.strip() for tag in request.META.get('HTTP_IF_NONE_MATCH', '').split(',')]:
+            return Response(status=304, headers={'ETag': etag})
+
+        serializer = self.get_serializer(structure)
+        return Response(serializer.data, headers={'ETag': etag})
+
     def get_object(self, queryset=None):
         # Make sure the course exists and the user has permissions to view it.
         self.course = self.get_course_or_404()
-        course_structure = models.CourseStructure.objects.get(course_id=self.course.id)
-        return course_structure.structure
+        self.structure_version, structure = models.CourseStructure.get_structure(self.course.id)
+        return structure
 
 
 class CourseGradingPolicy(CourseViewMixin, ListAPIView):
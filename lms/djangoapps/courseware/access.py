@@ -32,6 +32,7 @@ from student.roles import (
     OrgStaffRole, OrgInstructorRole, CourseBetaTesterRole
 )
 from util.milestones_helpers import get_pre_requisite_courses_not_completed
+from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
 
 import dogstats_wrapper as dog_stats_api
 
@@ -61,8 +62,8 @@ def has_access(user, action, obj, course_key=None):
     user: a Django user object. May be anonymous. If none is passed,
                     anonymous is assumed
 
-    obj: The object to check access for.  A module, descriptor, location, or
-                    certain special strings (e.g. 'global')
+    obj: The object to check access for.  A module, descriptor, course overview,
+                    location, or certain special strings (e.g. 'global')
 
     action: A string specifying the action that the client is trying to perform.
 
@@ -82,7 +83,7 @@ def has_access(user, action, obj, course_key=None):
 
     # delegate the work to type-specific functions.
     # (start with more specific types, then get more general)
-    if isinstance(obj, CourseDescriptor):
+    if isinstance(obj, (CourseDescriptor, CourseOverview)):
         return _has_access_course_desc(user, action, obj)
 
     if isinstance(obj, ErrorDescriptor):
@@ -113,7 +114,7 @@ def has_access(user, action, obj, course_key=None):
 # ================ Implementation helpers ================================
 def _has_access_course_desc(user, action, course):
     """
-    Check if user has access to a course descriptor.
+    Check if user has access to a course descriptor (or a CourseOverview of it).
 
     Valid actions:
 
@@ -395,6 +396,15 @@ def _has_group_access(descriptor, user, course_key):
     return True
 
 
+def _is_detached(descriptor):
+    """
+    Returns whether the descriptor is a detached block, which isn't subject to start dates.
+    """
+    if isinstance(descriptor, CourseOverview):
+        return False
+    return 'detached' in descriptor._class_tags  # pylint: disable=protected-access
+
+
 def _has_access_descriptor(user, action, descriptor, course_key=None):
     """
     Check if user has access to this descriptor.
@@ -417,8 +427,9 @@ def _has_access_descriptor(user, action, descriptor, course_key=None):
         if descriptor.visible_to_staff_only and not _has_staff_access_to_descriptor(user, descriptor, course_key):
             return False
 
-        # enforce group access
-        if not _has_group_access(descriptor, user, course_key):
+        # enforce group access. CourseOverviews don't hold the course's user
+        # partitions; group access is never set at the course level anyway.
+        if not isinstance(descriptor, CourseOverview) and not _has_group_access(descriptor, user, course_key):
             # if group_access check failed, deny access unless the requestor is staff,
             # in which case immediately grant access.
             return _has_staff_access_to_descriptor(user, descriptor, course_key)
@@ -429,7 +440,7 @@ def _has_access_descriptor(user, action, descriptor, course_key=None):
             return True
 
         # Check start date
-        if 'detached' not in descriptor._class_tags and descriptor.start is not None:
+        if not _is_detached(descriptor) and descriptor.start is not None:
             now = datetime.now(UTC())
             effective_start = _adjust_start_date_for_beta_testers(
                 user,
@@ -108,6 +108,14 @@ class OverrideFieldData(FieldData):
     def delete(self, block, name):
         self.fallback.delete(block, name)
 
+    def has_overrides(self, block):
+        """
+        Checks whether any provider has overrides in the course of `block`,
+        so that looking up overrides of inherited fields in the ancestors of
+        `block` can be skipped when none of them can be overridden.
+        """
+        return any(provider.has_overrides(block) for provider in self.providers)
+
     def has(self, block, name):
         has = self.get_override(block, name)
         if has is NOTSET:
@@ -115,7 +123,7 @@ class OverrideFieldData(FieldData):
             # then we want to return False here, so the field_data uses the
             # override and not the original value for this block.
             inheritable = InheritanceMixin.fields.keys()
-            if name in inheritable:
+            if name in inheritable and self.has_overrides(block):
                 for ancestor in _lineage(block):
                     if self.get_override(ancestor, name) is not NOTSET:
                         return False
@@ -130,7 +138,7 @@ class OverrideFieldData(FieldData):
         # also handle inheritance.
         if not overrides_disabled():
             inheritable = InheritanceMixin.fields.keys()
-            if name in inheritable:
+            if name in inheritable and self.has_overrides(block):
                 for ancestor in _lineage(block):
                     value = self.get_override(ancestor, name)
                     if value is not NOTSET:
@@ -192,6 +200,15 @@ class FieldOverrideProvider(object):
         """
         raise NotImplementedError
 
+    def has_overrides(self, block):  # pylint: disable=unused-argument
+        """
+        Returns False if this provider is certain not to have an override for
+        any block of the course `block` belongs to.  Providers which can cheaply
+        tell should implement this, so that `OverrideFieldData` doesn't look
+        for inherited overrides among the ancestors of every block.
+        """
+        return True
+
 
 def _lineage(block):
     """
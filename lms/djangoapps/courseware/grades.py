@@ -6,6 +6,7 @@ import random
 import logging
 
 from contextlib import contextmanager
+from itertools import islice
 from django.conf import settings
 from django.db import transaction
 from django.test.client import RequestFactory
@@ -13,7 +14,7 @@ from django.test.client import RequestFactory
 import dogstats_wrapper as dog_stats_api
 
 from courseware import courses
-from courseware.model_data import FieldDataCache
+from courseware.model_data import FieldDataCache, chunks
 from student.models import anonymous_id_for_user
 from util.module_utils import yield_dynamic_descriptor_descendents
 from xmodule import graders
@@ -29,6 +30,109 @@ from opaque_keys.edx.keys import CourseKey
 
 log = logging.getLogger("edx.courseware")
 
+# Number of students whose scores are loaded together by iterate_grades_for
+BULK_GRADING_CHUNK_SIZE = 100
+
+
+class GradingPrefetch(object):
+    """
+    Scores for a chunk of students in a course, loaded up front so that
+    grading each of those students does not have to query StudentModule once
+    per section and once per problem.
+
+    Submissions API scores are fetched once per student and kept alongside.
+    Only the graded locations known to `course.grading_context` are
+    prefetched. Lookups for any other location fall back to the database, so
+    grading with a prefetch returns exactly what `grade()` returns without one.
+    """
+    def __init__(self, course, students):
+        self.course = course
+
+        grading_context = course.grading_context
+        self.locations = set(
+            descriptor.location
+            for sections in grading_context['graded_sections'].itervalues()
+            for section in sections
+            for descriptor in section['xmoduledescriptors']
+        )
+
+        # student id -> set of locations with a StudentModule in any course
+        self._seen_locations = defaultdict(set)
+        # student id -> {location: StudentModule} for this course only
+        self._student_modules = defaultdict(dict)
+        self._submissions_scores = {}
+        self._field_data_cache = (None, None, None)
+
+        student_ids = [student.id for student in students]
+        if student_ids and self.locations:
+            self._load_student_modules(student_ids)
+
+    def _load_student_modules(self, student_ids):
+        """
+        Load the score columns of every StudentModule for these students and
+        the graded locations of the course.
+        """
+        for locations in chunks(self.locations, 500):
+            student_modules = StudentModule.objects.filter(
+                student__in=student_ids,
+                module_state_key__in=locations,
+            ).only('student', 'module_state_key', 'course_id', 'grade', 'max_grade')
+            for student_module in student_modules:
+                location = student_module.module_state_key.map_into_course(self.course.id)
+                self._seen_locations[student_module.student_id].add(location)
+                if student_module.course_id == self.course.id:
+                    self._student_modules[student_module.student_id][location] = student_module
+
+    def submissions_scores(self, student):
+        """
+        Return the submissions API scores of `student`, as returned by
+        `sub_api.get_scores`.
+        """
+        if student.id not in self._submissions_scores:
+            self._submissions_scores[student.id] = sub_api.get_scores(
+                self.course.id.to_deprecated_string(), anonymous_id_for_user(student, self.course.id)
+            )
+        return self._submissions_scores[student.id]
+
+    def has_state(self, student, locations):
+        """
+        Return whether `student` has a StudentModule for any of `locations`.
+        """
+        locations = set(locations)
+        if not locations <= self.locations:
+            return StudentModule.objects.filter(student=student, module_state_key__in=locations).exists()
+        return not self._seen_locations[student.id].isdisjoint(locations)
+
+    def get_student_module(self, student, location):
+        """
+        Return the StudentModule of `student` for `location` in this course,
+        or None if there is none.
+        """
+        if location not in self.locations:
+            try:
+                return StudentModule.objects.get(student=student, course_id=self.course.id, module_state_key=location)
+            except StudentModule.DoesNotExist:
+                return None
+        return self._student_modules[student.id].get(location)
+
+    def field_data_cache(self, student, descriptor):
+        """
+        Return a FieldDataCache holding the state of `student` for `descriptor`.
+
+        A single cache, loaded with every descriptor in the grading context, is
+        shared by all the modules instantiated while grading a student.
+        """
+        student_id, field_data_cache, cached_locations = self._field_data_cache
+        if student_id != student.id:
+            all_descriptors = self.course.grading_context['all_descriptors']
+            field_data_cache = FieldDataCache(all_descriptors, self.course.id, student)
+            cached_locations = set(descriptor.location for descriptor in all_descriptors)
+            self._field_data_cache = (student.id, field_data_cache, cached_locations)
+        if descriptor.location not in cached_locations:
+            field_data_cache.add_descriptors_to_cache([descriptor])
+            cached_locations.add(descriptor.location)
+        return field_data_cache
+
 
 def answer_distributions(course_key):
     """
@@ -122,16 +226,16 @@ def answer_distributions(course_key):
 
 
 @transaction.commit_manually
-def grade(student, request, course, keep_raw_scores=False):
+def grade(student, request, course, keep_raw_scores=False, prefetch=None):
     """
     Wraps "_grade" with the manual_transaction context manager just in case
     there are unanticipated errors.
     """
     with manual_transaction():
-        return _grade(student, request, course, keep_raw_scores)
+        return _grade(student, request, course, keep_raw_scores, prefetch)
 
 
-def _grade(student, request, course, keep_raw_scores):
+def _grade(student, request, course, keep_raw_scores, prefetch=None):
     """
     Unwrapped version of "grade"
 
@@ -150,6 +254,10 @@ def _grade(student, request, course, keep_raw_scores):
     - keep_raw_scores : if True, then value for key 'raw_scores' contains scores
       for every graded module
 
+    If a GradingPrefetch containing the student is passed as `prefetch`, scores
+    are read from it instead of being queried one section and one problem at
+    a time.
+
     More information on the format is in the docstring for CourseGrader.
     """
     grading_context = course.grading_context
@@ -158,9 +266,12 @@ def _grade(student, request, course, keep_raw_scores):
     # Dict of item_ids -> (earned, possible) point tuples. This *only* grabs
     # scores that were registered with the submissions API, which for the moment
     # means only openassessment (edx-ora2)
-    submissions_scores = sub_api.get_scores(
-        course.id.to_deprecated_string(), anonymous_id_for_user(student, course.id)
-    )
+    if prefetch is not None:
+        submissions_scores = prefetch.submissions_scores(student)
+    else:
+        submissions_scores = sub_api.get_scores(
+            course.id.to_deprecated_string(), anonymous_id_for_user(student, course.id)
+        )
 
     totaled_scores = {}
     # This next complicated loop is just to collect the totaled_scores, which is
@@ -187,7 +298,11 @@ def _grade(student, request, course, keep_raw_scores):
                     for descriptor in section['xmoduledescriptors']
                 )
 
-            if not should_grade_section:
+            if not should_grade_section and prefetch is not None:
+                should_grade_section = prefetch.has_state(
+                    student, [descriptor.location for descriptor in section['xmoduledescriptors']]
+                )
+            elif not should_grade_section:
                 with manual_transaction():
                     should_grade_section = StudentModule.objects.filter(
                         student=student,
@@ -206,13 +321,17 @@ def _grade(student, request, course, keep_raw_scores):
                     # TODO: We need the request to pass into here. If we could forego that, our arguments
                     # would be simpler
                     with manual_transaction():
-                        field_data_cache = FieldDataCache([descriptor], course.id, student)
+                        if prefetch is not None:
+                            field_data_cache = prefetch.field_data_cache(student, descriptor)
+                        else:
+                            field_data_cache = FieldDataCache([descriptor], course.id, student)
                     return get_module_for_descriptor(student, request, descriptor, field_data_cache, course.id)
 
                 for module_descriptor in yield_dynamic_descriptor_descendents(section_descriptor, create_module):
 
                     (correct, total) = get_score(
-                        course.id, student, module_descriptor, create_module, scores_cache=submissions_scores
+                        course.id, student, module_descriptor, create_module, scores_cache=submissions_scores,
+                        prefetch=prefetch
                     )
                     if correct is None and total is None:
                         continue
@@ -391,7 +510,7 @@ def _progress_summary(student, request, course):
     return chapters
 
 
-def get_score(course_id, user, problem_descriptor, module_creator, scores_cache=None):
+def get_score(course_id, user, problem_descriptor, module_creator, scores_cache=None, prefetch=None):
     """
     Return the score for a user on a problem, as a tuple (correct, total).
     e.g. (5,7) if you got 5 out of 7 points.
@@ -405,6 +524,7 @@ def get_score(course_id, user, problem_descriptor, module_creator, scores_cache=
            Can return None if user doesn't have access, or if something else went wrong.
     scores_cache: A dict of location names to (earned, possible) point tuples.
            If an entry is found in this cache, it takes precedence.
+    prefetch: An optional GradingPrefetch holding the user's StudentModules.
     """
     scores_cache = scores_cache or {}
 
@@ -431,14 +551,17 @@ def get_score(course_id, user, problem_descriptor, module_creator, scores_cache=
         # These are not problems, and do not have a score
         return (None, None)
 
-    try:
-        student_module = StudentModule.objects.get(
-            student=user,
-            course_id=course_id,
-            module_state_key=problem_descriptor.location
-        )
-    except StudentModule.DoesNotExist:
-        student_module = None
+    if prefetch is not None:
+        student_module = prefetch.get_student_module(user, problem_descriptor.location)
+    else:
+        try:
+            student_module = StudentModule.objects.get(
+                student=user,
+                course_id=course_id,
+                module_state_key=problem_descriptor.location
+            )
+        except StudentModule.DoesNotExist:
+            student_module = None
 
     if student_module is not None and student_module.max_grade is not None:
         correct = student_module.grade if student_module.grade is not None else 0
@@ -501,6 +624,9 @@ def iterate_grades_for(course_or_id, students):
     - grade_breakdown : A breakdown of the major components that
         make up the final grade. (For display)
     - raw_scores: contains scores for every graded module
+
+    Students are graded in chunks of BULK_GRADING_CHUNK_SIZE; the scores of
+    each chunk are loaded with a handful of queries by a GradingPrefetch.
     """
     if isinstance(course_or_id, (basestring, CourseKey)):
         course = courses.get_course_by_id(course_or_id)
@@ -512,25 +638,32 @@ def iterate_grades_for(course_or_id, students):
     # grading that student.
     request = RequestFactory().get('/')
 
-    for student in students:
-        with dog_stats_api.timer('lms.grades.iterate_grades_for', tags=[u'action:{}'.format(course.id)]):
-            try:
-                request.user = student
-                # Grading calls problem rendering, which calls masquerading,
-                # which checks session vars -- thus the empty session dict below.
-                # It's not pretty, but untangling that is currently beyond the
-                # scope of this feature.
-                request.session = {}
-                gradeset = grade(student, request, course)
-                yield student, gradeset, ""
-            except Exception as exc:  # pylint: disable=broad-except
-                # Keep marching on even if this student couldn't be graded for
-                # some reason, but log it for future reference.
-                log.exception(
-                    'Cannot grade student %s (%s) in course %s because of exception: %s',
-                    student.username,
-                    student.id,
-                    course.id,
-                    exc.message
-                )
-                yield student, {}, exc.message
+    students = iter(students)
+    while True:
+        student_chunk = list(islice(students, BULK_GRADING_CHUNK_SIZE))
+        if not student_chunk:
+            break
+        prefetch = GradingPrefetch(course, student_chunk)
+
+        for student in student_chunk:
+            with dog_stats_api.timer('lms.grades.iterate_grades_for', tags=[u'action:{}'.format(course.id)]):
+                try:
+                    request.user = student
+                    # Grading calls problem rendering, which calls masquerading,
+                    # which checks session vars -- thus the empty session dict below.
+                    # It's not pretty, but untangling that is currently beyond the
+                    # scope of this feature.
+                    request.session = {}
+                    gradeset = grade(student, request, course, prefetch=prefetch)
+                    yield student, gradeset, ""
+                except Exception as exc:  # pylint: disable=broad-except
+                    # Keep marching on even if this student couldn't be graded for
+                    # some reason, but log it for future reference.
+                    log.exception(
+                        'Cannot grade student %s (%s) in course %s because of exception: %s',
+                        student.username,
+                        student.id,
+                        course.id,
+                        exc.message
+                    )
+                    yield student, {}, exc.message
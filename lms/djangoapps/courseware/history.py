@@ -0,0 +1,197 @@
+"""
+Writing and reading StudentModuleHistory rows.
+
+A history row is recorded every time a StudentModule of one of the
+StudentModuleHistory.HISTORY_SAVING_TYPES is saved. How it reaches the
+database depends on settings.STUDENT_MODULE_HISTORY_WRITES:
+
+* 'immediate': each row is inserted as it is recorded.
+* 'response': rows recorded while a request is handled are kept in a buffer,
+  and inserted all at once by StudentModuleHistoryMiddleware when the response
+  has been produced.
+* 'celery': rows are buffered the same way, then handed to a celery task which
+  inserts them.
+
+Rows recorded outside of a request (in celery tasks, management commands...)
+are always inserted as they are recorded.
+
+With settings.STUDENT_MODULE_HISTORY_DELTAS, a row only stores the top-level
+keys of the state which changed since the previous row of its StudentModule, as
+a JSON object {"set": {key: value, ...}, "unset": [key, ...]}, and its version
+is STATE_DELTA_VERSION. Use `resolve_states` to get back the full states.
+The previous state is the one the StudentModule was loaded with, so deltas are
+only exact as long as StudentModules are changed through save().
+"""
+import json
+import logging
+import threading
+
+from django.conf import settings
+
+
+log = logging.getLogger(__name__)
+
+# StudentModuleHistory.version of rows storing a delta rather than a state.
+STATE_DELTA_VERSION = 'delta'
+
+# The number of buffered rows which are inserted without waiting for the end
+# of the request.
+BUFFER_SIZE = 500
+
+
+class _HistoryBuffer(threading.local):
+    """
+    The rows recorded by the request handled by the current thread.
+    """
+    def __init__(self):
+        super(_HistoryBuffer, self).__init__()
+        self.active = False
+        self.entries = []
+
+
+_buffer = _HistoryBuffer()  # pylint: disable=invalid-name
+
+
+def _write_mode():
+    """
+    Return how history rows are written: 'immediate', 'response' or 'celery'.
+    """
+    return getattr(settings, 'STUDENT_MODULE_HISTORY_WRITES', 'immediate')
+
+
+def start_buffering():
+    """
+    Start buffering the rows recorded by the current thread, if the settings ask for it.
+    """
+    _buffer.entries = []
+    _buffer.active = _write_mode() != 'immediate'
+
+
+def stop_buffering():
+    """
+    Write the buffered rows, and write the rows recorded from now on immediately.
+    """
+    flush()
+    _buffer.active = False
+
+
+def is_buffering():
+    """
+    Return whether the rows recorded by the current thread are being buffered.
+    """
+    return _buffer.active
+
+
+def discard():
+    """
+    Drop the buffered rows, e.g. because the changes they record were rolled back.
+    """
+    if _buffer.entries:
+        log.info("Discarding %d StudentModuleHistory rows", len(_buffer.entries))
+    _buffer.entries = []
+    _buffer.active = False
+
+
+def record(entry):
+    """
+    Write the unsaved StudentModuleHistory `entry`, or buffer it to write later.
+    """
+    if not _buffer.active:
+        entry.save()
+        return
+    _buffer.entries.append(entry)
+    if len(_buffer.entries) >= getattr(settings, 'STUDENT_MODULE_HISTORY_BUFFER_SIZE', BUFFER_SIZE):
+        flush()
+
+
+def flush():
+    """
+    Write the buffered rows, in a single insert or through a celery task.
+    """
+    entries, _buffer.entries = _buffer.entries, []
+    if not entries:
+        return
+    if _write_mode() == 'celery':
+        from courseware.tasks import save_history_entries
+        save_history_entries.delay([
+            {
+                'student_module_id': entry.student_module_id,
+                'version': entry.version,
+                'created': entry.created.isoformat(),
+                'state': entry.state,
+                'grade': entry.grade,
+                'max_grade': entry.max_grade,
+            }
+            for entry in entries
+        ])
+    else:
+        entries[0].__class__.objects.bulk_create(entries)
+
+
+def make_state_delta(previous_state, state):
+    """
+    Return the delta from the JSON encoded `previous_state` to `state`, JSON
+    encoded, or None if either isn't an encoded dict or the delta isn't shorter
+    than `state`.
+    """
+    try:
+        previous = json.loads(previous_state)
+        current = json.loads(state)
+    except (TypeError, ValueError):
+        return None
+    if not isinstance(previous, dict) or not isinstance(current, dict):
+        return None
+    delta = json.dumps({
+        'set': dict(
+            (key, value) for key, value in current.iteritems()
+            if key not in previous or previous[key] != value
+        ),
+        'unset': [key for key in previous if key not in current],
+    })
+    return delta if len(delta) < len(state) else None
+
+
+def apply_state_delta(state, delta):
+    """
+    Apply the decoded `delta` to the decoded `state` (None if unknown), returning the new decoded state.
+    """
+    new_state = dict(state or {})
+    for key in delta.get('unset', []):
+        new_state.pop(key, None)
+    new_state.update(delta.get('set', {}))
+    return new_state
+
+
+def full_states(rows):
+    """
+    Yield the decoded full state, or None if it is unknown, of each of the
+    (version, state) pairs of the history rows of a StudentModule, given
+    oldest first.
+    """
+    state = None
+    for version, encoded in rows:
+        if version == STATE_DELTA_VERSION:
+            state = apply_state_delta(state, json.loads(encoded))
+        else:
+            try:
+                state = json.loads(encoded) if encoded else None
+            except ValueError:
+                state = None
+            if not isinstance(state, dict):
+                state = None
+        yield state
+
+
+def resolve_states(entries):
+    """
+    Replace the state of the StudentModuleHistory rows storing deltas, among
+    the `entries` of a StudentModule given oldest first, by the full state.
+
+    The entries are modified in memory, and must not be saved afterwards.
+    """
+    states = full_states([(entry.version, entry.state) for entry in entries])
+    for entry, state in zip(entries, states):
+        if entry.version == STATE_DELTA_VERSION:
+            entry.state = json.dumps(state)
+            entry.version = None
+    return entries
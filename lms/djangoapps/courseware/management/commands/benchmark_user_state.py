@@ -0,0 +1,60 @@
+"""
+Measure how long rendering a block takes for a student, and how many JSON
+documents are decoded while doing so.
+"""
+import json
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.test.client import RequestFactory
+from mock import patch
+from opaque_keys import InvalidKeyError
+from opaque_keys.edx.keys import UsageKey
+
+from courseware.model_data import FieldDataCache
+from courseware.module_render import get_module_for_descriptor
+from xmodule.modulestore.django import modulestore
+
+
+class Command(BaseCommand):
+    help = """Render a block (e.g. a sequential full of problems) as a student, timing it.
+
+Usage: benchmark_user_state USAGE_ID USERNAME [RENDERS]
+
+Renders the block RENDERS times (10 by default), each time loading the
+student's state as the courseware views do, and reports the average time and
+number of json.loads calls per render.
+"""
+
+    def handle(self, *args, **options):
+        if len(args) < 2:
+            raise CommandError("benchmark_user_state requires a usage id and a username")
+        try:
+            usage_key = UsageKey.from_string(args[0])
+        except InvalidKeyError:
+            raise CommandError("Invalid usage id: {}".format(args[0]))
+        try:
+            user = User.objects.get(username=args[1])
+        except User.DoesNotExist:
+            raise CommandError("No user named {}".format(args[1]))
+        renders = int(args[2]) if len(args) > 2 else 10
+
+        course_key = usage_key.course_key
+        request = RequestFactory().get('/')
+        request.user = user
+        request.session = {}
+
+        elapsed = 0
+        with patch('json.loads', wraps=json.loads) as mock_loads:
+            for __ in xrange(renders):
+                start = time.time()
+                descriptor = modulestore().get_item(usage_key, depth=None)
+                field_data_cache = FieldDataCache.cache_for_descriptor_descendents(course_key, user, descriptor)
+                module = get_module_for_descriptor(user, request, descriptor, field_data_cache, course_key)
+                module.render('student_view')
+                elapsed += time.time() - start
+
+        self.stdout.write("{}: {:.1f} ms/render, {:.1f} json.loads calls/render\n".format(
+            usage_key, elapsed * 1000 / renders, float(mock_loads.call_count) / renders
+        ))
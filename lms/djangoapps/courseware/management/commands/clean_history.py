@@ -6,6 +6,9 @@ need to clean out the unnecessary rows from the database.
 
 This command that does that.
 
+Rows storing only what changed since the previous row (see courseware.history)
+are rewritten against their new previous row when that one is deleted.
+
 """
 
 import datetime
@@ -18,6 +21,8 @@ import traceback
 from django.core.management.base import NoArgsCommand
 from django.db import connection
 
+from courseware.history import STATE_DELTA_VERSION, full_states, make_state_delta
+
 
 class Command(NoArgsCommand):
     """The actual clean_history command to clean history rows."""
@@ -188,6 +193,73 @@ class StudentModuleHistoryCleaner(object):
         history = cursor.fetchall()
         return history
 
+    def get_history_states_for_student_module(self, student_module_id):
+        """
+        Get the states stored in the history rows for a student module.
+
+        Return a list: [(id, version, state), ...], in the same order as
+        `get_history_for_student_modules`.
+
+        """
+        cursor = connection.cursor()
+        cursor.execute(
+            """
+            SELECT id, version, state FROM courseware_studentmodulehistory
+            WHERE student_module_id = %s
+            ORDER BY created, id
+            """,
+            [student_module_id]
+        )
+        return cursor.fetchall()
+
+    def update_history_state(self, history_id, version, state):
+        """
+        Replace the state stored in a history row.
+        """
+        cursor = connection.cursor()
+        cursor.execute(
+            """
+            UPDATE courseware_studentmodulehistory
+            SET version = %s, state = %s
+            WHERE id = %s
+            """,
+            [version, state, history_id]
+        )
+
+    def rebase_deltas(self, student_module_id, ids_to_delete):
+        """
+        Find the history rows storing deltas which directly follow rows being
+        deleted, and unless this is a dry run, rewrite them against the row
+        which will precede them, or as a full state if there is none.
+
+        Return the number of rows found.
+
+        """
+        rows = self.get_history_states_for_student_module(student_module_id)
+        if not any(version == STATE_DELTA_VERSION for _, version, _ in rows):
+            return 0
+
+        ids_to_delete = set(ids_to_delete)
+        states = full_states([(version, state) for _, version, state in rows])
+        to_rebase = 0
+        kept_state = None
+        follows_deleted = False
+        for (history_id, version, __), state in zip(rows, states):
+            if history_id in ids_to_delete:
+                follows_deleted = True
+                continue
+            if follows_deleted and version == STATE_DELTA_VERSION:
+                to_rebase += 1
+                if not self.dry_run:
+                    new_version, new_state = None, json.dumps(state)
+                    delta = make_state_delta(json.dumps(kept_state), new_state) if kept_state is not None else None
+                    if delta is not None:
+                        new_version, new_state = STATE_DELTA_VERSION, delta
+                    self.update_history_state(history_id, new_version, new_state)
+            kept_state = state
+            follows_deleted = False
+        return to_rebase
+
     def delete_history(self, ids_to_delete):
         """
         Delete history rows.
@@ -237,5 +309,14 @@ class StudentModuleHistoryCleaner(object):
             id=student_module_id,
         ))
 
-        if ids_to_delete and not self.dry_run:
-            self.delete_history(ids_to_delete)
+        if ids_to_delete:
+            to_rebase = self.rebase_deltas(student_module_id, ids_to_delete)
+            if to_rebase:
+                verb = "Would have rewritten" if self.dry_run else "Rewriting"
+                self.say("{verb} {count} delta rows for student_module_id {id}".format(
+                    verb=verb,
+                    count=to_rebase,
+                    id=student_module_id,
+                ))
+            if not self.dry_run:
+                self.delete_history(ids_to_delete)
@@ -11,6 +11,7 @@ from optparse import make_option
 from django.core.management.base import BaseCommand, CommandError
 from django.db import transaction
 
+from courseware.history import STATE_DELTA_VERSION
 from courseware.models import StudentModule, StudentModuleHistory
 
 LOG = logging.getLogger(__name__)
@@ -121,11 +122,14 @@ class Command(BaseCommand):
         state_dict = json.loads(module_state)
         self.num_hist_visited += 1
 
-        if 'input_state' not in state_dict:
+        # rows storing a delta keep the changed fields under 'set'
+        fields_dict = state_dict.get('set', {}) if module.version == STATE_DELTA_VERSION else state_dict
+
+        if 'input_state' not in fields_dict:
             pass
         elif save_changes:
             # make the change and persist
-            del state_dict['input_state']
+            del fields_dict['input_state']
             module.state = json.dumps(state_dict)
             module.save()
             self.num_hist_changed += 1
@@ -1,6 +1,7 @@
 """Test the clean_history management command."""
 
 import fnmatch
+import json
 from mock import Mock
 import os.path
 import textwrap
@@ -37,6 +38,8 @@ class SmhcDbMocked(SmhcSayStubbed):
     def __init__(self, **kwargs):
         super(SmhcDbMocked, self).__init__(**kwargs)
         self.get_history_for_student_modules = Mock()
+        self.get_history_states_for_student_module = Mock(return_value=[])
+        self.update_history_state = Mock()
         self.delete_history = Mock()
 
     def set_rows(self, rows):
@@ -207,6 +210,53 @@ class HistoryCleanerNoDbTest(HistoryCleanerTest):
         self.assert_said(smhc, "Deleting 4 rows of 8 for student_module_id 17")
         smhc.delete_history.assert_called_once_with([42, 23, 15, 8])
 
+    def test_rebasing_deltas(self):
+        smhc = SmhcDbMocked()
+        smhc.set_rows([
+            (4, "2013-07-13 16:30:00.000"),
+            (8, "2013-07-13 16:30:00.100"),
+            (15, "2013-07-13 16:30:00.200"),    # keep
+            (16, "2013-07-13 16:30:01.300"),    # keep
+        ])
+        smhc.get_history_states_for_student_module.return_value = [
+            (4, None, '{"attempts": 1, "student_answers": {"a": "1"}}'),
+            (8, 'delta', '{"set": {"attempts": 2}, "unset": []}'),
+            (15, 'delta', '{"set": {"done": true}, "unset": []}'),
+            (16, 'delta', '{"set": {}, "unset": ["done"]}'),
+        ]
+        smhc.clean_one_student_module(17)
+        self.assert_said(
+            smhc,
+            "Deleting 2 rows of 4 for student_module_id 17",
+            "Rewriting 1 delta rows for student_module_id 17",
+        )
+        # The first row kept has no previous row anymore, so it stores its full state.
+        history_id, version, state = smhc.update_history_state.call_args[0]
+        self.assertEqual((history_id, version), (15, None))
+        self.assertEqual(json.loads(state), {"attempts": 2, "done": True, "student_answers": {"a": "1"}})
+        smhc.delete_history.assert_called_once_with([8, 4])
+
+    def test_rebasing_deltas_dry_run(self):
+        smhc = SmhcDbMocked(dry_run=True)
+        smhc.set_rows([
+            (4, "2013-07-13 16:30:00.000"),    # keep
+            (8, "2013-07-13 16:30:01.100"),
+            (15, "2013-07-13 16:30:01.200"),    # keep
+        ])
+        smhc.get_history_states_for_student_module.return_value = [
+            (4, None, '{"attempts": 1}'),
+            (8, 'delta', '{"set": {"attempts": 2}, "unset": []}'),
+            (15, 'delta', '{"set": {"attempts": 3}, "unset": []}'),
+        ]
+        smhc.clean_one_student_module(17)
+        self.assert_said(
+            smhc,
+            "Would have deleted 1 rows of 3 for student_module_id 17",
+            "Would have rewritten 1 delta rows for student_module_id 17",
+        )
+        self.assertFalse(smhc.update_history_state.called)
+        self.assertFalse(smhc.delete_history.called)
+
 
 class HistoryCleanerWitDbTest(HistoryCleanerTest):
     """Tests of StudentModuleHistoryCleaner with a real db."""
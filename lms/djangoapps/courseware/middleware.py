@@ -5,6 +5,7 @@ Middleware for the courseware app
 from django.shortcuts import redirect
 from django.core.urlresolvers import reverse
 
+from courseware import history
 from courseware.courses import UserNotEnrolled
 
 
@@ -22,3 +23,21 @@ class RedirectUnenrolledMiddleware(object):
                     args=[course_key.to_deprecated_string()]
                 )
             )
+
+
+class StudentModuleHistoryMiddleware(object):
+    """
+    Buffer the StudentModuleHistory rows recorded while handling a request,
+    and write them once the response has been produced, as configured by
+    STUDENT_MODULE_HISTORY_WRITES. Must come before TransactionMiddleware, so
+    that rows are only written once the changes they record are committed.
+    """
+    def process_request(self, _request):
+        history.start_buffering()
+
+    def process_exception(self, _request, _exception):
+        history.discard()
+
+    def process_response(self, _request, response):
+        history.stop_buffering()
+        return response
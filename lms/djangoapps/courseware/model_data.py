@@ -2,6 +2,7 @@
 Classes to provide the LMS runtime data storage to XBlocks
 """
 
+import copy
 import json
 from collections import defaultdict
 from itertools import chain
@@ -34,6 +35,16 @@ class InvalidWriteError(Exception):
     """
 
 
+def _copy_value(value):
+    """
+    Return a copy of a decoded JSON value which can be changed without
+    changing the original.
+    """
+    if isinstance(value, (dict, list)):
+        return copy.deepcopy(value)
+    return value
+
+
 def chunks(items, chunk_size):
     """
     Yields the values from items in chunks of size chunk_size
@@ -62,6 +73,9 @@ class FieldDataCache(object):
         asides: The list of aside types to load, or None to prefetch no asides.
         '''
         self.cache = {}
+        # Decoded Scope.user_state of the StudentModules in the cache, as
+        # (state json, state dict) tuples keyed like the cache
+        self._user_states = {}
         self.select_for_update = select_for_update
 
         if asides is None:
@@ -323,6 +337,31 @@ class FieldDataCache(object):
         self.cache[cache_key] = field_object
         return field_object
 
+    def get_user_state(self, key, field_object):
+        """
+        Return the decoded state of the StudentModule `field_object`, found
+        in this cache for the Scope.user_state `key`.
+
+        The state is only decoded again if the StudentModule's state was
+        replaced since it was last decoded. The returned dict is shared by
+        all callers, so changes to it must be written back with
+        set_user_state, on a copy.
+        """
+        cache_key = self._cache_key_from_kvs_key(key)
+        decoded = self._user_states.get(cache_key)
+        if decoded is None or decoded[0] is not field_object.state:
+            decoded = (field_object.state, json.loads(field_object.state))
+            self._user_states[cache_key] = decoded
+        return decoded[1]
+
+    def set_user_state(self, key, field_object, state):
+        """
+        Encode `state` into the StudentModule `field_object`, found in this
+        cache for the Scope.user_state `key`. The object isn't saved.
+        """
+        field_object.state = json.dumps(state)
+        self._user_states[self._cache_key_from_kvs_key(key)] = (field_object.state, state)
+
 
 class DjangoKeyValueStore(KeyValueStore):
     """
@@ -361,7 +400,7 @@ class DjangoKeyValueStore(KeyValueStore):
             raise KeyError(key.field_name)
 
         if key.scope == Scope.user_state:
-            return json.loads(field_object.state)[key.field_name]
+            return _copy_value(self._field_data_cache.get_user_state(key, field_object)[key.field_name])
         else:
             return json.loads(field_object.value)
 
@@ -382,6 +421,8 @@ class DjangoKeyValueStore(KeyValueStore):
         saved_fields = []
         # field_objects maps a field_object to a list of associated fields
         field_objects = dict()
+        # user_states maps a StudentModule to the key of its first dirty field and its decoded state
+        user_states = dict()
         for field in kv_dict:
             # Check field for validity
             if field.scope not in self._allowed_scopes:
@@ -389,21 +430,26 @@ class DjangoKeyValueStore(KeyValueStore):
 
             # If the field is valid and isn't already in the dictionary, add it.
             field_object = self._field_data_cache.find_or_create(field)
-            if field_object not in field_objects.keys():
+            if field_object not in field_objects:
                 field_objects[field_object] = []
             # Update the list of associated fields
             field_objects[field_object].append(field)
 
-            # Special case when scope is for the user state, because this scope saves fields in a single row
+            # Special case when scope is for the user state, because this scope saves fields in a single row,
+            # which is encoded once all of its fields are set
             if field.scope == Scope.user_state:
-                state = json.loads(field_object.state)
-                state[field.field_name] = kv_dict[field]
-                field_object.state = json.dumps(state)
+                if field_object not in user_states:
+                    state = dict(self._field_data_cache.get_user_state(field, field_object))
+                    user_states[field_object] = (field, state)
+                user_states[field_object][1][field.field_name] = _copy_value(kv_dict[field])
             else:
                 # The remaining scopes save fields on different rows, so
                 # we don't have to worry about conflicts
                 field_object.value = json.dumps(kv_dict[field])
 
+        for field_object, (key, state) in user_states.iteritems():
+            self._field_data_cache.set_user_state(key, field_object, state)
+
         for field_object in field_objects:
             try:
                 # Save the field object that we made above
@@ -424,9 +470,9 @@ class DjangoKeyValueStore(KeyValueStore):
             raise KeyError(key.field_name)
 
         if key.scope == Scope.user_state:
-            state = json.loads(field_object.state)
+            state = dict(self._field_data_cache.get_user_state(key, field_object))
             del state[key.field_name]
-            field_object.state = json.dumps(state)
+            self._field_data_cache.set_user_state(key, field_object, state)
             field_object.save()
         else:
             field_object.delete()
@@ -440,6 +486,6 @@ class DjangoKeyValueStore(KeyValueStore):
             return False
 
         if key.scope == Scope.user_state:
-            return key.field_name in json.loads(field_object.state)
+            return key.field_name in self._field_data_cache.get_user_state(key, field_object)
         else:
             return True
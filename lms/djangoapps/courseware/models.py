@@ -15,11 +15,12 @@ ASSUMPTIONS: modules have unique IDs, even across different module_types
 from django.contrib.auth.models import User
 from django.conf import settings
 from django.db import models
-from django.db.models.signals import post_save
+from django.db.models.signals import post_init, post_save
 from django.dispatch import receiver
 
 from model_utils.models import TimeStampedModel
 
+from courseware import history
 from xmodule_django.models import CourseKeyField, LocationKeyField, BlockTypeKeyField  # pylint: disable=import-error
 
 
@@ -115,12 +116,20 @@ class StudentModuleHistory(models.Model):
     grade = models.FloatField(null=True, blank=True)
     max_grade = models.FloatField(null=True, blank=True)
 
+    @receiver(post_init, sender=StudentModule)
+    def remember_state(sender, instance, **kwargs):  # pylint: disable=no-self-argument, unused-argument
+        """
+        Remembers the state the instance was loaded with, which the next
+        history entry may be stored as a delta against.
+        """
+        instance._history_state = instance.state  # pylint: disable=protected-access
+
     @receiver(post_save, sender=StudentModule)
     def save_history(sender, instance, **kwargs):  # pylint: disable=no-self-argument, unused-argument
         """
-        Checks the instance's module_type, and creates & saves a
+        Checks the instance's module_type, and creates & records a
         StudentModuleHistory entry if the module_type is one that
-        we save.
+        we save. See courseware.history for how entries are written.
         """
         if instance.module_type in StudentModuleHistory.HISTORY_SAVING_TYPES:
             history_entry = StudentModuleHistory(student_module=instance,
@@ -129,7 +138,15 @@ class StudentModuleHistory(models.Model):
                                                  state=instance.state,
                                                  grade=instance.grade,
                                                  max_grade=instance.max_grade)
-            history_entry.save()
+            previous_state = getattr(instance, '_history_state', None)
+            if getattr(settings, 'STUDENT_MODULE_HISTORY_DELTAS', False) and previous_state is not None \
+                    and not kwargs.get('created'):
+                delta = history.make_state_delta(previous_state, instance.state)
+                if delta is not None:
+                    history_entry.state = delta
+                    history_entry.version = history.STATE_DELTA_VERSION
+            history.record(history_entry)
+        instance._history_state = instance.state  # pylint: disable=protected-access
 
 
 class XBlockFieldBase(models.Model):
@@ -4,6 +4,8 @@ by the individual due dates feature.
 """
 import json
 
+from request_cache.middleware import RequestCache
+
 from .field_overrides import FieldOverrideProvider
 from .models import StudentFieldOverride
 
@@ -17,6 +19,9 @@ class IndividualStudentOverrideProvider(FieldOverrideProvider):
     def get(self, block, name, default):
         return get_override_for_user(self.user, block, name, default)
 
+    def has_overrides(self, block):
+        return bool(_get_overrides_index(self.user, block.runtime.course_id))
+
 
 def get_override_for_user(user, block, name, default=None):
     """
@@ -38,19 +43,54 @@ def _get_overrides_for_user(user, block):
     Gets all of the individual student overrides for given user and block.
     Returns a dictionary of field override values keyed by field name.
     """
-    query = StudentFieldOverride.objects.filter(
-        course_id=block.runtime.course_id,
-        location=block.location,
-        student_id=user.id,
-    )
+    index = _get_overrides_index(user, block.runtime.course_id)
+    location = StudentFieldOverride._meta.get_field('location').get_prep_value(block.location)
     overrides = {}
-    for override in query:
-        field = block.fields[override.field]
-        value = field.from_json(json.loads(override.value))
-        overrides[override.field] = value
+    for name, value in index.get(location, {}).iteritems():
+        field = block.fields[name]
+        overrides[name] = field.from_json(value)
     return overrides
 
 
+def _get_overrides_index(user, course_id):
+    """
+    Gets all of the individual student overrides for given user in the given
+    course, with a single query the first time it is called in a request.
+    Returns a dictionary mapping each overridden location to a dictionary of
+    its field override values (in their json form), keyed by field name.
+    """
+    cache_key = _overrides_index_cache_key(user, course_id)
+    request_cache = RequestCache.get_request_cache()
+    index = request_cache.data.get(cache_key)
+    if index is None:
+        index = {}
+        query = StudentFieldOverride.objects.filter(
+            course_id=course_id,
+            student_id=user.id,
+        ).values_list('location', 'field', 'value')
+        for location, field, value in query:
+            index.setdefault(location, {})[field] = json.loads(value)
+        request_cache.data[cache_key] = index
+    return index
+
+
+def _overrides_index_cache_key(user, course_id):
+    """
+    Returns the request cache key of the overrides index of `user` in `course_id`.
+    """
+    return u'courseware.student_field_overrides.{}.{}'.format(user.id, course_id)
+
+
+def _clear_cached_overrides(user, block):
+    """
+    Forgets the cached overrides of `user` for the course of `block`, after
+    they have been changed.
+    """
+    RequestCache.get_request_cache().data.pop(_overrides_index_cache_key(user, block.runtime.course_id), None)
+    if hasattr(block, '_student_overrides'):
+        block._student_overrides.pop(user.id, None)  # pylint: disable=protected-access
+
+
 def override_field_for_user(user, block, name, value):
     """
     Overrides a field for the `user`.  `block` and `name` specify the block
@@ -65,6 +105,7 @@ def override_field_for_user(user, block, name, value):
     field = block.fields[name]
     override.value = json.dumps(field.to_json(value))
     override.save()
+    _clear_cached_overrides(user, block)
 
 
 def clear_override_for_user(user, block, name):
@@ -82,3 +123,4 @@ def clear_override_for_user(user, block, name):
             field=name).delete()
     except StudentFieldOverride.DoesNotExist:
         pass
+    _clear_cached_overrides(user, block)
@@ -0,0 +1,25 @@
+"""
+Asynchronous tasks for the courseware app.
+"""
+from celery import task
+from dateutil.parser import parse as dateutil_parse
+
+from courseware.models import StudentModuleHistory
+
+
+@task()  # pylint: disable=not-callable
+def save_history_entries(entries):
+    """
+    Insert StudentModuleHistory rows, given as dicts of their fields with `created` in ISO format.
+    """
+    StudentModuleHistory.objects.bulk_create([
+        StudentModuleHistory(
+            student_module_id=entry['student_module_id'],
+            version=entry['version'],
+            created=dateutil_parse(entry['created']),
+            state=entry['state'],
+            grade=entry['grade'],
+            max_grade=entry['max_grade'],
+        )
+        for entry in entries
+    ])
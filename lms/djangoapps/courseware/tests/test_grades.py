@@ -2,16 +2,18 @@
 Test grade calculation.
 """
 from django.http import Http404
+from django.test.client import RequestFactory
 from mock import patch
 from opaque_keys.edx.locations import SlashSeparatedCourseKey
 
 from courseware.grades import grade, iterate_grades_for
+from courseware.tests.factories import StudentModuleFactory
 from student.tests.factories import UserFactory
-from xmodule.modulestore.tests.factories import CourseFactory
+from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
 
 
-def _grade_with_errors(student, request, course, keep_raw_scores=False):
+def _grade_with_errors(student, request, course, keep_raw_scores=False, prefetch=None):
     """This fake grade method will throw exceptions for student3 and
     student4, but allow any other students to go through normal grading.
 
@@ -22,7 +24,7 @@ def _grade_with_errors(student, request, course, keep_raw_scores=False):
     if student.username in ['student3', 'student4']:
         raise Exception("I don't like {}".format(student.username))
 
-    return grade(student, request, course, keep_raw_scores=keep_raw_scores)
+    return grade(student, request, course, keep_raw_scores=keep_raw_scores, prefetch=prefetch)
 
 
 class TestGradeIteration(ModuleStoreTestCase):
@@ -104,6 +106,45 @@ class TestGradeIteration(ModuleStoreTestCase):
         self.assertTrue(all_gradesets[student2])
         self.assertTrue(all_gradesets[student5])
 
+    def test_prefetched_grades_match_grade(self):
+        """Grading students in bulk must give the same gradesets as grading
+        them one at a time with `grade`."""
+        chapter = ItemFactory.create(parent_location=self.course.location, category='chapter')
+        section = ItemFactory.create(
+            parent_location=chapter.location,
+            category='sequential',
+            metadata={'graded': True, 'format': 'Homework'}
+        )
+        problems = [
+            ItemFactory.create(parent_location=section.location, category='problem', display_name=name)
+            for name in ('problem1', 'problem2')
+        ]
+        self.course = self.store.get_course(self.course.id)
+
+        student1, student2, __, student4, __ = self.students
+        StudentModuleFactory.create(
+            student=student1, course_id=self.course.id, module_state_key=problems[0].location,
+            grade=1, max_grade=1
+        )
+        StudentModuleFactory.create(
+            student=student2, course_id=self.course.id, module_state_key=problems[1].location,
+            grade=0, max_grade=1
+        )
+        StudentModuleFactory.create(
+            student=student4, course_id=self.course.id, module_state_key=problems[0].location,
+            grade=2, max_grade=4
+        )
+
+        all_gradesets, all_errors = self._gradesets_and_errors_for(self.course.id, self.students)
+        self.assertEqual(len(all_errors), 0)
+
+        request = RequestFactory().get('/')
+        for student in self.students:
+            request.user = student
+            request.session = {}
+            self.assertEqual(all_gradesets[student], grade(student, request, self.course))
+        self.assertGreater(all_gradesets[student1]['percent'], 0.0)
+
     ################################# Helpers #################################
     def _gradesets_and_errors_for(self, course_id, students):
         """Simple helper method to iterate through student grades and give us
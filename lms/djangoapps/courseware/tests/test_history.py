@@ -0,0 +1,141 @@
+"""
+Tests for the writing and reading of StudentModuleHistory rows.
+"""
+import json
+
+from django.test import TestCase
+from django.test.client import RequestFactory
+from django.test.utils import override_settings
+
+from courseware import history
+from courseware.middleware import StudentModuleHistoryMiddleware
+from courseware.models import StudentModule, StudentModuleHistory
+from courseware.tests.factories import StudentModuleFactory, location
+
+
+STATE = {'attempts': 1, 'student_answers': {'input_1': 'a long answer ' * 10}, 'done': False}
+
+
+class HistoryTestCase(TestCase):
+    """
+    Base class for tests of the history rows of a problem's StudentModule.
+    """
+    def setUp(self):
+        super(HistoryTestCase, self).setUp()
+        self.module = StudentModuleFactory.create(module_state_key=location('problem'), state=json.dumps(STATE))
+        self.addCleanup(history.discard)
+
+    def save_state(self, **changes):
+        """
+        Reload the StudentModule, then save it with `changes` to its state.
+        """
+        module = StudentModule.objects.get(id=self.module.id)
+        state = json.loads(module.state)
+        state.update(changes)
+        module.state = json.dumps(state)
+        module.save()
+
+    def history_rows(self):
+        """
+        Return the history rows of the StudentModule, oldest first.
+        """
+        return list(StudentModuleHistory.objects.filter(student_module=self.module).order_by('created', 'id'))
+
+
+class TestHistoryWrites(HistoryTestCase):
+    """
+    Tests of how history rows are written.
+    """
+    @override_settings(STUDENT_MODULE_HISTORY_WRITES='immediate')
+    def test_immediate(self):
+        history.start_buffering()
+        self.save_state(attempts=2)
+        self.assertEqual(len(self.history_rows()), 2)
+
+    @override_settings(STUDENT_MODULE_HISTORY_WRITES='response')
+    def test_buffered_until_response(self):
+        request = RequestFactory().get('/')
+        middleware = StudentModuleHistoryMiddleware()
+        middleware.process_request(request)
+        self.save_state(attempts=2)
+        self.save_state(attempts=3)
+        self.assertEqual(len(self.history_rows()), 1)
+
+        with self.assertNumQueries(1):
+            middleware.process_response(request, None)
+        rows = self.history_rows()
+        self.assertEqual([json.loads(row.state)['attempts'] for row in rows], [1, 2, 3])
+
+        # Rows recorded after the response are written right away
+        self.save_state(attempts=4)
+        self.assertEqual(len(self.history_rows()), 4)
+
+    @override_settings(STUDENT_MODULE_HISTORY_WRITES='response')
+    def test_discarded_on_exception(self):
+        request = RequestFactory().get('/')
+        middleware = StudentModuleHistoryMiddleware()
+        middleware.process_request(request)
+        self.save_state(attempts=2)
+        middleware.process_exception(request, Exception())
+        middleware.process_response(request, None)
+        self.assertEqual(len(self.history_rows()), 1)
+
+    @override_settings(STUDENT_MODULE_HISTORY_WRITES='response', STUDENT_MODULE_HISTORY_BUFFER_SIZE=2)
+    def test_buffer_size(self):
+        history.start_buffering()
+        self.save_state(attempts=2)
+        self.assertEqual(len(self.history_rows()), 1)
+        self.save_state(attempts=3)
+        self.assertEqual(len(self.history_rows()), 3)
+
+    @override_settings(STUDENT_MODULE_HISTORY_WRITES='celery')
+    def test_celery(self):
+        history.start_buffering()
+        self.save_state(attempts=2)
+        self.assertEqual(len(self.history_rows()), 1)
+        history.stop_buffering()
+
+        rows = self.history_rows()
+        self.assertEqual(len(rows), 2)
+        module = StudentModule.objects.get(id=self.module.id)
+        self.assertEqual(rows[1].created, module.modified)
+        self.assertEqual(rows[1].state, module.state)
+
+
+@override_settings(STUDENT_MODULE_HISTORY_WRITES='immediate', STUDENT_MODULE_HISTORY_DELTAS=True)
+class TestHistoryDeltas(HistoryTestCase):
+    """
+    Tests of history rows storing deltas.
+    """
+    def test_deltas(self):
+        self.save_state(attempts=2)
+        self.save_state(done=True)
+        rows = self.history_rows()
+        self.assertEqual(
+            [row.version for row in rows],
+            [None, history.STATE_DELTA_VERSION, history.STATE_DELTA_VERSION]
+        )
+        self.assertEqual(json.loads(rows[2].state), {'set': {'done': True}, 'unset': []})
+
+        states = [json.loads(row.state) for row in history.resolve_states(rows)]
+        self.assertEqual(states[0], STATE)
+        self.assertEqual(states[1], dict(STATE, attempts=2))
+        self.assertEqual(states[2], dict(STATE, attempts=2, done=True))
+
+    def test_unset(self):
+        module = StudentModule.objects.get(id=self.module.id)
+        state = dict(STATE)
+        del state['done']
+        module.state = json.dumps(state)
+        module.save()
+        row = self.history_rows()[-1]
+        self.assertEqual(json.loads(row.state), {'set': {}, 'unset': ['done']})
+        self.assertEqual(json.loads(history.resolve_states(self.history_rows())[-1].state), state)
+
+    def test_full_state_when_shorter(self):
+        module = StudentModule.objects.get(id=self.module.id)
+        module.state = json.dumps({'attempts': 2})
+        module.save()
+        row = self.history_rows()[-1]
+        self.assertIsNone(row.version)
+        self.assertEqual(json.loads(row.state), {'attempts': 2})
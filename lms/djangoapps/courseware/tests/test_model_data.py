@@ -205,6 +205,29 @@ class TestStudentModuleStorage(OtherUserFailureTestMixin, TestCase):
                 self.kvs.set_many(kv_dict)
         self.assertEquals(len(exception_context.exception.saved_field_names), 0)
 
+    def test_state_decoded_once(self):
+        "Test that the StudentModule state is only decoded once for any number of reads"
+        with patch('courseware.model_data.json.loads', wraps=json.loads) as mock_loads:
+            self.assertEquals('a_value', self.kvs.get(user_state_key('a_field')))
+            self.assertEquals('b_value', self.kvs.get(user_state_key('b_field')))
+            self.assertTrue(self.kvs.has(user_state_key('a_field')))
+            self.kvs.set(user_state_key('a_field'), 'new_value')
+            self.assertEquals('new_value', self.kvs.get(user_state_key('a_field')))
+        self.assertEquals(mock_loads.call_count, 1)
+
+    def test_set_many_encodes_state_once(self):
+        "Test that setting many fields of a StudentModule encodes its state once"
+        with patch('courseware.model_data.json.dumps', wraps=json.dumps) as mock_dumps:
+            self.kvs.set_many(self.construct_kv_dict())
+        self.assertEquals(mock_dumps.call_count, 1)
+
+    def test_get_returns_copy(self):
+        "Test that changing a value read from the kvs doesn't change the stored state"
+        self.kvs.set(user_state_key('a_field'), {'answers': ['a', 'b']})
+        value = self.kvs.get(user_state_key('a_field'))
+        value['answers'].append('c')
+        self.assertEquals({'answers': ['a', 'b']}, self.kvs.get(user_state_key('a_field')))
+
 
 class TestMissingStudentModule(TestCase):
     def setUp(self):
@@ -30,7 +30,7 @@ from django.views.decorators.cache import cache_control
 from django.db import transaction
 from markupsafe import escape
 
-from courseware import grades
+from courseware import grades, history
 from courseware.access import has_access, _adjust_start_date_for_beta_testers
 from courseware.courses import (
     get_courses, get_course,
@@ -1127,16 +1127,22 @@ def submission_history(request, course_id, student_username, location):
             username=student_username,
             location=location
         )))
-    history_entries = StudentModuleHistory.objects.filter(
+    history_entries = list(StudentModuleHistory.objects.filter(
         student_module=student_module
-    ).order_by('-id')
+    ).order_by('created', 'id'))
 
     # If no history records exist, let's force a save to get history started.
+    # It is written right away so that it can be shown.
     if not history_entries:
+        history.stop_buffering()
         student_module.save()
-        history_entries = StudentModuleHistory.objects.filter(
+        history_entries = list(StudentModuleHistory.objects.filter(
             student_module=student_module
-        ).order_by('-id')
+        ).order_by('created', 'id'))
+
+    # Entries may only store what changed since the previous one
+    history_entries = history.resolve_states(history_entries)
+    history_entries.reverse()
 
     context = {
         'history_entries': history_entries,
@@ -0,0 +1,107 @@
+"""
+Tests of the connections made to the comments service, against a local stub server.
+"""
+from BaseHTTPServer import HTTPServer, BaseHTTPRequestHandler
+from logging import getLogger
+from SocketServer import ThreadingMixIn
+import threading
+from time import time
+import unittest
+
+from mock import patch
+import requests
+
+from lms.lib.comment_client.utils import perform_request
+
+log = getLogger(__name__)
+
+
+class StubCommentServiceHandler(BaseHTTPRequestHandler):
+    """
+    Answers every GET request with an empty JSON object and a cookie, keeping
+    the connection alive.
+    """
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        BaseHTTPRequestHandler.setup(self)
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """
+        Record the cookie sent with the request, and respond.
+        """
+        self.server.cookies.append(self.headers.getheader('Cookie'))
+        body = '{}'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Set-Cookie', 'sessionid=comments; Path=/')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+
+class StubCommentServiceServer(ThreadingMixIn, HTTPServer):
+    """
+    Stub comments service, counting the connections made to it.
+    """
+    daemon_threads = True
+
+    def __init__(self):
+        HTTPServer.__init__(self, ('127.0.0.1', 0), StubCommentServiceHandler)
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.cookies = []
+
+
+class CommentClientSessionTestCase(unittest.TestCase):
+    """
+    Make sure that requests to the comments service share kept alive
+    connections, but not cookies.
+    """
+    NUM_REQUESTS = 50
+
+    def setUp(self):
+        super(CommentClientSessionTestCase, self).setUp()
+        self.server = StubCommentServiceServer()
+        server_thread = threading.Thread(target=self.server.serve_forever)
+        server_thread.daemon = True
+        server_thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.url = 'http://127.0.0.1:{}/api/v1/threads'.format(self.server.server_address[1])
+
+        patcher = patch('lms.lib.comment_client.utils._SESSION', None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_connection_reused(self):
+        """
+        Compare the latency of requests made through perform_request with that
+        of requests each opening a new connection.
+        """
+        start = time()
+        for __ in xrange(self.NUM_REQUESTS):
+            perform_request('get', self.url)
+        pooled_duration = time() - start
+        self.assertEqual(self.server.connections, 1)
+
+        start = time()
+        for __ in xrange(self.NUM_REQUESTS):
+            requests.get(self.url, headers={'Connection': 'close'})
+        unpooled_duration = time() - start
+        self.assertEqual(self.server.connections, 1 + self.NUM_REQUESTS)
+
+        log.info(
+            u"%d comments service requests: %.3fs with pooled connections, %.3fs with a connection per request",
+            self.NUM_REQUESTS, pooled_duration, unpooled_duration
+        )
+
+    def test_cookies_not_kept(self):
+        perform_request('get', self.url)
+        perform_request('get', self.url)
+        self.assertEqual(self.server.cookies, [None, None])
@@ -20,7 +20,7 @@ import django_comment_client.utils as utils
 from courseware.tests.factories import InstructorFactory
 from openedx.core.djangoapps.course_groups.cohorts import set_course_cohort_settings
 from student.tests.factories import UserFactory, CourseEnrollmentFactory
-from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
+from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory, check_mongo_calls
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
 
 
@@ -925,6 +925,60 @@ class ContentGroupCategoryMapTestCase(CategoryMapTestMixin, ContentGroupTestCase
         )
 
 
+class DiscussionModuleCacheTestCase(ModuleStoreTestCase):
+    """
+    Tests caching of the discussion modules of a course across requests.
+    """
+    def setUp(self):
+        super(DiscussionModuleCacheTestCase, self).setUp()
+        self.course = CourseFactory.create(start=datetime.datetime(2012, 2, 3, tzinfo=UTC))
+        self.discussion = ItemFactory.create(
+            parent_location=self.course.location,
+            category="discussion",
+            discussion_id="discussion1",
+            discussion_category="Chapter",
+            discussion_target="Discussion",
+        )
+        self.student = UserFactory.create()
+
+    def get_accessible_ids(self, user):
+        """
+        Return the ids of the discussion modules accessible to user.
+        """
+        return [module.discussion_id for module in utils.get_accessible_discussion_modules(self.course, user)]
+
+    def test_cached_modules_read_without_modulestore(self):
+        self.assertEqual(self.get_accessible_ids(self.student), ["discussion1"])
+        with check_mongo_calls(0):
+            self.assertEqual(self.get_accessible_ids(self.student), ["discussion1"])
+
+    def test_invalidated_on_publish(self):
+        self.assertEqual(self.get_accessible_ids(self.student), ["discussion1"])
+        ItemFactory.create(
+            parent_location=self.course.location,
+            category="discussion",
+            discussion_id="discussion2",
+            discussion_category="Chapter",
+            discussion_target="Other Discussion",
+        )
+        self.assertItemsEqual(self.get_accessible_ids(self.student), ["discussion1", "discussion2"])
+
+    def test_restricted_modules_checked_per_user(self):
+        ItemFactory.create(
+            parent_location=self.course.location,
+            category="discussion",
+            discussion_id="staff_discussion",
+            discussion_category="Chapter",
+            discussion_target="Staff Discussion",
+            visible_to_staff_only=True,
+        )
+        self.assertEqual(self.get_accessible_ids(self.student), ["discussion1"])
+        self.assertItemsEqual(
+            self.get_accessible_ids(InstructorFactory(course_key=self.course.id)),
+            ["discussion1", "staff_discussion"]
+        )
+
+
 class JsonResponseTestCase(TestCase, UnicodeTestMixin):
     def _test_unicode_data(self, text):
         response = utils.JsonResponse(text)
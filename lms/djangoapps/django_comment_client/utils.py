@@ -1,10 +1,11 @@
-from collections import defaultdict
+from collections import defaultdict, namedtuple
 from datetime import datetime
 import json
 import logging
 
 import pytz
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.core.urlresolvers import reverse
 from django.db import connection
 from django.http import HttpResponse
@@ -13,8 +14,9 @@ import pystache_custom as pystache
 from opaque_keys.edx.locations import i4xEncoder
 from opaque_keys.edx.keys import CourseKey
 from xmodule.modulestore.django import modulestore
+from xmodule.split_test_module import get_split_user_partitions
 
-from django_comment_common.models import Role, FORUM_ROLE_STUDENT
+from django_comment_common.models import Role, FORUM_ROLE_STUDENT, discussion_modules_cache_key
 from django_comment_client.permissions import check_permissions_by_view, cached_has_permission
 from edxmako import lookup_template
 
@@ -61,12 +63,44 @@ def has_forum_access(uname, course_id, rolename):
     return role.users.filter(username=uname).exists()
 
 
-def get_accessible_discussion_modules(course, user, include_all=False):  # pylint: disable=invalid-name
+# Summary of a discussion module, with the fields needed to build the
+# discussion maps. is_restricted is set if has_access may deny some users
+# access to the module once it has started.
+DiscussionModuleSummary = namedtuple(
+    'DiscussionModuleSummary',
+    ['location', 'discussion_id', 'discussion_category', 'discussion_target', 'sort_key', 'start', 'is_restricted']
+)
+
+# Publishing the course invalidates the cached summaries; the timeout bounds
+# how long they can be stale if the LMS and Studio don't share a cache.
+DISCUSSION_MODULES_CACHE_TIMEOUT = 60 * 60
+
+
+def _is_access_restricted(module):
     """
-    Return a list of all valid discussion modules in this course that
-    are accessible to the given user.
+    Return whether has_access may deny some users 'load' access to the module
+    after its start date, i.e. it is staff only or limited to some groups.
+    """
+    if module.visible_to_staff_only:
+        return True
+    user_partitions = module.user_partitions
+    if len(user_partitions) == len(get_split_user_partitions(user_partitions)):
+        return False
+    return any(group_ids is not None for group_ids in module.merged_group_access.values())
+
+
+def get_discussion_module_summaries(course_key):
     """
-    all_modules = modulestore().get_items(course.id, qualifiers={'category': 'discussion'})
+    Return a list of DiscussionModuleSummary for all valid discussion modules
+    in the course, regardless of access.
+
+    The list is computed from the modulestore once and cached until the
+    course is next published.
+    """
+    cache_key = discussion_modules_cache_key(course_key)
+    summaries = cache.get(cache_key)
+    if summaries is not None:
+        return summaries
 
     def has_required_keys(module):
         for key in ('discussion_id', 'discussion_category', 'discussion_target'):
@@ -75,10 +109,45 @@ def get_accessible_discussion_modules(course, user, include_all=False):  # pylin
                 return False
         return True
 
-    return [
-        module for module in all_modules
-        if has_required_keys(module) and (include_all or has_access(user, 'load', module, course.id))
+    summaries = [
+        DiscussionModuleSummary(
+            location=module.location,
+            discussion_id=module.discussion_id,
+            discussion_category=module.discussion_category,
+            discussion_target=module.discussion_target,
+            sort_key=module.sort_key,
+            start=module.start,
+            is_restricted=_is_access_restricted(module),
+        )
+        for module in modulestore().get_items(course_key, qualifiers={'category': 'discussion'})
+        if has_required_keys(module)
     ]
+    cache.set(cache_key, summaries, DISCUSSION_MODULES_CACHE_TIMEOUT)
+    return summaries
+
+
+def get_accessible_discussion_modules(course, user, include_all=False):  # pylint: disable=invalid-name
+    """
+    Return a list of DiscussionModuleSummary for all valid discussion modules
+    in this course that are accessible to the given user.
+
+    Modules that are unrestricted and have started are visible to everyone;
+    only the others are loaded from the modulestore to check access.
+    """
+    summaries = get_discussion_module_summaries(course.id)
+    if include_all:
+        return summaries
+
+    now = datetime.now(UTC())
+    store = modulestore()
+    accessible = []
+    with store.bulk_operations(course.id):
+        for summary in summaries:
+            if not summary.is_restricted and (summary.start is None or summary.start < now):
+                accessible.append(summary)
+            elif has_access(user, 'load', store.get_item(summary.location), course.id):
+                accessible.append(summary)
+    return accessible
 
 
 def get_discussion_id_map(course, user):
@@ -12,13 +12,13 @@ file and check it in at the same time as your model changes. To do that,
 ASSUMPTIONS: modules have unique IDs, even across different module_types
 
 """
-from cStringIO import StringIO
 from gzip import GzipFile
 from uuid import uuid4
 import csv
 import json
 import hashlib
 import os.path
+import tempfile
 import urllib
 
 from boto.s3.connection import S3Connection
@@ -197,6 +197,10 @@ class ReportStore(object):
     can simply be appended to for the sake of memory efficiency, rather than
     passing in the whole dataset. Doing that for now just because it's simpler.
     """
+    # Pieces of reports that are still being assembled are stored under this
+    # directory of a course's reports, and are not returned by `links_for()`.
+    PARTS_DIRECTORY = 'parts'
+
     @classmethod
     def from_config(cls):
         """
@@ -218,6 +222,28 @@ class ReportStore(object):
         for row in rows:
             yield [unicode(item).encode('utf-8') for item in row]
 
+    def _get_utf8_decoded_rows(self, csvreader):
+        """
+        Given a `csvreader` over a utf-8 encoded CSV file, yield its rows
+        as lists of unicode strings.
+        """
+        for row in csvreader:
+            yield [item.decode('utf-8') for item in row]
+
+    def _read_rows_from_file(self, csv_file, raw_file=None):
+        """
+        Yield the rows of the utf-8 encoded CSV file object `csv_file` as lists
+        of unicode strings, reading it as they are consumed, and close it (and
+        `raw_file`, the file it decodes, if any) once they all have been.
+        """
+        try:
+            for row in self._get_utf8_decoded_rows(csv.reader(csv_file)):
+                yield row
+        finally:
+            csv_file.close()
+            if raw_file is not None:
+                raw_file.close()
+
 
 class S3ReportStore(ReportStore):
     """
@@ -314,13 +340,47 @@ class S3ReportStore(ReportStore):
         Even though we store it in gzip format, browsers will transparently
         download and decompress it. Filenames should end in `.csv`, not `.gz`.
         """
-        output_buffer = StringIO()
-        gzip_file = GzipFile(fileobj=output_buffer, mode="wb")
-        csvwriter = csv.writer(gzip_file)
-        csvwriter.writerows(self._get_utf8_encoded_rows(rows))
-        gzip_file.close()
+        # The rows may be generated as they are written (e.g. when merging the
+        # parts of a report), so write them to a temporary file rather than
+        # holding the whole report in memory.
+        with tempfile.TemporaryFile() as output_file:
+            gzip_file = GzipFile(fileobj=output_file, mode="wb")
+            csvwriter = csv.writer(gzip_file)
+            csvwriter.writerows(self._get_utf8_encoded_rows(rows))
+            gzip_file.close()
+
+            key = self.key_for(course_id, filename)
+            key.content_encoding = "gzip"
+            key.content_type = "text/csv"
+            key.set_contents_from_file(
+                output_file,
+                headers={
+                    "Content-Encoding": "gzip",
+                    "Content-Type": "text/csv",
+                },
+                rewind=True,
+            )
+
+    def read_rows(self, course_id, filename):
+        """
+        Return an iterator over the rows of the CSV file `filename` stored for
+        `course_id` by `store_rows()`. Raises IOError if there is no such file.
+        """
+        key = self.key_for(course_id, filename)
+        if not key.exists():
+            raise IOError(u"No report {} for course {}".format(filename, course_id))
+
+        # Download the file to disk, and decompress it as the rows are read.
+        input_file = tempfile.TemporaryFile()
+        key.get_contents_to_file(input_file)
+        input_file.seek(0)
+        return self._read_rows_from_file(GzipFile(fileobj=input_file, mode="rb"), input_file)
 
-        self.store(course_id, filename, output_buffer)
+    def delete(self, course_id, filename):
+        """
+        Delete the file `filename` stored for `course_id`.
+        """
+        self.key_for(course_id, filename).delete()
 
     def links_for(self, course_id):
         """
@@ -331,6 +391,8 @@ class S3ReportStore(ReportStore):
         return [
             (key.key.split("/")[-1], key.generate_url(expires_in=300))
             for key in sorted(self.bucket.list(prefix=course_dir.key), reverse=True, key=lambda k: k.last_modified)
+            # Skip report parts, which are kept in a subdirectory
+            if "/" not in key.key[len(course_dir.key):]
         ]
 
 
@@ -381,7 +443,7 @@ class LocalFSReportStore(ReportStore):
         full_path = self.path_to(course_id, filename)
         directory = os.path.dirname(full_path)
         if not os.path.exists(directory):
-            os.mkdir(directory)
+            os.makedirs(directory)
 
         with open(full_path, "wb") as f:
             f.write(buff.getvalue())
@@ -391,11 +453,27 @@ class LocalFSReportStore(ReportStore):
         Given a course_id, filename, and rows (each row is an iterable of strings),
         write this data out.
         """
-        output_buffer = StringIO()
-        csvwriter = csv.writer(output_buffer)
-        csvwriter.writerows(self._get_utf8_encoded_rows(rows))
+        full_path = self.path_to(course_id, filename)
+        directory = os.path.dirname(full_path)
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+
+        with open(full_path, "wb") as f:
+            csvwriter = csv.writer(f)
+            csvwriter.writerows(self._get_utf8_encoded_rows(rows))
+
+    def read_rows(self, course_id, filename):
+        """
+        Return an iterator over the rows of the CSV file `filename` stored for
+        `course_id` by `store_rows()`. Raises IOError if there is no such file.
+        """
+        return self._read_rows_from_file(open(self.path_to(course_id, filename), "rb"))
 
-        self.store(course_id, filename, output_buffer)
+    def delete(self, course_id, filename):
+        """
+        Delete the file `filename` stored for `course_id`.
+        """
+        os.remove(self.path_to(course_id, filename))
 
     def links_for(self, course_id):
         """
@@ -408,7 +486,12 @@ class LocalFSReportStore(ReportStore):
         course_dir = self.path_to(course_id, '')
         if not os.path.exists(course_dir):
             return []
-        files = [(filename, os.path.join(course_dir, filename)) for filename in os.listdir(course_dir)]
+        files = [
+            (filename, os.path.join(course_dir, filename))
+            for filename in os.listdir(course_dir)
+            # Skip the subdirectory holding report parts
+            if os.path.isfile(os.path.join(course_dir, filename))
+        ]
         files.sort(key=lambda (filename, full_path): os.path.getmtime(full_path), reverse=True)
 
         return [
@@ -12,11 +12,15 @@ objects, and adds additional filter clauses.
 A task also passes through "xmodule_instance_args", that are used to provide
 information to our code that instantiates xmodule instances.
 
+Tasks which reset or delete state instead define a "bulk update function", which
+takes a list of StudentModule objects and updates them all at once.
+
 The task definition then calls the traversal function, passing in the three arguments
 above, along with the id value for an InstructorTask object.  The InstructorTask
 object contains a 'task_input' row which is a JSON-encoded dict containing
 a problem URL and optionally a student.  These are used to set up the initial value
-of the query for traversing StudentModule objects.
+of the query for traversing StudentModule objects.  When many StudentModule objects
+match, the traversal is split across "part" subtasks, each updating a chunk of them.
 
 """
 import logging
@@ -31,10 +35,12 @@ from instructor_task.tasks_helper import (
     run_main_task,
     BaseInstructorTask,
     perform_module_state_update,
+    perform_module_state_update_part,
     rescore_problem_module_state,
-    reset_attempts_module_state,
-    delete_problem_module_state,
+    reset_attempts_module_states,
+    delete_problem_module_states,
     upload_grades_csv,
+    upload_grades_csv_part,
     upload_students_csv,
     cohort_students_and_upload
 )
@@ -70,10 +76,23 @@ def rescore_problem(entry_id, xmodule_instance_args):
         """Filter that matches problems which are marked as being done"""
         return modules_to_update.filter(state__contains='"done": true')
 
-    visit_fcn = partial(perform_module_state_update, update_fcn, filter_fcn)
+    visit_fcn = partial(
+        perform_module_state_update, update_fcn, filter_fcn,
+        part_task=rescore_problem_part, xmodule_instance_args=xmodule_instance_args
+    )
     return run_main_task(entry_id, visit_fcn, action_name)
 
 
+@task  # pylint: disable=not-callable
+def rescore_problem_part(entry_id, module_ids, xmodule_instance_args, subtask_status_dict):
+    """
+    Rescores a chunk of the submissions to a problem for the InstructorTask
+    `entry_id`, queued by `rescore_problem` when there are many of them.
+    """
+    update_fcn = partial(rescore_problem_module_state, xmodule_instance_args)
+    return perform_module_state_update_part(update_fcn, None, entry_id, module_ids, subtask_status_dict)
+
+
 @task(base=BaseInstructorTask)  # pylint: disable=not-callable
 def reset_problem_attempts(entry_id, xmodule_instance_args):
     """Resets problem attempts to zero for a particular problem for all students in a course.
@@ -91,11 +110,24 @@ def reset_problem_attempts(entry_id, xmodule_instance_args):
     """
     # Translators: This is a past-tense verb that is inserted into task progress messages as {action}.
     action_name = ugettext_noop('reset')
-    update_fcn = partial(reset_attempts_module_state, xmodule_instance_args)
-    visit_fcn = partial(perform_module_state_update, update_fcn, None)
+    bulk_update_fcn = partial(reset_attempts_module_states, xmodule_instance_args)
+    visit_fcn = partial(
+        perform_module_state_update, None, None, bulk_update_fcn=bulk_update_fcn,
+        part_task=reset_problem_attempts_part, xmodule_instance_args=xmodule_instance_args
+    )
     return run_main_task(entry_id, visit_fcn, action_name)
 
 
+@task  # pylint: disable=not-callable
+def reset_problem_attempts_part(entry_id, module_ids, xmodule_instance_args, subtask_status_dict):
+    """
+    Resets problem attempts for a chunk of the students of the InstructorTask
+    `entry_id`, queued by `reset_problem_attempts` when there are many of them.
+    """
+    bulk_update_fcn = partial(reset_attempts_module_states, xmodule_instance_args)
+    return perform_module_state_update_part(None, bulk_update_fcn, entry_id, module_ids, subtask_status_dict)
+
+
 @task(base=BaseInstructorTask)  # pylint: disable=not-callable
 def delete_problem_state(entry_id, xmodule_instance_args):
     """Deletes problem state entirely for all students on a particular problem in a course.
@@ -113,11 +145,24 @@ def delete_problem_state(entry_id, xmodule_instance_args):
     """
     # Translators: This is a past-tense verb that is inserted into task progress messages as {action}.
     action_name = ugettext_noop('deleted')
-    update_fcn = partial(delete_problem_module_state, xmodule_instance_args)
-    visit_fcn = partial(perform_module_state_update, update_fcn, None)
+    bulk_update_fcn = partial(delete_problem_module_states, xmodule_instance_args)
+    visit_fcn = partial(
+        perform_module_state_update, None, None, bulk_update_fcn=bulk_update_fcn,
+        part_task=delete_problem_state_part, xmodule_instance_args=xmodule_instance_args
+    )
     return run_main_task(entry_id, visit_fcn, action_name)
 
 
+@task  # pylint: disable=not-callable
+def delete_problem_state_part(entry_id, module_ids, xmodule_instance_args, subtask_status_dict):
+    """
+    Deletes problem state for a chunk of the students of the InstructorTask
+    `entry_id`, queued by `delete_problem_state` when there are many of them.
+    """
+    bulk_update_fcn = partial(delete_problem_module_states, xmodule_instance_args)
+    return perform_module_state_update_part(None, bulk_update_fcn, entry_id, module_ids, subtask_status_dict)
+
+
 @task(base=BaseInstructorTask)  # pylint: disable=not-callable
 def send_bulk_course_email(entry_id, _xmodule_instance_args):
     """Sends emails to recipients enrolled in a course.
@@ -155,6 +200,15 @@ def calculate_grades_csv(entry_id, xmodule_instance_args):
     return run_main_task(entry_id, task_fn, action_name)
 
 
+@task(routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY)  # pylint: disable=not-callable
+def calculate_grades_csv_part(entry_id, part_number, student_ids, timestamp_str, subtask_status_dict):
+    """
+    Grade a chunk of the students of a course for the grade report of the
+    InstructorTask `entry_id`, queued by `calculate_grades_csv` for large courses.
+    """
+    return upload_grades_csv_part(entry_id, part_number, student_ids, timestamp_str, subtask_status_dict)
+
+
 @task(base=BaseInstructorTask, routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY)  # pylint: disable=not-callable
 def calculate_students_features_csv(entry_id, xmodule_instance_args):
     """
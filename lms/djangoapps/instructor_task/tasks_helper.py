@@ -5,15 +5,19 @@ running state of a course.
 """
 import json
 from datetime import datetime
+from itertools import chain, count, islice
 from time import time
 import unicodecsv
 import logging
+import traceback
 
 from celery import Task, current_task
 from celery.states import SUCCESS, FAILURE
+from django.conf import settings
 from django.contrib.auth.models import User
 from django.core.files.storage import DefaultStorage
-from django.db import transaction, reset_queries
+from django.db import connection, transaction, reset_queries
+from django.db.models.signals import post_save
 import dogstats_wrapper as dog_stats_api
 from pytz import UTC
 
@@ -22,16 +26,22 @@ from util.file import course_filename_prefix_generator, UniversalNewlineIterator
 from xmodule.modulestore.django import modulestore
 from xmodule.split_test_module import get_split_user_partitions
 
+from courseware import history
 from courseware.courses import get_course_by_id, get_problems_in_section
-from courseware.grades import iterate_grades_for
+from courseware.grades import BULK_GRADING_CHUNK_SIZE, iterate_grades_for
 from courseware.models import StudentModule
 from courseware.model_data import FieldDataCache
 from courseware.module_render import get_module_for_descriptor_internal
 from instructor_analytics.basic import enrolled_students_features
 from instructor_analytics.csvs import format_dictlist
 from instructor_task.models import ReportStore, InstructorTask, PROGRESS
-from lms.djangoapps.lms_xblock.runtime import LmsPartitionService
-from openedx.core.djangoapps.course_groups.cohorts import get_cohort
+from instructor_task.subtasks import (
+    SubtaskStatus,
+    check_subtask_is_valid,
+    queue_subtasks_for_query,
+    update_subtask_status,
+)
+from openedx.core.djangoapps.course_groups.cohorts import get_cohort_names
 from openedx.core.djangoapps.course_groups.models import CourseUserGroup
 from opaque_keys.edx.keys import UsageKey
 from openedx.core.djangoapps.course_groups.cohorts import add_user_to_cohort, is_course_cohorted
@@ -49,6 +59,16 @@ UPDATE_STATUS_SUCCEEDED = 'succeeded'
 UPDATE_STATUS_FAILED = 'failed'
 UPDATE_STATUS_SKIPPED = 'skipped'
 
+# number of StudentModules loaded, and reset or deleted, together by perform_module_state_update
+# (resetting takes three query parameters per module, and SQLite allows at most 999 of them)
+MODULE_STATE_UPDATE_CHUNK_SIZE = 300
+
+# format of the timestamp included in the names of generated reports
+REPORT_TIMESTAMP_FORMAT = "%Y-%m-%d-%H%M"
+
+# header of the report listing the students who couldn't be graded
+GRADE_REPORT_ERR_HEADER = ["id", "username", "error_msg"]
+
 
 class BaseInstructorTask(Task):
     """
@@ -263,7 +283,8 @@ def run_main_task(entry_id, task_fcn, action_name):
     return task_progress
 
 
-def perform_module_state_update(update_fcn, filter_fcn, _entry_id, course_id, task_input, action_name):
+def perform_module_state_update(update_fcn, filter_fcn, _entry_id, course_id, task_input, action_name,
+                                bulk_update_fcn=None, part_task=None, xmodule_instance_args=None):
     """
     Performs generic update by visiting StudentModule instances with the update_fcn provided.
 
@@ -281,6 +302,15 @@ def perform_module_state_update(update_fcn, filter_fcn, _entry_id, course_id, ta
     the update is successful; False indicates the update on the particular student module failed.
     A raised exception indicates a fatal condition -- that no other student modules should be considered.
 
+    If a `bulk_update_fcn` is given, it is called instead of `update_fcn` on chunks of
+    the StudentModules (see `_update_student_modules`).
+
+    If a `part_task` is given, and the modules of more than
+    `settings.PROBLEM_STATE_UPDATES_PER_TASK` students are to be updated, the
+    modules are split across subtasks instead, each running `part_task` on a
+    chunk of them (see `perform_module_state_update_part`).  The
+    `xmodule_instance_args` are passed on to these subtasks.
+
     The return value is a dict containing the task's results, with the following keys:
 
           'attempted': number of attempts made
@@ -298,25 +328,8 @@ def perform_module_state_update(update_fcn, filter_fcn, _entry_id, course_id, ta
 
     """
     start_time = time()
-    usage_keys = []
-    problem_url = task_input.get('problem_url')
-    entrance_exam_url = task_input.get('entrance_exam_url')
     student_identifier = task_input.get('student')
-    problems = {}
-
-    # if problem_url is present make a usage key from it
-    if problem_url:
-        usage_key = course_id.make_usage_key_from_deprecated_string(problem_url)
-        usage_keys.append(usage_key)
-
-        # find the problem descriptor:
-        problem_descriptor = modulestore().get_item(usage_key)
-        problems[unicode(usage_key)] = problem_descriptor
-
-    # if entrance_exam is present grab all problems in it
-    if entrance_exam_url:
-        problems = get_problems_in_section(entrance_exam_url)
-        usage_keys = [UsageKey.from_string(location) for location in problems.keys()]
+    usage_keys, problems = _get_problems_for_task_input(course_id, task_input)
 
     # find the modules in question
     modules_to_update = StudentModule.objects.filter(course_id=course_id, module_state_key__in=usage_keys)
@@ -338,30 +351,203 @@ def perform_module_state_update(update_fcn, filter_fcn, _entry_id, course_id, ta
     if filter_fcn is not None:
         modules_to_update = filter_fcn(modules_to_update)
 
-    task_progress = TaskProgress(action_name, modules_to_update.count(), start_time)
+    total_modules = modules_to_update.count()
+    if part_task is not None and _entry_id is not None and total_modules > settings.PROBLEM_STATE_UPDATES_PER_TASK:
+        return _queue_module_state_update_subtasks(
+            _entry_id, modules_to_update, total_modules, part_task, xmodule_instance_args, action_name
+        )
+
+    task_progress = TaskProgress(action_name, total_modules, start_time)
     task_progress.update_task_state()
 
-    for module_to_update in modules_to_update:
-        task_progress.attempted += 1
-        module_descriptor = problems[unicode(module_to_update.module_state_key)]
-        # There is no try here:  if there's an error, we let it throw, and the task will
-        # be marked as FAILED, with a stack trace.
-        with dog_stats_api.timer('instructor_tasks.module.time.step', tags=[u'action:{name}'.format(name=action_name)]):
-            update_status = update_fcn(module_descriptor, module_to_update)
-            if update_status == UPDATE_STATUS_SUCCEEDED:
-                # If the update_fcn returns true, then it performed some kind of work.
-                # Logging of failures is left to the update_fcn itself.
-                task_progress.succeeded += 1
-            elif update_status == UPDATE_STATUS_FAILED:
-                task_progress.failed += 1
-            elif update_status == UPDATE_STATUS_SKIPPED:
-                task_progress.skipped += 1
-            else:
-                raise UpdateProblemModuleStateError("Unexpected update_status returned: {}".format(update_status))
+    # Fetch the ids first, so that the query isn't affected by the modules being updated.
+    module_ids = list(modules_to_update.order_by('id').values_list('id', flat=True))
+    _update_student_modules(
+        update_fcn, bulk_update_fcn, problems, module_ids, task_progress, action_name, update_task_state=True
+    )
 
     return task_progress.update_task_state()
 
 
+def _get_problems_for_task_input(course_id, task_input):
+    """
+    Return a tuple `(usage_keys, problems)` of the problems to update named by
+    `task_input`: either the problem with its 'problem_url', or all the problems
+    in the section with its 'entrance_exam_url'.  `problems` maps the string
+    version of each usage key to the problem's descriptor.
+    """
+    usage_keys = []
+    problem_url = task_input.get('problem_url')
+    entrance_exam_url = task_input.get('entrance_exam_url')
+    problems = {}
+
+    # if problem_url is present make a usage key from it
+    if problem_url:
+        usage_key = course_id.make_usage_key_from_deprecated_string(problem_url)
+        usage_keys.append(usage_key)
+
+        # find the problem descriptor:
+        problem_descriptor = modulestore().get_item(usage_key)
+        problems[unicode(usage_key)] = problem_descriptor
+
+    # if entrance_exam is present grab all problems in it
+    if entrance_exam_url:
+        problems = get_problems_in_section(entrance_exam_url)
+        usage_keys = [UsageKey.from_string(location) for location in problems.keys()]
+
+    return usage_keys, problems
+
+
+def _update_student_modules(update_fcn, bulk_update_fcn, problems, module_ids, task_progress, action_name,
+                            update_task_state=False):
+    """
+    Update the StudentModules with ids `module_ids`, counting each of them in `task_progress`.
+
+    The modules are loaded MODULE_STATE_UPDATE_CHUNK_SIZE at a time.  If there
+    is a `bulk_update_fcn`, it is called on each chunk with the `problems` and
+    the list of StudentModules, and returns a dict of the number of modules
+    for each update status.  Otherwise `update_fcn` is called on each module,
+    as described in `perform_module_state_update`.  Modules which no longer
+    exist are counted as skipped.
+
+    If `update_task_state` is True, the state of the current task is updated
+    after each chunk.
+    """
+    tags = [u'action:{name}'.format(name=action_name)]
+    module_ids = iter(module_ids)
+    while True:
+        chunk_ids = list(islice(module_ids, MODULE_STATE_UPDATE_CHUNK_SIZE))
+        if not chunk_ids:
+            break
+        modules = list(StudentModule.objects.filter(id__in=chunk_ids).select_related('student').order_by('id'))
+        task_progress.attempted += len(chunk_ids)
+        task_progress.skipped += len(chunk_ids) - len(modules)
+
+        if bulk_update_fcn is not None:
+            with dog_stats_api.timer('instructor_tasks.module.time.chunk', tags=tags):
+                update_statuses = bulk_update_fcn(problems, modules)
+            unexpected = set(update_statuses) - {UPDATE_STATUS_SUCCEEDED, UPDATE_STATUS_FAILED, UPDATE_STATUS_SKIPPED}
+            if unexpected:
+                raise UpdateProblemModuleStateError("Unexpected update_status returned: {}".format(unexpected.pop()))
+            task_progress.succeeded += update_statuses.get(UPDATE_STATUS_SUCCEEDED, 0)
+            task_progress.failed += update_statuses.get(UPDATE_STATUS_FAILED, 0)
+            task_progress.skipped += update_statuses.get(UPDATE_STATUS_SKIPPED, 0)
+        else:
+            for module_to_update in modules:
+                module_descriptor = problems[unicode(module_to_update.module_state_key)]
+                # There is no try here:  if there's an error, we let it throw, and the task will
+                # be marked as FAILED, with a stack trace.
+                with dog_stats_api.timer('instructor_tasks.module.time.step', tags=tags):
+                    update_status = update_fcn(module_descriptor, module_to_update)
+                    if update_status == UPDATE_STATUS_SUCCEEDED:
+                        # If the update_fcn returns true, then it performed some kind of work.
+                        # Logging of failures is left to the update_fcn itself.
+                        task_progress.succeeded += 1
+                    elif update_status == UPDATE_STATUS_FAILED:
+                        task_progress.failed += 1
+                    elif update_status == UPDATE_STATUS_SKIPPED:
+                        task_progress.skipped += 1
+                    else:
+                        raise UpdateProblemModuleStateError(
+                            "Unexpected update_status returned: {}".format(update_status)
+                        )
+
+        if update_task_state:
+            task_progress.update_task_state()
+
+
+def _queue_module_state_update_subtasks(entry_id, modules_to_update, total_modules, part_task,
+                                        xmodule_instance_args, action_name):
+    """
+    Queue subtasks that each run `part_task` on a chunk of `modules_to_update`.
+    """
+    entry = InstructorTask.objects.get(pk=entry_id)
+
+    # If the parent task is run again after queueing its subtasks (e.g. after
+    # losing the connection to the broker), don't queue a second set of them.
+    if len(entry.subtasks) > 0 and len(entry.task_output) > 0:
+        TASK_LOG.warning(u'Task: %s, InstructorTask ID: %s, Subtasks already queued', entry.task_id, entry_id)
+        return json.loads(entry.task_output)
+
+    def _create_module_state_update_subtask(module_list, initial_subtask_status):
+        """Creates a subtask to update the given chunk of StudentModules."""
+        return part_task.subtask(
+            (
+                entry_id,
+                [module['pk'] for module in module_list],
+                xmodule_instance_args,
+                initial_subtask_status.to_dict(),
+            ),
+            task_id=initial_subtask_status.task_id,
+        )
+
+    TASK_LOG.info(
+        u'Task: %s, InstructorTask ID: %s, Task type: %s, Queueing subtasks to update total modules: %s',
+        entry.task_id,
+        entry_id,
+        action_name,
+        total_modules
+    )
+    return queue_subtasks_for_query(
+        entry,
+        action_name,
+        _create_module_state_update_subtask,
+        [modules_to_update],
+        [],
+        settings.PROBLEM_STATE_UPDATES_PER_TASK,
+        total_modules,
+    )
+
+
+def perform_module_state_update_part(update_fcn, bulk_update_fcn, entry_id, module_ids, subtask_status_dict):
+    """
+    Update the StudentModules with ids `module_ids` for the InstructorTask
+    `entry_id`, with `update_fcn` or `bulk_update_fcn` as described in
+    `perform_module_state_update`, and record the result in the status of the
+    InstructorTask.
+    """
+    subtask_status = SubtaskStatus.from_dict(subtask_status_dict)
+    current_task_id = subtask_status.task_id
+    check_subtask_is_valid(entry_id, current_task_id, subtask_status)
+
+    entry = InstructorTask.objects.get(pk=entry_id)
+    course_id = entry.course_id
+    action_name = json.loads(entry.task_output)['action_name']
+    task_info_string = u'Task: {task_id}, InstructorTask ID: {entry_id}, Course: {course_id}'.format(
+        task_id=current_task_id, entry_id=entry_id, course_id=course_id
+    )
+    task_progress = TaskProgress(action_name, len(module_ids), time())
+
+    try:
+        __, problems = _get_problems_for_task_input(course_id, json.loads(entry.task_input))
+        _update_student_modules(update_fcn, bulk_update_fcn, problems, module_ids, task_progress, action_name)
+    except Exception:
+        # Count the modules this subtask didn't get to as failed.
+        TASK_LOG.exception(u'%s, Task type: %s, Updating modules failed', task_info_string, action_name)
+        _increment_subtask_status(
+            subtask_status, task_progress, len(module_ids) - task_progress.succeeded - task_progress.skipped, FAILURE
+        )
+        update_subtask_status(entry_id, current_task_id, subtask_status)
+        raise
+
+    _increment_subtask_status(subtask_status, task_progress, task_progress.failed, SUCCESS)
+    TASK_LOG.info(u'%s, Task type: %s, Modules updated: %s', task_info_string, action_name, subtask_status)
+    update_subtask_status(entry_id, current_task_id, subtask_status)
+    return subtask_status.to_dict()
+
+
+def _increment_subtask_status(subtask_status, task_progress, failed, state):
+    """
+    Add the modules counted in `task_progress` to `subtask_status`, with
+    `failed` modules failed, and set its `state`.
+    """
+    subtask_status.increment(
+        succeeded=task_progress.succeeded, failed=failed, skipped=task_progress.skipped, state=state
+    )
+    # Skipped modules are attempted too, as in the progress of tasks without subtasks.
+    subtask_status.attempted += task_progress.skipped
+
+
 def _get_task_id_from_xmodule_args(xmodule_instance_args):
     """Gets task_id from `xmodule_instance_args` dict, or returns default value if missing."""
     return xmodule_instance_args.get('task_id', UNKNOWN_TASK_ID) if xmodule_instance_args is not None else UNKNOWN_TASK_ID
@@ -481,46 +667,112 @@ def rescore_problem_module_state(xmodule_instance_args, module_descriptor, stude
         return UPDATE_STATUS_SUCCEEDED
 
 
-@transaction.autocommit
-def reset_attempts_module_state(xmodule_instance_args, _module_descriptor, student_module):
+@transaction.commit_on_success
+def reset_attempts_module_states(xmodule_instance_args, _problems, student_modules):
     """
-    Resets problem attempts to zero for specified `student_module`.
+    Resets problem attempts to zero for each of the `student_modules`, saving
+    them all in a single update.
 
-    Returns a status of UPDATE_STATUS_SUCCEEDED if a problem has non-zero attempts
-    that are being reset, and UPDATE_STATUS_SKIPPED otherwise.
+    Returns a dict with the number of modules which had non-zero attempts that
+    were reset, as UPDATE_STATUS_SUCCEEDED, and the number of the others, as
+    UPDATE_STATUS_SKIPPED.
     """
-    update_status = UPDATE_STATUS_SKIPPED
-    problem_state = json.loads(student_module.state) if student_module.state else {}
-    if 'attempts' in problem_state:
-        old_number_of_attempts = problem_state["attempts"]
-        if old_number_of_attempts > 0:
-            problem_state["attempts"] = 0
-            # convert back to json and save
+    reset_modules = []
+    old_attempts = []
+    for student_module in student_modules:
+        problem_state = json.loads(student_module.state) if student_module.state else {}
+        if problem_state.get('attempts') > 0:
+            old_attempts.append(problem_state['attempts'])
+            problem_state['attempts'] = 0
             student_module.state = json.dumps(problem_state)
-            student_module.save()
-            # get request-related tracking information from args passthrough,
-            # and supplement with task-specific information:
-            track_function = _get_track_function_for_task(student_module.student, xmodule_instance_args)
-            event_info = {"old_attempts": old_number_of_attempts, "new_attempts": 0}
-            track_function('problem_reset_attempts', event_info)
-            update_status = UPDATE_STATUS_SUCCEEDED
+            reset_modules.append(student_module)
 
-    return update_status
+    _save_module_states(reset_modules)
 
+    for student_module, old_number_of_attempts in zip(reset_modules, old_attempts):
+        # get request-related tracking information from args passthrough,
+        # and supplement with task-specific information:
+        track_function = _get_track_function_for_task(student_module.student, xmodule_instance_args)
+        event_info = {"old_attempts": old_number_of_attempts, "new_attempts": 0}
+        track_function('problem_reset_attempts', event_info)
 
-@transaction.autocommit
-def delete_problem_module_state(xmodule_instance_args, _module_descriptor, student_module):
+    return {
+        UPDATE_STATUS_SUCCEEDED: len(reset_modules),
+        UPDATE_STATUS_SKIPPED: len(student_modules) - len(reset_modules),
+    }
+
+
+def _save_module_states(student_modules):
+    """
+    Save the state of each of the `student_modules` in a single UPDATE.
+
+    As the modules aren't saved one by one, post_save is sent for each of
+    them, so that their history is still recorded; the history rows are
+    buffered and written together when the settings allow it.
     """
-    Delete the StudentModule entry.
+    if not student_modules:
+        return
+
+    modified = datetime.now(UTC)
+    meta = StudentModule._meta  # pylint: disable=protected-access
+    quote_name = connection.ops.quote_name
+    sql = u"UPDATE {table} SET {state} = CASE {id} {cases} END, {modified} = %s WHERE {id} IN ({ids})".format(
+        table=quote_name(meta.db_table),
+        state=quote_name(meta.get_field('state').column),
+        modified=quote_name(meta.get_field('modified').column),
+        id=quote_name(meta.pk.column),
+        cases=u" ".join([u"WHEN %s THEN %s"] * len(student_modules)),
+        ids=u", ".join([u"%s"] * len(student_modules)),
+    )
+    params = list(chain.from_iterable((module.id, module.state) for module in student_modules))
+    params.append(meta.get_field('modified').get_db_prep_value(modified, connection))
+    params.extend(module.id for module in student_modules)
+    connection.cursor().execute(sql, params)
+    transaction.set_dirty()
+
+    # Leave any buffering already started, e.g. by a request running the task eagerly, to whoever started it.
+    buffering = not history.is_buffering()
+    if buffering:
+        history.start_buffering()
+    try:
+        for student_module in student_modules:
+            student_module.modified = modified
+            post_save.send(sender=StudentModule, instance=student_module, created=False, raw=False)
+    except Exception:
+        if buffering:
+            history.discard()
+        raise
+    if buffering:
+        history.stop_buffering()
+
+
+@transaction.commit_on_success
+def delete_problem_module_states(xmodule_instance_args, _problems, student_modules):
+    """
+    Delete the `student_modules` entries, in a single delete.
+
+    Returns a dict counting all of them as UPDATE_STATUS_SUCCEEDED, if it
+    doesn't raise an exception due to database error.
+    """
+    StudentModule.objects.filter(id__in=[student_module.id for student_module in student_modules]).delete()
+    for student_module in student_modules:
+        # get request-related tracking information from args passthrough,
+        # and supplement with task-specific information:
+        track_function = _get_track_function_for_task(student_module.student, xmodule_instance_args)
+        track_function('problem_delete_state', {})
+    return {UPDATE_STATUS_SUCCEEDED: len(student_modules)}
+
 
-    Always returns UPDATE_STATUS_SUCCEEDED, indicating success, if it doesn't raise an exception due to database error.
+def _report_filename(csv_name, course_id, timestamp_str):
+    """
+    Return the name of the `csv_name` report for `course_id` generated at
+    `timestamp_str` (formatted with REPORT_TIMESTAMP_FORMAT).
     """
-    student_module.delete()
-    # get request-related tracking information from args passthrough,
-    # and supplement with task-specific information:
-    track_function = _get_track_function_for_task(student_module.student, xmodule_instance_args)
-    track_function('problem_delete_state', {})
-    return UPDATE_STATUS_SUCCEEDED
+    return u"{course_prefix}_{csv_name}_{timestamp_str}.csv".format(
+        course_prefix=course_filename_prefix_generator(course_id),
+        csv_name=csv_name,
+        timestamp_str=timestamp_str
+    )
 
 
 def upload_csv_to_report_store(rows, csv_name, course_id, timestamp):
@@ -540,15 +792,109 @@ def upload_csv_to_report_store(rows, csv_name, course_id, timestamp):
     report_store = ReportStore.from_config()
     report_store.store_rows(
         course_id,
-        u"{course_prefix}_{csv_name}_{timestamp_str}.csv".format(
-            course_prefix=course_filename_prefix_generator(course_id),
-            csv_name=csv_name,
-            timestamp_str=timestamp.strftime("%Y-%m-%d-%H%M")
-        ),
+        _report_filename(csv_name, course_id, timestamp.strftime(REPORT_TIMESTAMP_FORMAT)),
         rows
     )
 
 
+def _grade_report_rows(course, students, task_progress, task_info_string, action_name, status_interval=None):
+    """
+    Grade `students` in `course`, counting each of them in `task_progress`.
+
+    Returns a tuple `(rows, err_rows)`. `rows` starts with a header row, unless
+    no student could be graded, and contains a row per graded student.
+    `err_rows` contains a row per student who couldn't be graded, without a
+    header.
+
+    Cohorts and experiment groups are looked up in bulk for each chunk of
+    students graded together by `iterate_grades_for`. If `status_interval` is
+    given, the state of the current task is updated every `status_interval`
+    students.
+    """
+    course_is_cohorted = is_course_cohorted(course.id)
+    cohorts_header = ['Cohort Name'] if course_is_cohorted else []
+
+    experiment_partitions = get_split_user_partitions(course.user_partitions)
+    group_configs_header = [u'Experiment Group ({})'.format(partition.name) for partition in experiment_partitions]
+
+    header = None
+    rows = []
+    err_rows = []
+    current_step = {'step': 'Calculating Grades'}
+
+    students = iter(students)
+    while True:
+        student_chunk = list(islice(students, BULK_GRADING_CHUNK_SIZE))
+        if not student_chunk:
+            break
+
+        student_ids = [student.id for student in student_chunk]
+        cohort_names = get_cohort_names(course.id, student_ids) if course_is_cohorted else {}
+        experiment_groups = [
+            partition.scheme.get_groups_for_users(course.id, student_ids, partition)
+            for partition in experiment_partitions
+        ]
+
+        for student, gradeset, err_msg in iterate_grades_for(course, student_chunk):
+            # Periodically update task status (this is a cache write)
+            if status_interval and task_progress.attempted % status_interval == 0:
+                task_progress.update_task_state(extra_meta=current_step)
+            task_progress.attempted += 1
+
+            # Now add a log entry after certain intervals to get a hint that task is in progress
+            if task_progress.attempted % 1000 == 0:
+                TASK_LOG.info(
+                    u'%s, Task type: %s, Current step: %s, Grade calculation in-progress for students: %s/%s',
+                    task_info_string,
+                    action_name,
+                    current_step,
+                    task_progress.attempted,
+                    task_progress.total
+                )
+
+            if gradeset:
+                # We were able to successfully grade this student for this course.
+                task_progress.succeeded += 1
+                if not header:
+                    header = [section['label'] for section in gradeset[u'section_breakdown']]
+                    rows.append(
+                        ["id", "email", "username", "grade"] + header + cohorts_header + group_configs_header
+                    )
+
+                percents = {
+                    section['label']: section.get('percent', 0.0)
+                    for section in gradeset[u'section_breakdown']
+                    if 'label' in section
+                }
+
+                cohorts_group_name = []
+                if course_is_cohorted:
+                    cohorts_group_name.append(cohort_names.get(student.id, ''))
+
+                group_configs_group_names = []
+                for groups in experiment_groups:
+                    group = groups.get(student.id)
+                    group_configs_group_names.append(group.name if group else '')
+
+                # Not everybody has the same gradable items. If the item is not
+                # found in the user's gradeset, just assume it's a 0. The aggregated
+                # grades for their sections and overall course will be calculated
+                # without regard for the item they didn't have access to, so it's
+                # possible for a student to have a 0.0 show up in their row but
+                # still have 100% for the course.
+                row_percents = [percents.get(label, 0.0) for label in header]
+                rows.append(
+                    [student.id, student.email, student.username, gradeset['percent']] +
+                    row_percents + cohorts_group_name + group_configs_group_names
+                )
+            else:
+                # An empty gradeset means we failed to grade a student.
+                task_progress.failed += 1
+                err_rows.append([student.id, student.username, err_msg])
+
+    return rows, err_rows
+
+
 def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input, action_name):
     """
     For a given `course_id`, generate a grades CSV file for all students that
@@ -558,6 +904,12 @@ def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input,
     buffered, so we'll never write part of a CSV file to S3 -- i.e. any files
     that are visible in ReportStore will be complete ones.
 
+    When run for an InstructorTask with more than
+    `settings.GRADES_DOWNLOAD_STUDENTS_PER_TASK` enrolled students, the
+    students are split across subtasks instead. Each subtask stores its part of
+    the report, and the last one to finish merges the parts (see
+    `upload_grades_csv_part`).
+
     As we start to add more CSV downloads, it will probably be worthwhile to
     make a more general CSVDoc class instead of building out the rows like we
     do here.
@@ -566,7 +918,8 @@ def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input,
     start_date = datetime.now(UTC)
     status_interval = 100
     enrolled_students = CourseEnrollment.users_enrolled_in(course_id)
-    task_progress = TaskProgress(action_name, enrolled_students.count(), start_time)
+    total_enrolled_students = enrolled_students.count()
+    task_progress = TaskProgress(action_name, total_enrolled_students, start_time)
 
     fmt = u'Task: {task_id}, InstructorTask ID: {entry_id}, Course: {course_id}, Input: {task_input}'
     task_info_string = fmt.format(
@@ -577,21 +930,13 @@ def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input,
     )
     TASK_LOG.info(u'%s, Task type: %s, Starting task execution', task_info_string, action_name)
 
-    course = get_course_by_id(course_id)
-    course_is_cohorted = is_course_cohorted(course.id)
-    cohorts_header = ['Cohort Name'] if course_is_cohorted else []
-
-    experiment_partitions = get_split_user_partitions(course.user_partitions)
-    group_configs_header = [u'Experiment Group ({})'.format(partition.name) for partition in experiment_partitions]
+    if _entry_id is not None and total_enrolled_students > settings.GRADES_DOWNLOAD_STUDENTS_PER_TASK:
+        return _queue_grade_report_subtasks(
+            _entry_id, enrolled_students, total_enrolled_students, start_date, task_info_string, action_name
+        )
 
-    # Loop over all our students and build our CSV lists in memory
-    header = None
-    rows = []
-    err_rows = [["id", "username", "error_msg"]]
+    course = get_course_by_id(course_id)
     current_step = {'step': 'Calculating Grades'}
-
-    total_enrolled_students = enrolled_students.count()
-    student_counter = 0
     TASK_LOG.info(
         u'%s, Task type: %s, Current step: %s, Starting grade calculation for total students: %s',
         task_info_string,
@@ -599,71 +944,15 @@ def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input,
         current_step,
         total_enrolled_students
     )
-    for student, gradeset, err_msg in iterate_grades_for(course_id, enrolled_students):
-        # Periodically update task status (this is a cache write)
-        if task_progress.attempted % status_interval == 0:
-            task_progress.update_task_state(extra_meta=current_step)
-        task_progress.attempted += 1
-
-        # Now add a log entry after certain intervals to get a hint that task is in progress
-        student_counter += 1
-        if student_counter % 1000 == 0:
-            TASK_LOG.info(
-                u'%s, Task type: %s, Current step: %s, Grade calculation in-progress for students: %s/%s',
-                task_info_string,
-                action_name,
-                current_step,
-                student_counter,
-                total_enrolled_students
-            )
-
-        if gradeset:
-            # We were able to successfully grade this student for this course.
-            task_progress.succeeded += 1
-            if not header:
-                header = [section['label'] for section in gradeset[u'section_breakdown']]
-                rows.append(
-                    ["id", "email", "username", "grade"] + header + cohorts_header + group_configs_header
-                )
-
-            percents = {
-                section['label']: section.get('percent', 0.0)
-                for section in gradeset[u'section_breakdown']
-                if 'label' in section
-            }
-
-            cohorts_group_name = []
-            if course_is_cohorted:
-                group = get_cohort(student, course_id, assign=False)
-                cohorts_group_name.append(group.name if group else '')
-
-            group_configs_group_names = []
-            for partition in experiment_partitions:
-                group = LmsPartitionService(student, course_id).get_group(partition, assign=False)
-                group_configs_group_names.append(group.name if group else '')
-
-            # Not everybody has the same gradable items. If the item is not
-            # found in the user's gradeset, just assume it's a 0. The aggregated
-            # grades for their sections and overall course will be calculated
-            # without regard for the item they didn't have access to, so it's
-            # possible for a student to have a 0.0 show up in their row but
-            # still have 100% for the course.
-            row_percents = [percents.get(label, 0.0) for label in header]
-            rows.append(
-                [student.id, student.email, student.username, gradeset['percent']] +
-                row_percents + cohorts_group_name + group_configs_group_names
-            )
-        else:
-            # An empty gradeset means we failed to grade a student.
-            task_progress.failed += 1
-            err_rows.append([student.id, student.username, err_msg])
-
+    rows, err_rows = _grade_report_rows(
+        course, enrolled_students, task_progress, task_info_string, action_name, status_interval
+    )
     TASK_LOG.info(
         u'%s, Task type: %s, Current step: %s, Grade calculation completed for students: %s/%s',
         task_info_string,
         action_name,
         current_step,
-        student_counter,
+        task_progress.attempted,
         total_enrolled_students
     )
 
@@ -675,15 +964,210 @@ def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input,
     # Perform the actual upload
     upload_csv_to_report_store(rows, 'grade_report', course_id, start_date)
 
-    # If there are any error rows (don't count the header), write them out as well
-    if len(err_rows) > 1:
-        upload_csv_to_report_store(err_rows, 'grade_report_err', course_id, start_date)
+    # If there are any error rows, write them out as well
+    if err_rows:
+        upload_csv_to_report_store([GRADE_REPORT_ERR_HEADER] + err_rows, 'grade_report_err', course_id, start_date)
 
     # One last update before we close out...
     TASK_LOG.info(u'%s, Task type: %s, Finalizing grade task', task_info_string, action_name)
     return task_progress.update_task_state(extra_meta=current_step)
 
 
+def _queue_grade_report_subtasks(entry_id, enrolled_students, total_enrolled_students, start_date,
+                                 task_info_string, action_name):
+    """
+    Queue subtasks that each grade a chunk of `enrolled_students` and store
+    their part of the grade report.
+    """
+    # Imported here, since instructor_task.tasks depends on this module.
+    from instructor_task.tasks import calculate_grades_csv_part
+
+    entry = InstructorTask.objects.get(pk=entry_id)
+
+    # If the parent task is run again after queueing its subtasks (e.g. after
+    # losing the connection to the broker), don't queue a second set of them.
+    if len(entry.subtasks) > 0 and len(entry.task_output) > 0:
+        TASK_LOG.warning(u'%s, Task type: %s, Subtasks already queued', task_info_string, action_name)
+        return json.loads(entry.task_output)
+
+    timestamp_str = start_date.strftime(REPORT_TIMESTAMP_FORMAT)
+    part_numbers = count()
+
+    def _create_grades_csv_subtask(student_list, initial_subtask_status):
+        """Creates a subtask to grade the given chunk of students."""
+        return calculate_grades_csv_part.subtask(
+            (
+                entry_id,
+                next(part_numbers),
+                [student['pk'] for student in student_list],
+                timestamp_str,
+                initial_subtask_status.to_dict(),
+            ),
+            task_id=initial_subtask_status.task_id,
+            routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY,
+        )
+
+    TASK_LOG.info(
+        u'%s, Task type: %s, Queueing subtasks to grade total students: %s',
+        task_info_string,
+        action_name,
+        total_enrolled_students
+    )
+    return queue_subtasks_for_query(
+        entry,
+        action_name,
+        _create_grades_csv_subtask,
+        [enrolled_students],
+        [],
+        settings.GRADES_DOWNLOAD_STUDENTS_PER_TASK,
+        total_enrolled_students,
+    )
+
+
+def _grade_report_part_filename(entry, csv_name, part_number):
+    """
+    Return the name under which part `part_number` of the `csv_name` report
+    generated by the InstructorTask `entry` is stored.
+    """
+    return u"{parts_dir}/{task_id}/{csv_name}_{part_number:05d}.csv".format(
+        parts_dir=ReportStore.PARTS_DIRECTORY,
+        task_id=entry.task_id,
+        csv_name=csv_name,
+        part_number=part_number
+    )
+
+
+def upload_grades_csv_part(entry_id, part_number, student_ids, timestamp_str, subtask_status_dict):
+    """
+    Grade the students with ids `student_ids` and store the resulting rows as
+    part `part_number` of the grade report of the InstructorTask `entry_id`.
+
+    The subtask that completes the InstructorTask then merges all the parts
+    into the final reports, named with `timestamp_str`.
+    """
+    subtask_status = SubtaskStatus.from_dict(subtask_status_dict)
+    current_task_id = subtask_status.task_id
+    check_subtask_is_valid(entry_id, current_task_id, subtask_status)
+
+    entry = InstructorTask.objects.get(pk=entry_id)
+    course_id = entry.course_id
+    task_info_string = u'Task: {task_id}, InstructorTask ID: {entry_id}, Course: {course_id}, Part: {part}'.format(
+        task_id=current_task_id, entry_id=entry_id, course_id=course_id, part=part_number
+    )
+    action_name = json.loads(entry.task_output)['action_name']
+
+    # Keep the students in the order in which they were handed out.
+    students_by_id = User.objects.in_bulk(student_ids)
+    students = [students_by_id[student_id] for student_id in student_ids if student_id in students_by_id]
+    task_progress = TaskProgress(action_name, len(student_ids), time())
+
+    try:
+        course = get_course_by_id(course_id)
+        rows, err_rows = _grade_report_rows(course, students, task_progress, task_info_string, action_name)
+
+        report_store = ReportStore.from_config()
+        report_store.store_rows(course_id, _grade_report_part_filename(entry, 'grade_report', part_number), rows)
+        report_store.store_rows(
+            course_id, _grade_report_part_filename(entry, 'grade_report_err', part_number), err_rows
+        )
+    except Exception:
+        # We don't know how far we got, so count every student in this part as failed.
+        TASK_LOG.exception(u'%s, Task type: %s, Grade report part failed', task_info_string, action_name)
+        subtask_status.increment(failed=len(student_ids), state=FAILURE)
+        if update_subtask_status(entry_id, current_task_id, subtask_status, complete_task=False):
+            _complete_grade_report(entry_id, timestamp_str)
+        raise
+
+    subtask_status.increment(
+        succeeded=task_progress.succeeded,
+        failed=task_progress.failed + len(student_ids) - len(students),
+        state=SUCCESS
+    )
+    TASK_LOG.info(u'%s, Task type: %s, Grade report part stored: %s', task_info_string, action_name, subtask_status)
+    if update_subtask_status(entry_id, current_task_id, subtask_status, complete_task=False):
+        _complete_grade_report(entry_id, timestamp_str)
+    return subtask_status.to_dict()
+
+
+def _complete_grade_report(entry_id, timestamp_str):
+    """
+    Merge the parts of the grade report of the InstructorTask `entry_id`, all
+    of whose subtasks are done, then mark the InstructorTask as succeeded.
+
+    The InstructorTask stays in progress until the report exists, and is
+    marked as failed if the merge raises.
+    """
+    entry = InstructorTask.objects.get(pk=entry_id)
+    try:
+        _merge_grade_report_parts(entry, timestamp_str)
+    except Exception as exc:
+        TASK_LOG.exception(u'Task %s: merging the grade report parts failed', entry.task_id)
+        entry.task_output = InstructorTask.create_output_for_failure(exc, traceback.format_exc())
+        entry.task_state = FAILURE
+        entry.save_now()
+        raise
+    entry.task_state = SUCCESS
+    entry.save_now()
+
+
+def _merge_grade_report_parts(entry, timestamp_str):
+    """
+    Assemble the parts stored by the subtasks of the InstructorTask `entry`
+    into the final grade report (and error report, if any students couldn't
+    be graded), then delete the parts.
+    """
+    course_id = entry.course_id
+    num_parts = json.loads(entry.subtasks)['total']
+    report_store = ReportStore.from_config()
+
+    def part_rows(csv_name, part_number):
+        """Return the rows of a part, or none if the part is missing."""
+        try:
+            return report_store.read_rows(course_id, _grade_report_part_filename(entry, csv_name, part_number))
+        except IOError:
+            TASK_LOG.warning(u'Task %s: missing part %s of report %s', entry.task_id, part_number, csv_name)
+            return []
+
+    def merged_grade_rows():
+        """Yield the header once, followed by every part's rows."""
+        header_written = False
+        for part_number in xrange(num_parts):
+            rows = iter(part_rows('grade_report', part_number))
+            header = next(rows, None)
+            if header is not None and not header_written:
+                header_written = True
+                yield header
+            for row in rows:
+                yield row
+
+    def merged_err_rows():
+        """Yield the rows of every part of the error report."""
+        for part_number in xrange(num_parts):
+            for row in part_rows('grade_report_err', part_number):
+                yield row
+
+    report_store.store_rows(
+        course_id, _report_filename('grade_report', course_id, timestamp_str), merged_grade_rows()
+    )
+
+    err_rows = merged_err_rows()
+    first_err_row = next(err_rows, None)
+    if first_err_row is not None:
+        report_store.store_rows(
+            course_id,
+            _report_filename('grade_report_err', course_id, timestamp_str),
+            chain([GRADE_REPORT_ERR_HEADER, first_err_row], err_rows)
+        )
+
+    for part_number in xrange(num_parts):
+        for csv_name in ('grade_report', 'grade_report_err'):
+            try:
+                report_store.delete(course_id, _grade_report_part_filename(entry, csv_name, part_number))
+            except (IOError, OSError):
+                pass
+    TASK_LOG.info(u'Task %s: merged %s grade report parts', entry.task_id, num_parts)
+
+
 def upload_students_csv(_xmodule_instance_args, _entry_id, course_id, task_input, action_name):
     """
     For a given `course_id`, generate a CSV file containing profile
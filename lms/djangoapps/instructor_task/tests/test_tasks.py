@@ -11,11 +11,12 @@ from uuid import uuid4
 from mock import Mock, MagicMock, patch
 
 from celery.states import SUCCESS, FAILURE
+from django.test.utils import override_settings
 
 from xmodule.modulestore.exceptions import ItemNotFoundError
 from opaque_keys.edx.locations import i4xEncoder
 
-from courseware.models import StudentModule
+from courseware.models import StudentModule, StudentModuleHistory
 from courseware.tests.factories import StudentModuleFactory
 from student.tests.factories import UserFactory, CourseEnrollmentFactory
 
@@ -113,6 +114,27 @@ class TestInstructorTasks(InstructorTaskModuleTestCase):
         self.assertEquals(json.loads(entry.task_output), status)
         self.assertEquals(entry.task_state, SUCCESS)
 
+    def _test_run_in_subtasks(self, task_class, action_name, expected_num_succeeded, expected_num_skipped=0):
+        """
+        Run a task whose StudentModules are split across subtasks, and check
+        the number of StudentModules processed.
+        """
+        task_entry = self._create_input_entry()
+        with override_settings(PROBLEM_STATE_UPDATES_PER_TASK=3):
+            self._run_task_with_mock_celery(task_class, task_entry.id, task_entry.task_id)
+        # the subtasks record their progress in the entry:
+        entry = InstructorTask.objects.get(id=task_entry.id)
+        self.assertEquals(entry.task_state, SUCCESS)
+        subtasks = json.loads(entry.subtasks)
+        self.assertEquals(subtasks['total'], 4)
+        self.assertEquals(subtasks['succeeded'], 4)
+        output = json.loads(entry.task_output)
+        self.assertEquals(output.get('attempted'), expected_num_succeeded + expected_num_skipped)
+        self.assertEquals(output.get('succeeded'), expected_num_succeeded)
+        self.assertEquals(output.get('skipped'), expected_num_skipped)
+        self.assertEquals(output.get('total'), expected_num_succeeded + expected_num_skipped)
+        self.assertEquals(output.get('action_name'), action_name)
+
     def _test_run_with_no_state(self, task_class, action_name):
         """Run with no StudentModules defined for the current problem."""
         self.define_option_problem(PROBLEM_URL_NAME)
@@ -258,6 +280,17 @@ class TestRescoreInstructorTask(TestInstructorTasks):
         self.assertEquals(output.get('action_name'), 'rescored')
         self.assertGreater(output.get('duration_ms'), 0)
 
+    def test_rescoring_in_subtasks(self):
+        input_state = json.dumps({'done': True})
+        num_students = 10
+        self._create_students_with_state(num_students, input_state)
+        mock_instance = Mock()
+        mock_instance.rescore_problem = Mock(return_value={'success': 'correct'})
+        with patch('instructor_task.tasks_helper.get_module_for_descriptor_internal') as mock_get_module:
+            mock_get_module.return_value = mock_instance
+            self._test_run_in_subtasks(rescore_problem, 'rescored', num_students)
+        self.assertEquals(mock_instance.rescore_problem.call_count, num_students)
+
     def test_rescoring_bad_result(self):
         # Confirm that rescoring does not succeed if "success" key is not an expected value.
         input_state = json.dumps({'done': True})
@@ -335,6 +368,28 @@ class TestResetAttemptsInstructorTask(TestInstructorTasks):
         # check that entries were reset
         self._assert_num_attempts(students, 0)
 
+    def test_reset_history(self):
+        input_state = json.dumps({'attempts': 3})
+        num_students = 3
+        students = self._create_students_with_state(num_students, input_state)
+        self.assertEquals(StudentModuleHistory.objects.count(), num_students)
+        self._test_run_with_task(reset_problem_attempts, 'reset', num_students)
+        # each reset is recorded in the history of its module
+        for student in students:
+            history = StudentModuleHistory.objects.filter(
+                student_module__student=student
+            ).order_by('-created', '-id')
+            self.assertEquals(len(history), 2)
+            self.assertEquals(json.loads(history[0].state)['attempts'], 0)
+
+    def test_reset_in_subtasks(self):
+        num_students = 10
+        students = self._create_students_with_state(num_students, json.dumps({'attempts': 3}))
+        # two students have nothing to reset
+        StudentModule.objects.filter(student__in=students[:2]).update(state=json.dumps({'attempts': 0}))
+        self._test_run_in_subtasks(reset_problem_attempts, 'reset', num_students - 2, expected_num_skipped=2)
+        self._assert_num_attempts(students, 0)
+
     def test_reset_with_zero_attempts(self):
         initial_attempts = 0
         input_state = json.dumps({'attempts': initial_attempts})
@@ -438,3 +493,11 @@ class TestDeleteStateInstructorTask(TestInstructorTasks):
                 StudentModule.objects.get(course_id=self.course.id,
                                           student=student,
                                           module_state_key=self.location)
+
+    def test_delete_in_subtasks(self):
+        num_students = 10
+        self._create_students_with_state(num_students)
+        self._test_run_in_subtasks(delete_problem_state, 'deleted', num_students)
+        self.assertFalse(
+            StudentModule.objects.filter(course_id=self.course.id, module_state_key=self.location).exists()
+        )
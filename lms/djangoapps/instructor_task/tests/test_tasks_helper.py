@@ -7,9 +7,14 @@ Tests that CSV grade report generation works with unicode emails.
 
 """
 import ddt
+import json
 from mock import Mock, patch
 import tempfile
 import unicodecsv
+from uuid import uuid4
+
+from celery.states import SUCCESS, FAILURE
+from django.test.utils import override_settings
 
 from xmodule.modulestore.tests.factories import CourseFactory
 from student.tests.factories import UserFactory
@@ -20,8 +25,9 @@ from openedx.core.djangoapps.course_groups.models import CourseUserGroupPartitio
 from openedx.core.djangoapps.course_groups.tests.helpers import CohortFactory
 import openedx.core.djangoapps.user_api.course_tag.api as course_tag_api
 from openedx.core.djangoapps.user_api.partition_schemes import RandomUserPartitionScheme
-from instructor_task.models import ReportStore
+from instructor_task.models import InstructorTask, ReportStore
 from instructor_task.tasks_helper import cohort_students_and_upload, upload_grades_csv, upload_students_csv
+from instructor_task.tests.factories import InstructorTaskFactory
 from instructor_task.tests.test_base import InstructorTaskCourseTestCase, TestReportMixin
 
 
@@ -257,6 +263,62 @@ class TestInstructorGradeReport(TestReportMixin, InstructorTaskCourseTestCase):
         result = upload_grades_csv(None, None, self.course.id, None, 'graded')
         self.assertDictContainsSubset({'attempted': 1, 'succeeded': 1, 'failed': 0}, result)
 
+    @override_settings(GRADES_DOWNLOAD_STUDENTS_PER_TASK=2)
+    @patch('instructor_task.tasks_helper._get_current_task')
+    def test_grading_in_subtasks(self, _mock_current_task):
+        """
+        Test that grade reports of courses with many students are assembled
+        from the parts generated by subtasks.
+        """
+        usernames = ['student{}'.format(i) for i in range(5)]
+        for username in usernames:
+            self.create_student(username)
+        entry = InstructorTaskFactory.create(
+            course_id=self.course.id,
+            task_type='grade_course',
+            task_id=str(uuid4()),
+        )
+
+        result = upload_grades_csv(None, entry.id, self.course.id, None, 'graded')
+        self.assertDictContainsSubset({'action_name': 'graded', 'total': len(usernames)}, result)
+
+        report_store = ReportStore.from_config()
+        links = report_store.links_for(self.course.id)
+        # Only the merged report is listed, not its parts
+        self.assertEqual(len(links), 1)
+        self.assertIn('grade_report', links[0][0])
+        with open(report_store.path_to(self.course.id, links[0][0])) as csv_file:
+            rows = list(unicodecsv.DictReader(csv_file))
+        self.assertItemsEqual([row['username'] for row in rows], usernames)
+        self.assertEqual(InstructorTask.objects.get(id=entry.id).task_state, SUCCESS)
+
+    @override_settings(GRADES_DOWNLOAD_STUDENTS_PER_TASK=2)
+    @patch('instructor_task.tasks_helper._get_current_task')
+    def test_merge_failure(self, _mock_current_task):
+        """
+        Test that a grade report whose parts can't be merged is marked as
+        failed, and isn't marked as succeeded before the merge.
+        """
+        for i in range(5):
+            self.create_student('student{}'.format(i))
+        entry = InstructorTaskFactory.create(
+            course_id=self.course.id,
+            task_type='grade_course',
+            task_id=str(uuid4()),
+        )
+
+        def merge_grade_report_parts(merged_entry, _timestamp_str):
+            """Check the state of the task being merged, then fail."""
+            self.assertNotEqual(InstructorTask.objects.get(id=merged_entry.id).task_state, SUCCESS)
+            raise IOError("No space left on device")
+
+        # The last subtask raises, which celery records in its result when running it eagerly.
+        with patch('instructor_task.tasks_helper._merge_grade_report_parts', side_effect=merge_grade_report_parts):
+            upload_grades_csv(None, entry.id, self.course.id, None, 'graded')
+        entry = InstructorTask.objects.get(id=entry.id)
+        self.assertEqual(entry.task_state, FAILURE)
+        self.assertEqual(json.loads(entry.task_output)['exception'], 'IOError')
+
 
 @ddt.ddt
 class TestStudentReport(TestReportMixin, InstructorTaskCourseTestCase):
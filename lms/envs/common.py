@@ -656,6 +656,10 @@ XBLOCK_SELECT_FUNCTION = prefer_xmodules
 
 MODULESTORE_BRANCH = 'published-only'
 CONTENTSTORE = None
+# Local directory caching the contents of assets too large for memcache, so they
+# aren't read from GridFS on every request, e.g.
+# {'DIRECTORY': '/tmp/static_content_cache', 'MAX_SIZE': 10 * 1024 ** 3}. Disabled if None.
+STATIC_CONTENT_DISK_CACHE = None
 DOC_STORE_CONFIG = {
     'host': 'localhost',
     'db': 'xmodule',
@@ -1065,6 +1069,9 @@ MIDDLEWARE_CLASSES = (
     # Detects user-requested locale from 'accept-language' header in http request
     'django.middleware.locale.LocaleMiddleware',
 
+    # Writes StudentModuleHistory rows after the request's changes are committed,
+    # so it must come before TransactionMiddleware
+    'courseware.middleware.StudentModuleHistoryMiddleware',
     'django.middleware.transaction.TransactionMiddleware',
     # 'debug_toolbar.middleware.DebugToolbarMiddleware',
 
@@ -1554,6 +1561,10 @@ BULK_EMAIL_LOG_SENT_EMAILS = False
 # parallel, and what the SES rate is.
 BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS = 0.02
 
+# Number of SMTP connections over which each bulk email task sends messages
+# in parallel.  A task retried for rate-related reasons uses a single connection.
+BULK_EMAIL_SMTP_CONNECTIONS = 4
+
 ############################# Email Opt In ####################################
 
 # Minimum age for organization-wide email opt in
@@ -1721,6 +1732,7 @@ INSTALLED_APPS = (
     'lms.djangoapps.lms_xblock',
 
     'openedx.core.djangoapps.content.course_structures',
+    'openedx.core.djangoapps.content.course_overviews',
     'course_structure_api',
 
     # Mailchimp Syncing
@@ -1897,6 +1909,14 @@ CERT_NAME_LONG = "Certificate of Achievement"
 ###################### Grade Downloads ######################
 GRADES_DOWNLOAD_ROUTING_KEY = HIGH_MEM_QUEUE
 
+# Grade reports for courses with more enrolled students than this are split
+# into subtasks grading this many students each.
+GRADES_DOWNLOAD_STUDENTS_PER_TASK = 2000
+
+# Rescoring, resetting attempts on or deleting the state of a problem for more
+# students than this is split into subtasks updating this many students' state each.
+PROBLEM_STATE_UPDATES_PER_TASK = 1000
+
 GRADES_DOWNLOAD = {
     'STORAGE_TYPE': 'localfs',
     'BUCKET': 'edx-grades',
@@ -2272,6 +2292,15 @@ CHECKPOINT_PATTERN = r'(?P<checkpoint_name>[^/]+)'
 # this setting.
 FIELD_OVERRIDE_PROVIDERS = ()
 
+# How StudentModuleHistory rows are written: 'immediate' (as StudentModules are
+# saved), 'response' (in bulk once the response of the request has been
+# produced) or 'celery' (in bulk by a celery task). See courseware.history.
+STUDENT_MODULE_HISTORY_WRITES = 'response'
+# The number of rows a request buffers before writing them anyway.
+STUDENT_MODULE_HISTORY_BUFFER_SIZE = 500
+# Store only the part of the state which changed since the previous history row.
+STUDENT_MODULE_HISTORY_DELTAS = False
+
 # PROFILE IMAGE CONFIG
 # WARNING: Certain django storage backends do not support atomic
 # file overwrites (including the default, OverwriteStorage) - instead
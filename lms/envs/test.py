@@ -207,9 +207,21 @@ CACHES = {
         'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
         'LOCATION': 'edx_location_mem_cache',
     },
+    'course_structure_cache': {
+        'BACKEND': 'django.core.cache.backends.dummy.DummyCache',
+    },
 
 }
 
+# Always read ConfigurationModels from the cache or database, which tests reset
+CONFIGURATION_MODEL_PROCESS_CACHE_TIMEOUT = 0
+
+# Send bulk email one message at a time, so that mocked connections see the messages in order
+BULK_EMAIL_SMTP_CONNECTIONS = 1
+
+# Write StudentModuleHistory rows as StudentModules are saved, so that tests can count the queries
+STUDENT_MODULE_HISTORY_WRITES = 'immediate'
+
 # Dummy secret key for dev
 SECRET_KEY = '85920908f28904ed733fe576320db18cabd7b6cd'
 
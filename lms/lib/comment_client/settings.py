@@ -6,3 +6,11 @@ else:
     SERVICE_HOST = 'http://localhost:4567'
 
 PREFIX = SERVICE_HOST + '/api/v1'
+
+# Connections to the comments service are kept alive and reused, through a
+# pool of at most POOL_SIZE connections per process.
+POOL_SIZE = getattr(settings, "COMMENTS_SERVICE_POOL_SIZE", 10)
+# Number of times a request is retried after failing to connect.
+MAX_RETRIES = getattr(settings, "COMMENTS_SERVICE_MAX_RETRIES", 0)
+# Seconds to wait for the comments service before giving up on a request.
+TIMEOUT = getattr(settings, "COMMENTS_SERVICE_TIMEOUT", 5)
@@ -1,14 +1,20 @@
 from contextlib import contextmanager
+from cookielib import DefaultCookiePolicy
 import dogstats_wrapper as dog_stats_api
 import logging
 import requests
+from requests.adapters import HTTPAdapter
 from django.conf import settings
 from time import time
 from uuid import uuid4
 from django.utils.translation import get_language
 
+import settings as cc_settings
+
 log = logging.getLogger(__name__)
 
+_SESSION = None
+
 
 def strip_none(dic):
     return dict([(k, v) for k, v in dic.iteritems() if v is not None])
@@ -50,6 +56,41 @@ def request_timer(request_id, method, url, tags=None):
     )
 
 
+class _NoCookiesPolicy(DefaultCookiePolicy):
+    """
+    Cookie policy that neither stores nor sends any cookie.
+    """
+    def set_ok(self, cookie, request):
+        return False
+
+    def return_ok(self, cookie, request):
+        return False
+
+
+def get_session():
+    """
+    Returns the session used for all requests to the comments service.
+
+    The session is created on first use and shared by the whole process, so
+    that connections to the comments service are kept alive and reused across
+    requests instead of being opened for every call.  Since it is shared by
+    all users, it never keeps cookies set by the comments service.
+    """
+    global _SESSION  # pylint: disable=global-statement
+    if _SESSION is None:
+        session = requests.Session()
+        session.cookies.set_policy(_NoCookiesPolicy())
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=cc_settings.POOL_SIZE,
+            max_retries=cc_settings.MAX_RETRIES,
+        )
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        _SESSION = session
+    return _SESSION
+
+
 def perform_request(method, url, data_or_params=None, raw=False,
                     metric_action=None, metric_tags=None, paged_results=False):
 
@@ -76,13 +117,13 @@ def perform_request(method, url, data_or_params=None, raw=False,
         data = None
         params = merge_dict(data_or_params, request_id_dict)
     with request_timer(request_id, method, url, metric_tags):
-        response = requests.request(
+        response = get_session().request(
             method,
             url,
             data=data,
             params=params,
             headers=headers,
-            timeout=5
+            timeout=cc_settings.TIMEOUT
         )
 
     metric_tags.append(u'status_code:{}'.format(response.status_code))
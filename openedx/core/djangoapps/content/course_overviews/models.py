@@ -0,0 +1,275 @@
+"""
+Declaration of the CourseOverview model.
+"""
+import json
+import logging
+from datetime import datetime
+
+from django.db import models, IntegrityError
+from django.utils.translation import ugettext
+from model_utils.models import TimeStampedModel
+from pytz import UTC
+
+from util.date_utils import strftime_localized
+from xmodule.course_module import CourseDescriptor, DEFAULT_START_DATE
+from xmodule.fields import Date
+from xmodule.modulestore.django import modulestore
+from xmodule_django.models import CourseKeyField, UsageKeyField
+
+
+log = logging.getLogger(__name__)  # pylint: disable=invalid-name
+
+
+class CourseOverview(TimeStampedModel):
+    """
+    Denormalized summary of a course, holding the handful of CourseDescriptor
+    fields needed to list a course (e.g. on the student dashboard) without
+    loading the course from the modulestore.
+
+    Rows are created lazily by get_from_id/get_from_ids and deleted whenever
+    the course is published, so they are regenerated on next access.
+
+    The model exposes the same attribute and method names as CourseDescriptor
+    for the fields it holds, so it can be passed to templates and to
+    courseware.access.has_access in place of the descriptor.
+    """
+    # Course identification
+    id = CourseKeyField(db_index=True, primary_key=True, max_length=255)  # pylint: disable=invalid-name
+    _location = UsageKeyField(max_length=255)
+    display_name = models.TextField(null=True)
+    display_name_with_default = models.TextField()
+    display_number_with_default = models.TextField()
+    display_org_with_default = models.TextField()
+
+    # Start/end dates
+    start = models.DateTimeField(null=True)
+    end = models.DateTimeField(null=True)
+    advertised_start = models.TextField(null=True)
+
+    # URLs
+    course_image_url = models.TextField()
+    social_sharing_url = models.TextField(null=True)
+    end_of_course_survey_url = models.TextField(null=True)
+
+    # Certification data
+    certificates_display_behavior = models.TextField(null=True)
+    certificates_show_before_end = models.BooleanField(default=False)
+    cert_name_short = models.TextField()
+    cert_name_long = models.TextField()
+    lowest_passing_grade = models.FloatField(null=True)
+
+    # Access parameters
+    days_early_for_beta = models.FloatField(null=True)
+    mobile_available = models.BooleanField(default=False)
+    visible_to_staff_only = models.BooleanField(default=False)
+    ispublic = models.NullBooleanField()
+    _pre_requisite_courses_json = models.TextField()  # JSON representation of list of CourseKey strings
+
+    # Enrollment parameters
+    enrollment_start = models.DateTimeField(null=True)
+    enrollment_end = models.DateTimeField(null=True)
+    enrollment_domain = models.TextField(null=True)
+    invitation_only = models.BooleanField(default=False)
+    catalog_visibility = models.TextField(null=True)
+
+    @classmethod
+    def _create_from_course(cls, course):
+        """
+        Create (but do not save) a CourseOverview for the given CourseDescriptor.
+        """
+        # The image url is computed by the LMS courseware app, which is only
+        # importable in the LMS.
+        from courseware.courses import course_image_url
+
+        return cls(
+            id=course.id,
+            _location=course.location,
+            display_name=course.display_name,
+            display_name_with_default=course.display_name_with_default,
+            display_number_with_default=course.display_number_with_default,
+            display_org_with_default=course.display_org_with_default,
+
+            start=course.start,
+            end=course.end,
+            advertised_start=course.advertised_start,
+
+            course_image_url=course_image_url(course),
+            social_sharing_url=course.social_sharing_url,
+            end_of_course_survey_url=course.end_of_course_survey_url,
+
+            certificates_display_behavior=course.certificates_display_behavior,
+            certificates_show_before_end=course.certificates_show_before_end,
+            cert_name_short=course.cert_name_short,
+            cert_name_long=course.cert_name_long,
+            lowest_passing_grade=course.lowest_passing_grade,
+
+            days_early_for_beta=course.days_early_for_beta,
+            mobile_available=course.mobile_available,
+            visible_to_staff_only=course.visible_to_staff_only,
+            ispublic=course.ispublic,
+            _pre_requisite_courses_json=json.dumps(course.pre_requisite_courses),
+
+            enrollment_start=course.enrollment_start,
+            enrollment_end=course.enrollment_end,
+            enrollment_domain=course.enrollment_domain,
+            invitation_only=course.invitation_only,
+            catalog_visibility=course.catalog_visibility,
+        )
+
+    @classmethod
+    def _load_from_module_store(cls, course_id):
+        """
+        Load the course from the modulestore and save an overview of it.
+
+        Returns None if the course doesn't exist or failed to load.
+        """
+        store = modulestore()
+        with store.bulk_operations(course_id):
+            course = store.get_course(course_id)
+            # ErrorDescriptors (broken courses) are not CourseDescriptors, and
+            # are deliberately not cached so they are retried on next access.
+            if not isinstance(course, CourseDescriptor):
+                return None
+            overview = cls._create_from_course(course)
+
+        try:
+            overview.save()
+        except IntegrityError:
+            # Another request created the same overview first; ours is
+            # equivalent, so just use it without saving.
+            log.info(u"CourseOverview for %s was created concurrently", course_id)
+        return overview
+
+    @classmethod
+    def get_from_id(cls, course_id):
+        """
+        Return the CourseOverview for the given course, creating it from the
+        modulestore if it doesn't exist yet.
+
+        Returns None if the course doesn't exist or failed to load.
+        """
+        return cls.get_from_ids([course_id]).get(course_id)
+
+    @classmethod
+    def get_from_ids(cls, course_ids):
+        """
+        Return a dict mapping each of the given course ids to its
+        CourseOverview, fetched with a single query.
+
+        Overviews that don't exist yet are created from the modulestore.
+        Courses that don't exist or failed to load are left out of the result.
+        """
+        overviews = {overview.id: overview for overview in cls.objects.filter(id__in=course_ids)}
+        for course_id in course_ids:
+            if course_id not in overviews:
+                overview = cls._load_from_module_store(course_id)
+                if overview is not None:
+                    overviews[course_id] = overview
+        return overviews
+
+    @property
+    def location(self):
+        """
+        Return the usage key of the course root, as CourseDescriptor.location does.
+        """
+        return self._location
+
+    @property
+    def number(self):
+        """
+        Return the course number, as CourseDescriptor.number does.
+        """
+        return self.location.course
+
+    @property
+    def org(self):
+        """
+        Return the course organization, as CourseDescriptor.org does.
+        """
+        return self.location.org
+
+    @property
+    def pre_requisite_courses(self):
+        """
+        Return the list of prerequisite course key strings.
+        """
+        return json.loads(self._pre_requisite_courses_json)
+
+    def has_started(self):
+        """
+        Returns True if the current time is after the course start date.
+        """
+        return datetime.now(UTC) > self.start
+
+    def has_ended(self):
+        """
+        Returns True if the current time is after the specified course end date.
+        Returns False if there is no end date specified.
+        """
+        if self.end is None:
+            return False
+
+        return datetime.now(UTC) > self.end
+
+    def may_certify(self):
+        """
+        Return True if it is acceptable to show the student a certificate download link.
+        """
+        show_early = (
+            self.certificates_display_behavior in ('early_with_info', 'early_no_info') or
+            self.certificates_show_before_end
+        )
+        return show_early or self.has_ended()
+
+    @property
+    def start_date_is_still_default(self):
+        """
+        Checks if the start date set for the course is still default, i.e. .start has not been modified,
+        and .advertised_start has not been set.
+        """
+        return self.advertised_start is None and self.start == DEFAULT_START_DATE
+
+    def start_datetime_text(self, format_string="SHORT_DATE"):
+        """
+        Returns the desired text corresponding the course's start date and time in UTC.  Prefers .advertised_start,
+        then falls back to .start
+        """
+        if self.advertised_start is not None:
+            try:
+                when = Date().from_json(self.advertised_start)
+            except ValueError:
+                when = None
+            if when is None:
+                return self.advertised_start.title()
+        elif self.start_date_is_still_default:
+            # Translators: TBD stands for 'To Be Determined' and is used when a course
+            # does not yet have an announced start date.
+            return ugettext('TBD')
+        else:
+            when = self.start
+
+        date_time = strftime_localized(when, format_string)
+        return self._add_timezone_string(date_time) if format_string == "DATE_TIME" else date_time
+
+    def end_datetime_text(self, format_string="SHORT_DATE"):
+        """
+        Returns the end date or date_time for the course formatted as a string.
+
+        If the course does not have an end date set (course.end is None), an empty string will be returned.
+        """
+        if self.end is None:
+            return ''
+
+        date_time = strftime_localized(self.end, format_string)
+        return date_time if format_string == "SHORT_DATE" else self._add_timezone_string(date_time)
+
+    @staticmethod
+    def _add_timezone_string(date_time):
+        """
+        Adds 'UTC' string to the end of start/end date and time texts.
+        """
+        return date_time + u" UTC"
+
+# Signals must be imported in a file that is automatically loaded at app startup (e.g. models.py). We import them
+# at the end of this file to avoid circular dependencies.
+import signals  # pylint: disable=unused-import
@@ -0,0 +1,19 @@
+"""
+Signal handler for invalidating cached course overviews
+"""
+from django.dispatch.dispatcher import receiver
+
+from xmodule.modulestore.django import SignalHandler
+
+
+@receiver(SignalHandler.course_published)
+def listen_for_course_publish(sender, course_key, **kwargs):  # pylint: disable=unused-argument
+    """
+    Catches the signal that a course has been published in Studio and
+    invalidates the corresponding CourseOverview; it is regenerated from the
+    modulestore the next time it is requested.
+    """
+    # Import the model here to avoid a circular import.
+    from .models import CourseOverview
+
+    CourseOverview.objects.filter(id=course_key).delete()
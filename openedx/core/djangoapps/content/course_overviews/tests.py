@@ -0,0 +1,104 @@
+"""
+Tests for the CourseOverview model.
+"""
+import datetime
+import unittest
+
+from django.conf import settings
+from django.test.utils import override_settings
+from django.utils import timezone
+from opaque_keys.edx.locator import CourseLocator
+
+from xmodule.modulestore import ModuleStoreEnum
+from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
+from xmodule.modulestore.tests.factories import CourseFactory, check_mongo_calls
+
+from courseware.access import has_access
+from student.tests.factories import UserFactory
+from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
+
+
+@unittest.skipUnless(settings.ROOT_URLCONF == 'lms.urls', 'Test only valid in lms')
+class CourseOverviewTestCase(ModuleStoreTestCase):
+    """
+    Tests for CourseOverview model.
+    """
+    def setUp(self):
+        super(CourseOverviewTestCase, self).setUp()
+        self.course = CourseFactory.create(
+            display_name='Test Course',
+            display_organization='Test Org',
+            start=datetime.datetime(2014, 1, 1, tzinfo=timezone.utc),
+            end=datetime.datetime(2015, 1, 1, tzinfo=timezone.utc),
+            certificates_show_before_end=True,
+            mobile_available=True,
+            pre_requisite_courses=['course-v1:edX+Other+Run'],
+        )
+
+    def test_matches_course_descriptor(self):
+        overview = CourseOverview.get_from_id(self.course.id)
+
+        for attribute in (
+                'id', 'location', 'number', 'org', 'display_name', 'display_name_with_default',
+                'display_number_with_default', 'display_org_with_default', 'start', 'end',
+                'advertised_start', 'end_of_course_survey_url', 'certificates_display_behavior',
+                'certificates_show_before_end', 'cert_name_short', 'cert_name_long', 'lowest_passing_grade',
+                'days_early_for_beta', 'mobile_available', 'visible_to_staff_only', 'ispublic', 'pre_requisite_courses',
+                'enrollment_start', 'enrollment_end', 'invitation_only', 'catalog_visibility',
+                'start_date_is_still_default',
+        ):
+            self.assertEqual(getattr(overview, attribute), getattr(self.course, attribute), attribute)
+
+        for method in ('has_started', 'has_ended', 'may_certify', 'start_datetime_text', 'end_datetime_text'):
+            self.assertEqual(getattr(overview, method)(), getattr(self.course, method)(), method)
+
+        self.assertEqual(overview.end_datetime_text('DATE_TIME'), self.course.end_datetime_text('DATE_TIME'))
+
+    def test_created_lazily_and_reused(self):
+        self.assertFalse(CourseOverview.objects.filter(id=self.course.id).exists())
+
+        CourseOverview.get_from_id(self.course.id)
+        self.assertTrue(CourseOverview.objects.filter(id=self.course.id).exists())
+
+        # Once created, the overview is read without touching the modulestore
+        with check_mongo_calls(0):
+            overview = CourseOverview.get_from_id(self.course.id)
+        self.assertEqual(overview.display_name, 'Test Course')
+
+    def test_invalidated_on_publish(self):
+        CourseOverview.get_from_id(self.course.id)
+
+        self.course.display_name = 'New Name'
+        self.store.update_item(self.course, ModuleStoreEnum.UserID.test)
+
+        self.assertFalse(CourseOverview.objects.filter(id=self.course.id).exists())
+        self.assertEqual(CourseOverview.get_from_id(self.course.id).display_name, 'New Name')
+
+    def test_get_from_ids_uses_one_query(self):
+        other_course = CourseFactory.create()
+        course_ids = [self.course.id, other_course.id]
+        CourseOverview.get_from_ids(course_ids)
+
+        with self.assertNumQueries(1):
+            overviews = CourseOverview.get_from_ids(course_ids)
+        self.assertEqual(set(overviews), set(course_ids))
+
+    def test_nonexistent_course(self):
+        course_id = CourseLocator('edX', 'Missing', 'Run')
+        self.assertIsNone(CourseOverview.get_from_id(course_id))
+        self.assertFalse(CourseOverview.objects.filter(id=course_id).exists())
+
+    def test_has_access_matches_course_descriptor(self):
+        user = UserFactory.create()
+        features = dict(settings.FEATURES, ACCESS_REQUIRE_STAFF_FOR_COURSE=True)
+        public_course = CourseFactory.create(ispublic=True)
+
+        with override_settings(FEATURES=features):
+            for course in (self.course, public_course):
+                overview = CourseOverview.get_from_id(course.id)
+                for action in ('load', 'see_exists', 'enroll'):
+                    self.assertEqual(
+                        bool(has_access(user, action, overview)),
+                        bool(has_access(user, action, course)),
+                        action
+                    )
@@ -1,14 +1,30 @@
+import hashlib
 import json
 import logging
+from collections import OrderedDict
 
+from django.core.cache import get_cache, InvalidCacheBackendError
+from django.db import models
 from model_utils.models import TimeStampedModel
 
 from util.models import CompressedTextField
 from xmodule_django.models import CourseKeyField
 
+try:
+    cache = get_cache('course_structure_cache')  # pylint: disable=invalid-name
+except InvalidCacheBackendError:
+    from django.core.cache import cache
+
 
 logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
 
+# The number of parsed course structures each process keeps in memory.
+PROCESS_CACHE_SIZE = 20
+
+# Per-process tier in front of the shared cache, mapping course ids to
+# (version, parsed structure) tuples, least recently used first.
+_process_cache = OrderedDict()  # pylint: disable=invalid-name
+
 
 class CourseStructure(TimeStampedModel):
     course_id = CourseKeyField(max_length=255, db_index=True, unique=True, verbose_name='Course ID')
@@ -20,11 +36,89 @@ class CourseStructure(TimeStampedModel):
     # we'd have to be careful about caching.
     structure_json = CompressedTextField(verbose_name='Structure JSON', blank=True, null=True)
 
+    # Hash of structure_json, set on save. Identifies the content of the
+    # structure in caches, and is sent as its ETag.
+    version = models.CharField(max_length=40, blank=True, default='')
+
+    # JSON map of the usage key of each block to its subtree_edited_on when
+    # the structure was generated, used to regenerate only edited subtrees.
+    subtree_edits_json = CompressedTextField(verbose_name='Subtree edits JSON', blank=True, null=True)
+
+    def save(self, *args, **kwargs):
+        """
+        Set the version of the structure before saving it.
+        """
+        self.version = self.compute_version(self.structure_json)
+        super(CourseStructure, self).save(*args, **kwargs)
+
+    @staticmethod
+    def compute_version(structure_json):
+        """
+        Return the version identifying the given structure JSON.
+        """
+        if isinstance(structure_json, unicode):
+            structure_json = structure_json.encode('utf8')
+        return hashlib.sha1(structure_json or '').hexdigest()
+
     @property
     def structure(self):
-        if self.structure_json:
-            return json.loads(self.structure_json)
-        return None
+        """
+        The parsed structure, which is only parsed once per instance. Callers must not modify it.
+        """
+        if not self.structure_json:
+            return None
+        parsed = getattr(self, '_parsed_structure', None)
+        if parsed is None or parsed[0] is not self.structure_json:
+            parsed = (self.structure_json, json.loads(self.structure_json))
+            self._parsed_structure = parsed  # pylint: disable=attribute-defined-outside-init
+        return parsed[1]
+
+    @property
+    def subtree_edits(self):
+        """
+        The parsed map of usage keys to subtree edit dates.
+        """
+        if self.subtree_edits_json:
+            return json.loads(self.subtree_edits_json)
+        return {}
+
+    @classmethod
+    def get_structure(cls, course_id):
+        """
+        Return a (version, structure) tuple for the given course, where the parsed structure is shared with
+        other callers and must not be modified.
+
+        Only the version is read from the database. The structure comes from this process's cache, then from
+        the shared cache, and is only loaded and parsed on a miss in both.
+
+        Raises CourseStructure.DoesNotExist if the course has no stored structure.
+        """
+        versions = cls.objects.filter(course_id=course_id).values_list('version', flat=True)
+        if not versions:
+            raise cls.DoesNotExist
+        version = versions[0]
+
+        local = _process_cache.pop(course_id, None)
+        if local is not None and version and local[0] == version:
+            _process_cache[course_id] = local
+            return local
+
+        cache_key = u'course_structure.{}.{}'.format(course_id, version)
+        structure = cache.get(cache_key) if version else None
+        if structure is None:
+            course_structure = cls.objects.get(course_id=course_id)
+            if not version:
+                # stored before versions were added
+                course_structure.save()
+                version = course_structure.version
+                cache_key = u'course_structure.{}.{}'.format(course_id, version)
+            structure = course_structure.structure
+            cache.set(cache_key, structure)
+
+        _process_cache[course_id] = (version, structure)
+        while len(_process_cache) > PROCESS_CACHE_SIZE:
+            _process_cache.popitem(last=False)
+        return version, structure
 
 # Signals must be imported in a file that is automatically loaded at app startup (e.g. models.py). We import them
 # at the end of this file to avoid circular dependencies.
@@ -8,42 +8,112 @@ from xmodule.modulestore.django import modulestore
 
 log = logging.getLogger('edx.celery.task')
 
+# Attributes of the blocks stored in the structure, with their default values.
+BLOCK_ATTRS = (('graded', False), ('format', None))
+
+# Stored attributes whose values blocks inherit from their ancestors (see InheritanceMixin).
+INHERITED_BLOCK_ATTRS = ('graded',)
+
 
 def _generate_course_structure(course_key):
     """
     Generates a course structure dictionary for the specified course.
     """
-    course = modulestore().get_course(course_key, depth=None)
+    return _build_course_structure(course_key)[0]
+
+
+def _subtree_edited_on(block):
+    """
+    Return the date of the last edit in the block's subtree as a string, or None if the block's runtime doesn't
+    track edits.
+    """
+    try:
+        subtree_edited_on = block.subtree_edited_on
+    except AttributeError:
+        return None
+    return subtree_edited_on.isoformat() if subtree_edited_on is not None else None
+
+
+def _block_attrs(block, key):
+    """
+    Return a dict of the BLOCK_ATTRS of the block with the usage key `key`.
+    """
+    attrs = {}
+    for attr, default in BLOCK_ATTRS:
+        # Retrieve these attributes separately so that we can fail gracefully if the block doesn't have the attribute.
+        if hasattr(block, attr):
+            attrs[attr] = getattr(block, attr, default)
+        else:
+            log.warning('Failed to retrieve %s attribute of block %s. Defaulting to %s.', attr, key, default)
+            attrs[attr] = default
+    return attrs
+
+
+def _build_course_structure(course_key, previous_structure=None, previous_edits=None):
+    """
+    Generates a course structure dictionary for the specified course, along with a map of the usage key of each
+    block to the date of the last edit in its subtree.
+
+    If the structure and edit dates generated previously for the course are given, the subtrees of blocks whose
+    last edit date hasn't changed since are copied from the previous structure rather than walked again. As an
+    edit to an ancestor of such a block can change the values its subtree inherits, the subtree is only copied if
+    the block's INHERITED_BLOCK_ATTRS still have their previous values. Its descendants then inherit the same
+    values as before, as nothing they set themselves changed.
+    """
+    previous_blocks = previous_structure['blocks'] if previous_structure else {}
+    previous_edits = previous_edits or {}
+
+    # Without a previous structure every block is visited, so load them all at once; otherwise only the
+    # edited subtrees are loaded, as they are walked.
+    course = modulestore().get_course(course_key, depth=0 if previous_blocks else None)
     blocks_stack = [course]
     blocks_dict = {}
+    subtree_edits = {}
+    copied = 0
     while blocks_stack:
         curr_block = blocks_stack.pop()
-        children = curr_block.get_children() if curr_block.has_children else []
         key = unicode(curr_block.scope_ids.usage_id)
+        edited_on = _subtree_edited_on(curr_block)
+        attrs = _block_attrs(curr_block, key)
+
+        if edited_on is not None and key in previous_blocks and previous_edits.get(key) == edited_on and all(
+                previous_blocks[key].get(attr) == attrs[attr] for attr in INHERITED_BLOCK_ATTRS
+        ):
+            # Nothing in this subtree changed, so copy it over.
+            keys_stack = [key]
+            while keys_stack:
+                copy_key = keys_stack.pop()
+                if copy_key in blocks_dict or copy_key not in previous_blocks:
+                    continue
+                blocks_dict[copy_key] = previous_blocks[copy_key]
+                if copy_key in previous_edits:
+                    subtree_edits[copy_key] = previous_edits[copy_key]
+                keys_stack.extend(previous_blocks[copy_key]['children'])
+                copied += 1
+            continue
+
+        children = curr_block.get_children() if curr_block.has_children else []
         block = {
             "usage_key": key,
             "block_type": curr_block.category,
             "display_name": curr_block.display_name,
             "children": [unicode(child.scope_ids.usage_id) for child in children]
         }
-
-        # Retrieve these attributes separately so that we can fail gracefully if the block doesn't have the attribute.
-        attrs = (('graded', False), ('format', None))
-        for attr, default in attrs:
-            if hasattr(curr_block, attr):
-                block[attr] = getattr(curr_block, attr, default)
-            else:
-                log.warning('Failed to retrieve %s attribute of block %s. Defaulting to %s.', attr, key, default)
-                block[attr] = default
+        block.update(attrs)
 
         blocks_dict[key] = block
+        if edited_on is not None:
+            subtree_edits[key] = edited_on
 
         # Add this blocks children to the stack so that we can traverse them as well.
         blocks_stack.extend(children)
+
+    if previous_blocks:
+        log.debug('Copied %d of %d blocks of the course structure of %s.', copied, len(blocks_dict), course_key)
     return {
         "root": unicode(course.scope_ids.usage_id),
         "blocks": blocks_dict
-    }
+    }, subtree_edits
 
 
 @task(name=u'openedx.core.djangoapps.content.course_structures.tasks.update_course_structure')
@@ -62,18 +132,33 @@ def update_course_structure(course_key):
     course_key = CourseKey.from_string(course_key)
 
     try:
-        structure = _generate_course_structure(course_key)
+        cs = CourseStructure.objects.get(course_id=course_key)
+    except CourseStructure.DoesNotExist:
+        cs = None
+
+    try:
+        if cs is not None:
+            structure, subtree_edits = _build_course_structure(course_key, cs.structure, cs.subtree_edits)
+        else:
+            structure, subtree_edits = _build_course_structure(course_key)
     except Exception as ex:
         log.exception('An error occurred while generating course structure: %s', ex.message)
         raise
 
-    structure_json = json.dumps(structure)
+    # Sort the keys so that an unchanged structure keeps its version.
+    structure_json = json.dumps(structure, sort_keys=True)
+    subtree_edits_json = json.dumps(subtree_edits, sort_keys=True)
 
-    cs, created = CourseStructure.objects.get_or_create(
-        course_id=course_key,
-        defaults={'structure_json': structure_json}
-    )
+    created = False
+    if cs is None:
+        cs, created = CourseStructure.objects.get_or_create(
+            course_id=course_key,
+            defaults={'structure_json': structure_json, 'subtree_edits_json': subtree_edits_json}
+        )
 
-    if not created:
+    unchanged = CourseStructure.compute_version(structure_json) == cs.version and \
+        subtree_edits_json == cs.subtree_edits_json
+    if not created and not unchanged:
         cs.structure_json = structure_json
+        cs.subtree_edits_json = subtree_edits_json
         cs.save()
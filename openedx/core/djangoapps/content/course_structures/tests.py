@@ -128,3 +128,71 @@ class CourseStructureTaskTests(ModuleStoreTestCase):
         cs = CourseStructure.objects.get(course_id=course_id)
         self.assertEqual(cs.course_id, course_id)
         self.assertEqual(cs.structure, structure)
+
+    def test_get_structure(self):
+        """
+        CourseStructure.get_structure should only read the version from the database once the structure is cached.
+        """
+        update_course_structure(unicode(self.course.id))
+        cs = CourseStructure.objects.get(course_id=self.course.id)
+
+        version, structure = CourseStructure.get_structure(self.course.id)
+        self.assertEqual(version, cs.version)
+        self.assertEqual(structure, cs.structure)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(CourseStructure.get_structure(self.course.id), (version, structure))
+
+        # A new structure gets a new version, and is no longer served from the cache.
+        ItemFactory.create(parent=self.section, category='sequential', display_name='Test Subsection')
+        update_course_structure(unicode(self.course.id))
+        new_version, new_structure = CourseStructure.get_structure(self.course.id)
+        self.assertNotEqual(new_version, version)
+        self.assertEqual(new_structure, _generate_course_structure(self.course.id))
+
+        CourseStructure.objects.all().delete()
+        self.assertRaises(CourseStructure.DoesNotExist, CourseStructure.get_structure, self.course.id)
+
+    def test_update_course_structure_incrementally(self):
+        """
+        Regenerating a course structure should copy the subtrees that weren't edited from the stored structure.
+        """
+        other_section = ItemFactory.create(parent=self.course, category='chapter', display_name='Other Section')
+        update_course_structure(unicode(self.course.id))
+
+        # Mark the stored block of the untouched section, so we can tell whether it was copied.
+        cs = CourseStructure.objects.get(course_id=self.course.id)
+        structure = cs.structure
+        structure['blocks'][unicode(self.section.location)]['display_name'] = 'Copied'
+        cs.structure_json = json.dumps(structure)
+        cs.save()
+
+        subsection = ItemFactory.create(parent=other_section, category='sequential', display_name='Test Subsection')
+        update_course_structure(unicode(self.course.id))
+
+        blocks = CourseStructure.objects.get(course_id=self.course.id).structure['blocks']
+        self.assertEqual(blocks[unicode(self.section.location)]['display_name'], 'Copied')
+        self.assertIn(unicode(subsection.location), blocks)
+        self.assertIn(unicode(subsection.location), blocks[unicode(other_section.location)]['children'])
+
+    def test_update_course_structure_inherited_change(self):
+        """
+        Regenerating a course structure shouldn't copy subtrees whose inherited values changed.
+        """
+        subsection = ItemFactory.create(parent=self.section, category='sequential', display_name='Test Subsection')
+        vertical = ItemFactory.create(parent=subsection, category='vertical', display_name='Test Unit')
+        problem = ItemFactory.create(parent=vertical, category='problem', display_name='Test Problem')
+        update_course_structure(unicode(self.course.id))
+        blocks = CourseStructure.objects.get(course_id=self.course.id).structure['blocks']
+        self.assertFalse(blocks[unicode(problem.location)]['graded'])
+
+        subsection.graded = True
+        self.store.update_item(subsection, self.user.id)
+        update_course_structure(unicode(self.course.id))
+
+        blocks = CourseStructure.objects.get(course_id=self.course.id).structure['blocks']
+        for block in (subsection, vertical, problem):
+            self.assertTrue(blocks[unicode(block.location)]['graded'])
+        self.assertEqual(
+            CourseStructure.objects.get(course_id=self.course.id).structure, _generate_course_structure(self.course.id)
+        )
@@ -240,6 +240,23 @@ def get_cohort(user, course_key, assign=True, use_cached=False):
     return request_cache.data.setdefault(cache_key, cohort)
 
 
+def get_cohort_names(course_key, user_ids):
+    """
+    Returns a dict mapping the id of every user in `user_ids` who is in a
+    cohort of the specified course to the name of that cohort.
+
+    This looks up all the users with a single query and, like
+    get_cohort(assign=False), never assigns users to cohorts. It does not
+    check whether the course is cohorted.
+    """
+    memberships = CourseUserGroup.users.through.objects.filter(
+        courseusergroup__course_id=course_key,
+        courseusergroup__group_type=CourseUserGroup.COHORT,
+        user__in=user_ids,
+    ).values_list('user_id', 'courseusergroup__name')
+    return dict(memberships)
+
+
 def migrate_cohort_settings(course):
     """
     Migrate all the cohort settings associated with this course from modulestore to mysql.
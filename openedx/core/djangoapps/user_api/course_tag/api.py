@@ -39,6 +39,28 @@ def get_course_tag(user, course_id, key):
         return None
 
 
+def get_course_tag_for_users(user_ids, course_id, key):
+    """
+    Gets the values of the course tag for the specified key in the specified
+    course_id, for many users at once.
+
+    Args:
+        user_ids: ids of the User objects for the course tag
+        course_id: course identifier (string)
+        key: arbitrary (<=255 char string)
+
+    Returns:
+        dict mapping user id to string value, for the users that have a value saved
+    """
+    return dict(
+        UserCourseTag.objects.filter(
+            user__in=user_ids,
+            course_id=course_id,
+            key=key
+        ).values_list('user_id', 'value')
+    )
+
+
 def set_course_tag(user, course_id, key, value):
     """
     Sets the value of the user's course tag for the specified key in the specified
@@ -71,6 +71,29 @@ class RandomUserPartitionScheme(object):
 
         return group
 
+    @classmethod
+    def get_groups_for_users(cls, course_key, user_ids, user_partition):
+        """
+        Returns a dict mapping the id of each user in `user_ids` who has
+        already been assigned to a group of the specified user partition to
+        that group. Users are never assigned to a group by this method.
+        """
+        partition_key = cls.key_for_partition(user_partition)
+        groups = {}
+        for user_id, group_id in course_tag_api.get_course_tag_for_users(user_ids, course_key, partition_key).items():
+            try:
+                groups[user_id] = user_partition.get_group(int(group_id))
+            except NoSuchUserPartitionGroupError:
+                log.warn(
+                    "group not found in RandomUserPartitionScheme: %r",
+                    {
+                        "requested_partition_id": user_partition.id,
+                        "requested_group_id": group_id,
+                    },
+                    exc_info=True
+                )
+        return groups
+
     @classmethod
     def key_for_partition(cls, user_partition):
         """
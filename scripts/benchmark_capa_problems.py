@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+"""
+Time the construction of LoncapaProblems, with and without the parsed problem cache.
+
+Builds every problem found in the problem/ directories of the test courses (or
+of the given directories) a number of times with different seeds, as loading a
+problem for many students does.
+
+    python scripts/benchmark_capa_problems.py [--repeat N] [DIR ...]
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+import fs.osfs
+from mock import patch
+
+from capa import capa_problem
+from capa.capa_problem import LoncapaProblem
+from capa.tests import test_capa_system
+
+
+def load_problems(directories):
+    """Return a list of (course directory, problem xml) for the problems under `directories`."""
+    problems = []
+    for directory in directories:
+        for path in sorted(glob.glob(os.path.join(directory, '*', 'problem', '*.xml'))):
+            with open(path) as problem_file:
+                problems.append((os.path.dirname(os.path.dirname(path)), problem_file.read()))
+    return problems
+
+
+def construct_all(problems, repeat):
+    """Construct every problem `repeat` times, returning the number built and the time it took."""
+    built = 0
+    elapsed = 0
+    for course_dir, xml in problems:
+        capa_system = test_capa_system()
+        capa_system.filestore = fs.osfs.OSFS(course_dir)
+        start = time.time()
+        try:
+            for seed in xrange(repeat):
+                LoncapaProblem(xml, id='benchmark', capa_system=capa_system, seed=seed)
+        except Exception:  # pylint: disable=broad-except
+            # some test problems need more than the test capa system provides
+            continue
+        elapsed += time.time() - start
+        built += repeat
+    return built, elapsed
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Time the construction of capa problems")
+    parser.add_argument('--repeat', type=int, default=20, help="Constructions of each problem (default 20)")
+    parser.add_argument('directories', metavar='DIR', nargs='*', default=['common/test/data'],
+                        help="Directories of courses with problems (default common/test/data)")
+    args = parser.parse_args(argv)
+
+    problems = load_problems(args.directories)
+    for label, cache_size in (('without cache', 0), ('with cache', capa_problem.PARSED_PROBLEM_CACHE_SIZE)):
+        capa_problem._parsed_problems.clear()  # pylint: disable=protected-access
+        with patch.object(capa_problem, 'PARSED_PROBLEM_CACHE_SIZE', cache_size):
+            built, elapsed = construct_all(problems, args.repeat)
+        print "{}: {} problems built in {:.2f}s, {:.2f} ms/problem".format(
+            label, built, elapsed, elapsed * 1000 / max(built, 1)
+        )
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))